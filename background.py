@@ -0,0 +1,69 @@
+"""
+Background Module for Course Scheduler
+Runs long computations in a worker thread and passes their progress through a queue
+"""
+
+import queue
+import threading
+import time
+
+
+class BackgroundJob:
+    """
+    Runs work(job) in a daemon thread
+    
+    The worker reports through the job: progress(text, fraction) for status
+    updates (fraction None = unknown) and best(coloring, text) for the best
+    schedule found so far. Solvers get job.stop_event as their stop argument,
+    and other steps check job.cancelled, so cancel() ends the work
+    cooperatively. The UI thread calls poll() (e.g. from root.after) and gets
+    the pending messages in order, the last one being ('done', result) or
+    ('error', exception).
+    """
+    
+    def __init__(self, work):
+        self.work = work
+        self.messages = queue.Queue()
+        self.stop_event = threading.Event()
+        self.started = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+    
+    def _run(self):
+        try:
+            result = self.work(self)
+        except Exception as e:
+            self.messages.put(('error', e))
+        else:
+            self.messages.put(('done', result))
+    
+    @property
+    def elapsed(self):
+        """Seconds since the job started"""
+        return time.perf_counter() - self.started if self.started is not None else 0.0
+    
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
+    
+    def cancel(self):
+        """Ask the worker to stop at its next check"""
+        self.stop_event.set()
+    
+    def progress(self, text, fraction=None):
+        self.messages.put(('progress', text, fraction))
+    
+    def best(self, coloring, text):
+        self.messages.put(('best', coloring, text))
+    
+    def poll(self):
+        """All messages sent since the last poll"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
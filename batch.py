@@ -0,0 +1,168 @@
+"""
+Batch Scheduling Module for Course Scheduling
+Colors every course/conflict file in a directory without user interaction
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from graph_coloring import (Graph, STRATEGIES, BOUNDED_STRATEGIES, color_graph, get_color_count,
+                            validate_coloring)
+from enrollment import build_conflict_graph
+from lower_bounds import compute_lower_bound
+
+# Files picked up from the input directory; .csv/.jsonl are enrollment files
+COURSE_FILE_EXTENSIONS = ('.txt', '.csv', '.jsonl')
+
+
+def read_course_file(path, graph=None):
+    """
+    Read a course/conflict text file into a graph
+    
+    Each non-empty line is either a course name or two course names separated
+    by a comma, which adds a conflict (and both courses). Lines starting with
+    '#' are comments.
+    """
+    if graph is None:
+        graph = Graph()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if ',' in line:
+                course1, course2 = (name.strip() for name in line.split(',', 1))
+                if course1 != course2:
+                    graph.add_edge(course1, course2)
+                else:
+                    graph.add_vertex(course1)
+            else:
+                graph.add_vertex(line)
+    return graph
+
+
+def load_graph(path):
+    """Load a course/conflict text file or an enrollment CSV/JSONL file"""
+    if path.lower().endswith('.txt'):
+        return read_course_file(path)
+    graph, _ = build_conflict_graph(path)
+    return graph
+
+
+def write_schedule(path, coloring):
+    """Write a schedule as CSV rows of course and time slot, ordered by slot"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['course', 'slot'])
+        writer.writerows(sorted(coloring.items(), key=lambda item: (item[1], str(item[0]))))
+
+
+def schedule_file(path, output_dir, strategy):
+    """
+    Load, color, validate and write the schedule for one file
+    Returns a dict with sizes, slot count, lower bound, validity and per-phase timings
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    result = {'file': os.path.basename(path), 'courses': 0, 'conflicts': 0, 'slots': 0,
+              'bound': 0, 'valid': False, 'error': None, 'load': 0.0, 'color': 0.0, 'write': 0.0}
+    try:
+        start = time.perf_counter()
+        graph = load_graph(path)
+        result['load'] = time.perf_counter() - start
+        result['courses'] = len(graph.vertices)
+        result['conflicts'] = sum(graph.get_degree(v) for v in graph.vertices) // 2
+        
+        start = time.perf_counter()
+        bound = None
+        if strategy in BOUNDED_STRATEGIES:
+            bound = compute_lower_bound(graph).value
+        coloring = color_graph(graph, strategy, bound)
+        result['color'] = time.perf_counter() - start
+        result['valid'] = validate_coloring(graph, coloring)
+        result['slots'] = get_color_count(coloring)
+        if bound is None:
+            bound = compute_lower_bound(graph, target=result['slots']).value
+        result['bound'] = bound
+        
+        if result['valid']:
+            start = time.perf_counter()
+            write_schedule(os.path.join(output_dir, name + '.schedule.csv'), coloring)
+            result['write'] = time.perf_counter() - start
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def find_course_files(input_dir):
+    """List the course/conflict and enrollment files in a directory, sorted by name"""
+    return sorted(
+        os.path.join(input_dir, entry) for entry in os.listdir(input_dir)
+        if entry.lower().endswith(COURSE_FILE_EXTENSIONS)
+        and not entry.endswith('.schedule.csv')
+        and os.path.isfile(os.path.join(input_dir, entry))
+    )
+
+
+def run_batch(input_dir, output_dir=None, strategy='greedy', workers=None):
+    """Schedule every file in input_dir in a process pool; returns the per-file results"""
+    if output_dir is None:
+        output_dir = os.path.join(input_dir, 'schedules')
+    os.makedirs(output_dir, exist_ok=True)
+    paths = find_course_files(input_dir)
+    if workers == 1 or len(paths) < 2:
+        return [schedule_file(path, output_dir, strategy) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(schedule_file, paths, [output_dir] * len(paths),
+                                 [strategy] * len(paths)))
+
+
+def print_summary(results, elapsed):
+    """Print one line per file and the totals"""
+    print(f"{'File':<30} {'Courses':>8} {'Conflicts':>10} {'Slots':>6} {'Bound':>6} "
+          f"{'Load':>8} {'Color':>8} {'Write':>8}  Status")
+    print("-" * 103)
+    for r in results:
+        status = "ok" if r['valid'] else (r['error'] or "INVALID")
+        print(f"{r['file']:<30} {r['courses']:>8} {r['conflicts']:>10} {r['slots']:>6} "
+              f"{r['bound']:>6} {r['load']:>7.3f}s {r['color']:>7.3f}s {r['write']:>7.3f}s  "
+              f"{status}")
+    print("-" * 103)
+    failed = sum(1 for r in results if not r['valid'])
+    print(f"{len(results)} files, {failed} failed, "
+          f"{sum(r['courses'] for r in results)} courses in {elapsed:.2f}s wall time")
+
+
+def main(argv=None):
+    """Command line entry point: python main.py schedule --input DIR [options]"""
+    parser = argparse.ArgumentParser(
+        prog='main.py schedule',
+        description="Generate schedules for every course/conflict file in a directory")
+    parser.add_argument('--input', required=True, metavar='DIR',
+                        help="directory with .txt course/conflict files or "
+                             ".csv/.jsonl enrollment files")
+    parser.add_argument('--output', metavar='DIR',
+                        help="where to write the schedules (default: DIR/schedules)")
+    parser.add_argument('--strategy', default='greedy', choices=list(STRATEGIES),
+                        help="coloring strategy (default: greedy)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    
+    if not os.path.isdir(args.input):
+        print(f"Error: {args.input} is not a directory")
+        return 2
+    start = time.perf_counter()
+    results = run_batch(args.input, args.output, args.strategy, args.workers)
+    if not results:
+        print(f"No course files found in {args.input}")
+        return 1
+    print_summary(results, time.perf_counter() - start)
+    return 0 if all(r['valid'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Benchmark script for the Course Scheduler graph backends
+Compares memory per edge and coloring time of Graph and CompactGraph,
+the parallel Jones-Plassmann coloring against the sequential greedy, and
+runs a scaling suite over generated graphs with baseline comparison
+"""
+
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from graph_coloring import (Graph, color_graph, greedy_coloring, get_color_count,
+                            validate_coloring)
+from compact_graph import CompactGraph
+from parallel_coloring import jones_plassmann_coloring
+from validation import ColoringValidator
+from graph_generators import (erdos_renyi, power_law, complete_graph, complete_bipartite,
+                              enrollment_graph)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def random_edges(num_vertices, num_edges, seed=0):
+    """Generate a reproducible list of random conflict pairs between course names"""
+    rng = random.Random(seed)
+    names = [f"C{i:06d}" for i in range(num_vertices)]
+    edges = []
+    for _ in range(num_edges):
+        u = rng.randrange(num_vertices)
+        v = rng.randrange(num_vertices)
+        if u != v:
+            edges.append((names[u], names[v]))
+    return names, edges
+
+
+def build_graph(graph_class, names, edges):
+    """Build a graph of the given class from course names and conflict pairs"""
+    graph = graph_class()
+    graph.add_vertices(names)
+    graph.add_edges(edges)
+    # Make sure lazily merged backends have finished building
+    graph.get_degree(names[0])
+    return graph
+
+
+def benchmark_backend(graph_class, names, edges):
+    """Measure build time, memory and coloring time for one graph backend"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build_graph(graph_class, names, edges)
+    build_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    coloring = greedy_coloring(graph)
+    coloring_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    valid = validate_coloring(graph, coloring)
+    validate_time = time.perf_counter() - start
+    
+    edge_count = sum(graph.get_degree(v) for v in graph.vertices) // 2
+    return {
+        'backend': graph_class.__name__,
+        'edges': edge_count,
+        'build_time': build_time,
+        'bytes_per_edge': memory / max(edge_count, 1),
+        'coloring_time': coloring_time,
+        'validate_time': validate_time,
+        'slots': get_color_count(coloring),
+        'valid': valid,
+    }
+
+
+def compare_backends(num_vertices, num_edges, seed=0):
+    """Run the backend benchmark for one graph size and print a table"""
+    names, edges = random_edges(num_vertices, num_edges, seed)
+    # Course names are shared by both backends, so they are created before measuring;
+    # a tiny warm-up build keeps one-off library allocations out of the numbers
+    for cls in (Graph, CompactGraph):
+        build_graph(cls, ['A', 'B'], [('A', 'B')])
+    results = [benchmark_backend(cls, names, edges) for cls in (Graph, CompactGraph)]
+    
+    print(f"\n{num_vertices} courses, {results[0]['edges']} conflicts")
+    print(f"{'Backend':<15} {'Build (s)':>10} {'Bytes/edge':>12} "
+          f"{'Coloring (s)':>13} {'Validate (s)':>13} {'Slots':>6} {'Valid':>6}")
+    print("-"*80)
+    for r in results:
+        print(f"{r['backend']:<15} {r['build_time']:>10.3f} {r['bytes_per_edge']:>12.1f} "
+              f"{r['coloring_time']:>13.3f} {r['validate_time']:>13.3f} "
+              f"{r['slots']:>6} {str(r['valid']):>6}")
+    return results
+
+
+def random_compact_graph(num_vertices, num_edges, seed=0):
+    """Build a random CompactGraph directly from integer edge arrays"""
+    names = [f"C{i:07d}" for i in range(num_vertices)]
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        src = rng.integers(0, num_vertices, num_edges)
+        dst = rng.integers(0, num_vertices, num_edges)
+        keep = src != dst
+        return CompactGraph.from_edge_arrays(names, src[keep], dst[keep])
+    rng = random.Random(seed)
+    pairs = ((rng.randrange(num_vertices), rng.randrange(num_vertices))
+             for _ in range(num_edges))
+    src, dst = zip(*[(u, v) for u, v in pairs if u != v])
+    return CompactGraph.from_edge_arrays(names, src, dst)
+
+
+def compare_parallel(num_vertices, num_edges, workers=4, seed=0):
+    """Compare sequential greedy and Jones-Plassmann coloring on one random graph"""
+    graph = random_compact_graph(num_vertices, num_edges, seed)
+    results = []
+    
+    start = time.perf_counter()
+    coloring = greedy_coloring(graph)
+    results.append(('greedy', time.perf_counter() - start, coloring, None))
+    
+    for label, worker_count in (('parallel x1', 1), (f'parallel x{workers}', workers)):
+        stats = {}
+        start = time.perf_counter()
+        coloring = jones_plassmann_coloring(graph, seed=seed, workers=worker_count, stats=stats)
+        results.append((label, time.perf_counter() - start, coloring, stats['rounds']))
+    
+    base_time = results[0][1]
+    print(f"\n{num_vertices} courses, {graph.edge_count()} conflicts")
+    print(f"{'Engine':<15} {'Time (s)':>10} {'Speedup':>9} {'Slots':>6} {'Rounds':>7} {'Valid':>6}")
+    print("-"*60)
+    for label, elapsed, coloring, rounds in results:
+        print(f"{label:<15} {elapsed:>10.3f} {base_time / elapsed:>9.2f} "
+              f"{get_color_count(coloring):>6} {str(rounds or '-'):>7} "
+              f"{str(validate_coloring(graph, coloring)):>6}")
+    return results
+
+
+def compare_validation(graph_class, num_vertices, num_edges, seed=0):
+    """Compare validate_coloring with the edge-array validator on one random graph"""
+    names, edges = random_edges(num_vertices, num_edges, seed)
+    graph = build_graph(graph_class, names, edges)
+    coloring = greedy_coloring(graph)
+    
+    start = time.perf_counter()
+    validate_coloring(graph, coloring)
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    validator = ColoringValidator(graph)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    report = validator.validate(coloring)
+    array_time = time.perf_counter() - start
+    
+    # Move 100 courses into slot 0 and re-check only their conflicts
+    changed = dict(coloring)
+    for course in names[:100]:
+        changed[course] = 0
+    validator.touch(*names[:100])
+    start = time.perf_counter()
+    changed_report = validator.revalidate(changed)
+    incremental_time = time.perf_counter() - start
+    
+    print(f"\n{graph_class.__name__}: {num_vertices} courses, {num_edges} conflicts")
+    print(f"{'Validator':<24} {'Time (s)':>10} {'Speedup':>9} {'Violations':>11}")
+    print("-"*57)
+    print(f"{'validate_coloring':<24} {loop_time:>10.4f} {1:>9.1f} {'-':>11}")
+    print(f"{'edge arrays (build)':<24} {build_time:>10.4f} {'':>9} {'':>11}")
+    print(f"{'edge arrays':<24} {array_time:>10.4f} {loop_time / array_time:>9.1f} "
+          f"{len(report.conflicts):>11}")
+    print(f"{'incremental (100 moved)':<24} {incremental_time:>10.4f} "
+          f"{loop_time / incremental_time:>9.1f} {len(changed_report.conflicts):>11}")
+
+
+# Suite graphs by name: function(num_edges, seed) -> (names, edges)
+SUITE_GENERATORS = {
+    'erdos_renyi': lambda m, seed: erdos_renyi(max(20, m // 5), m, seed),
+    'power_law': lambda m, seed: power_law(max(20, m // 5), m, seed=seed),
+    'complete': lambda m, seed: complete_graph(int((1 + math.sqrt(1 + 8 * m)) / 2)),
+    'bipartite': lambda m, seed: complete_bipartite(int(math.sqrt(m)), int(math.sqrt(m))),
+    'enrollment': lambda m, seed: enrollment_graph(max(10, m // 5), max(20, m // 10),
+                                                   seed=seed)[:2],
+}
+
+# Target edge counts of the suite; --quick stops at 10^4
+SUITE_SIZES = [10**2, 10**3, 10**4, 10**5, 10**6]
+
+
+def benchmark_case(generator, num_edges, strategy='greedy', seed=0):
+    """
+    Time graph build, coloring and validation for one generated graph
+    Peak memory of build + coloring is measured in a second, traced run so
+    tracing does not slow down the timed one
+    """
+    names, edges = SUITE_GENERATORS[generator](num_edges, seed)
+    
+    start = time.perf_counter()
+    graph = build_graph(Graph, names, edges)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    coloring = color_graph(graph, strategy)
+    coloring_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    valid = validate_coloring(graph, coloring)
+    validate_time = time.perf_counter() - start
+    slots = get_color_count(coloring)
+    
+    del graph, coloring
+    tracemalloc.start()
+    color_graph(build_graph(Graph, names, edges), strategy)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    return {
+        'generator': generator,
+        'size': num_edges,
+        'strategy': strategy,
+        'courses': len(names),
+        'edges': len(edges),
+        'build_time': build_time,
+        'coloring_time': coloring_time,
+        'validate_time': validate_time,
+        'peak_memory': peak_memory,
+        'slots': slots,
+        'valid': valid,
+    }
+
+
+def run_suite(sizes=SUITE_SIZES, generators=None, strategy='greedy', seed=0):
+    """Run benchmark_case for every generator and size, printing one row each"""
+    print(f"{'Generator':<12} {'Size':>8} {'Courses':>8} {'Edges':>9} {'Build (s)':>10} "
+          f"{'Color (s)':>10} {'Valid. (s)':>10} {'Peak MB':>8} {'Slots':>6}")
+    print("-"*90)
+    results = []
+    for generator in (generators or SUITE_GENERATORS):
+        for size in sizes:
+            r = benchmark_case(generator, size, strategy, seed)
+            results.append(r)
+            print(f"{generator:<12} {size:>8} {r['courses']:>8} {r['edges']:>9} "
+                  f"{r['build_time']:>10.4f} {r['coloring_time']:>10.4f} "
+                  f"{r['validate_time']:>10.4f} {r['peak_memory'] / 2**20:>8.1f} "
+                  f"{r['slots']:>6}{'' if r['valid'] else '  INVALID'}")
+    return results
+
+
+def write_results(path, results, seed=0):
+    """Write suite results and the environment they were measured in as JSON"""
+    document = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__ if np is not None else None,
+        'seed': seed,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+def compare_results(results, baseline, tolerance=0.25, min_time=0.005):
+    """
+    Compare suite results against a baseline document from write_results
+    Times and peak memory more than tolerance above the baseline, more slots
+    or an invalid coloring count as regressions; timings below min_time
+    seconds are too noisy to compare. Returns a list of regression messages.
+    """
+    previous = {(r['generator'], r['size'], r['strategy']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        key = (r['generator'], r['size'], r['strategy'])
+        old = previous.get(key)
+        # Only identical graphs (same generator output) are comparable
+        if old is None or (old['courses'], old['edges']) != (r['courses'], r['edges']):
+            continue
+        label = f"{r['generator']} {r['size']}"
+        for field in ('build_time', 'coloring_time', 'validate_time'):
+            if r[field] > max(old[field], min_time) * (1 + tolerance):
+                regressions.append(f"{label}: {field} {old[field]:.4f}s -> {r[field]:.4f}s")
+        if r['peak_memory'] > old['peak_memory'] * (1 + tolerance):
+            regressions.append(f"{label}: peak memory {old['peak_memory'] / 2**20:.1f} MB -> "
+                               f"{r['peak_memory'] / 2**20:.1f} MB")
+        if r['slots'] > old['slots']:
+            regressions.append(f"{label}: slots {old['slots']} -> {r['slots']}")
+        if not r['valid']:
+            regressions.append(f"{label}: invalid coloring")
+    return regressions
+
+
+def _option(args, name, default=None):
+    """Value following --name in the argument list, or default"""
+    if name in args and args.index(name) + 1 < len(args):
+        return args[args.index(name) + 1]
+    return default
+
+
+def main():
+    """
+    Run a benchmark over a range of graph sizes
+    Usage: python benchmark.py [backends|parallel|validate] [--quick]
+           python benchmark.py suite [--quick] [--strategy NAME] [--output FILE]
+                                     [--compare BASELINE] [--tolerance 0.25]
+    """
+    args = sys.argv[1:]
+    quick = '--quick' in args
+    options = {arg for i, arg in enumerate(args) if i and args[i - 1].startswith('--')
+               and args[i - 1] != '--quick'}
+    mode = next((arg for arg in args if not arg.startswith('--') and arg not in options),
+                'backends')
+    
+    print("="*80)
+    if mode == 'suite':
+        print("Course Scheduler - Scaling Suite")
+        print("="*80)
+        sizes = [size for size in SUITE_SIZES if not quick or size <= 10**4]
+        strategy = _option(args, '--strategy', 'greedy')
+        results = run_suite(sizes, strategy=strategy)
+        output = _option(args, '--output', 'benchmark_results.json')
+        write_results(output, results)
+        print(f"\nResults written to {output}")
+        
+        baseline_path = _option(args, '--compare')
+        if baseline_path:
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+            tolerance = float(_option(args, '--tolerance', 0.25))
+            regressions = compare_results(results, baseline, tolerance)
+            if regressions:
+                print(f"\n{len(regressions)} regressions against {baseline_path}:")
+                for message in regressions:
+                    print(f"  {message}")
+                sys.exit(1)
+            print(f"\nNo regressions against {baseline_path} (tolerance {tolerance:.0%})")
+    elif mode == 'parallel':
+        print("Course Scheduler - Parallel Coloring Benchmark")
+        print("="*80)
+        sizes = [(10**4, 5 * 10**4), (10**5, 5 * 10**5), (10**6, 5 * 10**6)]
+        for num_vertices, num_edges in (sizes[:2] if quick else sizes):
+            compare_parallel(num_vertices, num_edges)
+    elif mode == 'validate':
+        print("Course Scheduler - Validation Benchmark")
+        print("="*80)
+        sizes = [(1000, 10000), (10000, 100000), (20000, 1000000)]
+        for num_vertices, num_edges in (sizes[:2] if quick else sizes):
+            for graph_class in (Graph, CompactGraph):
+                compare_validation(graph_class, num_vertices, num_edges)
+    else:
+        print("Course Scheduler - Graph Backend Benchmark")
+        print("="*80)
+        sizes = [(1000, 10000), (10000, 100000), (20000, 1000000)]
+        for num_vertices, num_edges in (sizes[:2] if quick else sizes):
+            compare_backends(num_vertices, num_edges)
+
+
+if __name__ == "__main__":
+    main()
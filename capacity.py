@@ -0,0 +1,97 @@
+"""
+Capacity Module for Course Scheduling
+Graph coloring with a maximum load per time slot (rooms, seats)
+"""
+
+import heapq
+
+
+def capacity_coloring(graph, capacity, sizes=None, order=None):
+    """
+    Greedy coloring in which no time slot holds more than capacity
+    
+    Without sizes every course counts 1 (capacity = courses per slot, e.g.
+    rooms); with sizes, a dict of course -> enrolled students (missing
+    courses count 1), capacity is the total enrollment a slot can seat.
+    Courses are placed largest degree first (or in the given order) into the
+    lowest slot that no neighbor uses and that still has room.
+    
+    Slots with room left are kept in a min-heap, so finding the slot only
+    skips slots used by neighbors (at most the degree) or too full for this
+    course, and full slots leave the heap for good. Raises ValueError if a
+    single course is larger than the capacity.
+    """
+    if capacity < 1:
+        raise ValueError("Slot capacity must be at least 1")
+    if order is None:
+        order = graph.get_vertices_sorted_by_degree()
+    size_of = sizes.get if sizes else None
+    # A slot with less room than the smallest course can never take another one
+    smallest = min((size_of(v, 1) for v in graph.vertices), default=1) if size_of else 1
+    
+    colors = {}
+    loads = []
+    open_slots = []
+    for vertex in order:
+        size = size_of(vertex, 1) if size_of else 1
+        if size > capacity:
+            raise ValueError(f"Course {vertex} has {size} students, more than the "
+                             f"slot capacity of {capacity}")
+        used = {colors[neighbor] for neighbor in graph.get_neighbors(vertex)
+                if neighbor in colors}
+        
+        skipped = []
+        slot = None
+        while open_slots:
+            candidate = heapq.heappop(open_slots)
+            if candidate in used or loads[candidate] + size > capacity:
+                skipped.append(candidate)
+            else:
+                slot = candidate
+                break
+        if slot is None:
+            slot = len(loads)
+            loads.append(0)
+        
+        colors[vertex] = slot
+        loads[slot] += size
+        if capacity - loads[slot] >= smallest:
+            skipped.append(slot)
+        for candidate in skipped:
+            heapq.heappush(open_slots, candidate)
+    return colors
+
+
+def slot_loads(coloring, sizes=None):
+    """Load of every slot (course count, or total students with sizes) as a list"""
+    loads = []
+    for course, slot in coloring.items():
+        if slot >= len(loads):
+            loads.extend([0] * (slot + 1 - len(loads)))
+        loads[slot] += sizes.get(course, 1) if sizes else 1
+    return loads
+
+
+def capacity_lower_bound(graph, capacity, sizes=None):
+    """Slots needed just to seat everyone: total load divided by capacity, rounded up"""
+    total = sum(sizes.get(v, 1) for v in graph.vertices) if sizes else len(graph.vertices)
+    return -(-total // capacity)
+
+
+def fill_report(coloring, capacity, sizes=None, limit=20):
+    """
+    Text report of slot fill levels: one line per slot (up to limit slots)
+    followed by the lowest, average and highest fill
+    """
+    loads = slot_loads(coloring, sizes)
+    if not loads:
+        return "No slots in use"
+    unit = "students" if sizes else "courses"
+    lines = [f"Slot {slot}: {load}/{capacity} {unit} ({load / capacity:.0%})"
+             for slot, load in enumerate(loads[:limit])]
+    if len(loads) > limit:
+        lines.append(f"... and {len(loads) - limit} more slots")
+    lines.append(f"Fill: lowest {min(loads) / capacity:.0%}, "
+                 f"average {sum(loads) / len(loads) / capacity:.0%}, "
+                 f"highest {max(loads) / capacity:.0%}")
+    return '\n'.join(lines)
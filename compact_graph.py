@@ -0,0 +1,507 @@
+"""
+Compact Graph Module for Course Scheduling
+Array-backed (CSR) conflict graph for large course catalogues
+"""
+
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CompactGraph:
+    """
+    Conflict graph that interns course names to integer ids and stores
+    adjacency in contiguous CSR (offset + index) arrays.
+    
+    Offers the same add_vertex/add_edge/get_neighbors/get_degree API as
+    graph_coloring.Graph, so it can be used with greedy_coloring,
+    validate_coloring and both interfaces. New edges are buffered; a few
+    of them are indexed per vertex in a small overlay that reads consult
+    next to the CSR arrays, so alternating single edits and reads does not
+    rebuild the arrays each time. Once the buffer outgrows OVERLAY_LIMIT
+    (or a whole-graph view such as to_csr() is needed) it is merged in.
+    """
+    
+    def __init__(self):
+        self.vertices = []
+        self.index = {}
+        # CSR arrays: neighbors of vertex i are indices[offsets[i]:offsets[i + 1]]
+        self.offsets = array('q', [0])
+        self.indices = array('i')
+        # Edge weights aligned with indices; None until a weighted edge is added
+        self.weights = None
+        # Edges added since the last compaction (stored in one direction only);
+        # a NaN pending weight keeps the existing weight of the edge, or 1
+        self._pending_src = array('i')
+        self._pending_dst = array('i')
+        self._pending_weights = None
+        self._reset_overlay()
+    
+    def add_vertex(self, vertex):
+        """Add a vertex (course) to the graph"""
+        if vertex not in self.index:
+            if not isinstance(self.offsets, array):
+                # Offsets mapped read-only from a snapshot; copy before growing
+                self.offsets = _to_array('q', self.offsets)
+            self.index[vertex] = len(self.vertices)
+            self.vertices.append(vertex)
+            self.offsets.append(self.offsets[-1])
+    
+    def add_vertices(self, vertices):
+        """Add many vertices (courses) from any iterable, keeping insertion order"""
+        for vertex in vertices:
+            if vertex not in self.index:
+                self.add_vertex(vertex)
+    
+    def add_edge(self, vertex1, vertex2, weight=None):
+        """
+        Add an edge (conflict) between two vertices
+        New edges get weight 1 unless a weight (e.g. shared students) is given
+        """
+        if weight is not None:
+            # Convert first, so a bad weight leaves the graph unchanged
+            weight = float(weight)
+        if vertex1 not in self.index:
+            self.add_vertex(vertex1)
+        if vertex2 not in self.index:
+            self.add_vertex(vertex2)
+        
+        if weight is not None:
+            self._enable_weights()
+        self._pending_src.append(self.index[vertex1])
+        self._pending_dst.append(self.index[vertex2])
+        if self._pending_weights is not None:
+            self._pending_weights.append(_KEEP if weight is None else weight)
+    
+    def add_edges(self, edges):
+        """
+        Add many edges (conflicts) from any iterable of vertex pairs
+        The pending arrays are extended only after the whole batch was read
+        """
+        index = self.index
+        src = array('i')
+        dst = array('i')
+        src_append = src.append
+        dst_append = dst.append
+        for vertex1, vertex2 in edges:
+            i = index.get(vertex1)
+            if i is None:
+                self.add_vertex(vertex1)
+                i = index[vertex1]
+            j = index.get(vertex2)
+            if j is None:
+                self.add_vertex(vertex2)
+                j = index[vertex2]
+            src_append(i)
+            dst_append(j)
+        self._pending_src.extend(src)
+        self._pending_dst.extend(dst)
+        if self._pending_weights is not None:
+            self._pending_weights.extend(array('d', [_KEEP]) * len(src))
+    
+    def add_weighted_edges(self, edges, accumulate=False):
+        """
+        Add many edges from any iterable of (vertex1, vertex2, weight) triples
+        Weights are converted while the batch is read and the pending arrays
+        are extended together at the end, so a bad weight adds no edges.
+        With accumulate, weights are added to those of existing edges (e.g.
+        shared students from another enrollment file) instead of replacing them
+        """
+        index = self.index
+        src = array('i')
+        dst = array('i')
+        weights = array('d')
+        src_append = src.append
+        dst_append = dst.append
+        weight_append = weights.append
+        for vertex1, vertex2, weight in edges:
+            weight = float(weight)
+            i = index.get(vertex1)
+            if i is None:
+                self.add_vertex(vertex1)
+                i = index[vertex1]
+            j = index.get(vertex2)
+            if j is None:
+                self.add_vertex(vertex2)
+                j = index[vertex2]
+            src_append(i)
+            dst_append(j)
+            weight_append(weight)
+        if not src:
+            return
+        if accumulate:
+            src, dst, weights = self._accumulated(src, dst, weights)
+        self._enable_weights()
+        self._pending_src.extend(src)
+        self._pending_dst.extend(dst)
+        self._pending_weights.extend(weights)
+    
+    def get_degree(self, vertex):
+        """Get the degree (number of neighbors) of a vertex"""
+        if vertex not in self.index:
+            return 0
+        self._prepare_read()
+        i = self.index[vertex]
+        return self.offsets[i + 1] - self.offsets[i] + len(self._overlay.get(i, ()))
+    
+    def get_vertices_sorted_by_degree(self):
+        """Get vertices sorted by degree in descending order"""
+        self._compact()
+        offsets = self.offsets
+        order = sorted(range(len(self.vertices)),
+                       key=lambda i: offsets[i + 1] - offsets[i], reverse=True)
+        return [self.vertices[i] for i in order]
+    
+    def get_neighbors(self, vertex):
+        """Get all neighbors of a vertex"""
+        if vertex not in self.index:
+            return []
+        vertices = self.vertices
+        return [vertices[j] for j in self.neighbor_ids(self.index[vertex])]
+    
+    def get_edge_weight(self, vertex1, vertex2):
+        """Get the weight of an edge, or 0 if the vertices do not conflict"""
+        if vertex1 not in self.index or vertex2 not in self.index:
+            return 0
+        self._prepare_read()
+        i, j = self.index[vertex1], self.index[vertex2]
+        weight = self._overlay_weights.get((i, j) if i < j else (j, i))
+        if weight is not None:
+            return weight
+        if j in self._overlay.get(i, ()):
+            return 1
+        return self._weight_of(i, j)
+    
+    def _position(self, i, j):
+        """Position of the edge between ids i and j in the CSR arrays, or -1"""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        position = bisect_left(self.indices, j, lo, hi)
+        if position == hi or self.indices[position] != j:
+            return -1
+        return position
+    
+    def _weight_of(self, i, j):
+        """Weight of the edge between ids i and j in the CSR arrays, or 0"""
+        position = self._position(i, j)
+        if position < 0:
+            return 0
+        return 1 if self.weights is None else self.weights[position]
+    
+    def get_weighted_neighbors(self, vertex):
+        """Get (neighbor, weight) pairs for all neighbors of a vertex"""
+        if vertex not in self.index:
+            return []
+        self._prepare_read()
+        i = self.index[vertex]
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        ids = list(self.indices[lo:hi])
+        weights = [1] * len(ids) if self.weights is None else list(self.weights[lo:hi])
+        extra = self._overlay.get(i)
+        if extra:
+            ids.extend(extra)
+            weights.extend([1] * len(extra))
+        if self._overlay_weights:
+            overlay_weights = self._overlay_weights
+            for position, j in enumerate(ids):
+                weight = overlay_weights.get((i, j) if i < j else (j, i))
+                if weight is not None:
+                    weights[position] = weight
+        vertices = self.vertices
+        return [(vertices[j], weight) for j, weight in zip(ids, weights)]
+    
+    def neighbor_ids(self, i):
+        """
+        Get the integer ids of the neighbors of vertex id i
+        (sorted, followed by those of pending edges in insertion order)
+        """
+        self._prepare_read()
+        ids = self.indices[self.offsets[i]:self.offsets[i + 1]]
+        extra = self._overlay.get(i)
+        if extra:
+            ids = array('i', ids)
+            ids.extend(extra)
+        return ids
+    
+    def edge_count(self):
+        """Get the number of distinct edges (conflicts)"""
+        self._prepare_read()
+        return len(self.indices) // 2 + self._overlay_edges
+    
+    def size_hint(self):
+        """Adjacency entries including pending edges (an upper bound), without merging"""
+        return len(self.indices) + 2 * len(self._pending_src)
+    
+    def nbytes(self):
+        """Get the number of bytes held by the adjacency arrays"""
+        self._compact()
+        total = (len(self.offsets) * self.offsets.itemsize +
+                 len(self.indices) * self.indices.itemsize)
+        if self.weights is not None:
+            total += len(self.weights) * self.weights.itemsize
+        return total
+    
+    def to_csr(self):
+        """Return (offsets, indices) after merging any pending edges"""
+        self._compact()
+        return self.offsets, self.indices
+    
+    def copy(self):
+        """
+        Independent CompactGraph with the same courses, conflicts and weights
+        Pending edges are merged first; the arrays are copied in bulk, also
+        when they are read-only views of a snapshot
+        """
+        self._compact()
+        compact = CompactGraph()
+        compact.vertices = list(self.vertices)
+        compact.index = dict(self.index)
+        compact.offsets = _copy_array('q', self.offsets)
+        compact.indices = _copy_array('i', self.indices)
+        if self.weights is not None:
+            compact.weights = _copy_array('d', self.weights)
+            compact._pending_weights = array('d')
+        return compact
+    
+    @classmethod
+    def from_edge_arrays(cls, vertices, src, dst):
+        """Build a CompactGraph from course names and integer edge endpoint arrays"""
+        compact = cls()
+        compact.add_vertices(vertices)
+        if np is not None and isinstance(src, np.ndarray):
+            compact._pending_src = _to_array('i', src.astype(np.int32))
+            compact._pending_dst = _to_array('i', dst.astype(np.int32))
+        else:
+            compact._pending_src = array('i', src)
+            compact._pending_dst = array('i', dst)
+        compact._compact()
+        return compact
+    
+    @classmethod
+    def from_graph(cls, graph):
+        """Build a CompactGraph holding the same vertices and edges as graph"""
+        compact = cls()
+        compact.add_vertices(graph.vertices)
+        index = compact.index
+        compact.add_weighted_edges(
+            (vertex, neighbor, weight)
+            for vertex in graph.vertices
+            for neighbor, weight in graph.get_weighted_neighbors(vertex)
+            if index[vertex] <= index[neighbor]
+        )
+        compact._compact()
+        return compact
+    
+    def _accumulated(self, src, dst, weights):
+        """
+        Sum a batch per course pair and add the current weight of each edge
+        Returns (src, dst, weights) arrays with one entry per distinct pair
+        """
+        self._compact()
+        totals = {}
+        for i, j, weight in zip(src, dst, weights):
+            key = (i, j) if i < j else (j, i)
+            totals[key] = totals.get(key, 0.0) + weight
+        src, dst, weights = array('i'), array('i'), array('d')
+        for (i, j), weight in totals.items():
+            src.append(i)
+            dst.append(j)
+            weights.append(self._weight_of(i, j) + weight)
+        return src, dst, weights
+    
+    def _enable_weights(self):
+        """Start tracking edge weights, treating existing edges as weight 1"""
+        if self._pending_weights is None:
+            self._pending_weights = array('d', [_KEEP]) * len(self._pending_src)
+        if self.weights is None:
+            self.weights = array('d', [1.0]) * len(self.indices)
+    
+    def _reset_overlay(self):
+        # Pending edges indexed for reads: vertex id -> {new neighbor id: None},
+        # (smaller id, larger id) -> explicit pending weight, and how many of
+        # the pending edges are indexed and how many of them are new
+        self._overlay = {}
+        self._overlay_weights = {}
+        self._overlay_seen = 0
+        self._overlay_edges = 0
+    
+    def _prepare_read(self):
+        """Index a few pending edges in the overlay, or merge many into the CSR arrays"""
+        pending = len(self._pending_src)
+        if pending == self._overlay_seen:
+            return
+        if pending > max(OVERLAY_LIMIT, len(self.indices) // 64):
+            self._compact()
+            return
+        overlay = self._overlay
+        src, dst, weights = self._pending_src, self._pending_dst, self._pending_weights
+        for k in range(self._overlay_seen, pending):
+            i, j = src[k], dst[k]
+            if j not in overlay.get(i, ()) and self._position(i, j) < 0:
+                overlay.setdefault(i, {})[j] = None
+                if i != j:
+                    overlay.setdefault(j, {})[i] = None
+                self._overlay_edges += 1
+            if weights is not None and weights[k] == weights[k]:
+                self._overlay_weights[(i, j) if i < j else (j, i)] = weights[k]
+        self._overlay_seen = pending
+    
+    def _compact(self):
+        """Merge pending edges into the CSR arrays, dropping duplicates"""
+        if not self._pending_src:
+            return
+        if np is not None:
+            self._compact_numpy()
+        else:
+            self._compact_python()
+        self._pending_src = array('i')
+        self._pending_dst = array('i')
+        if self._pending_weights is not None:
+            self._pending_weights = array('d')
+        self._reset_overlay()
+    
+    def _compact_python(self):
+        """Pure Python CSR merge used when NumPy is not installed"""
+        n = len(self.vertices)
+        weighted = self.weights is not None
+        rows = [{} for _ in range(n)]
+        offsets, indices = self.offsets, self.indices
+        for i in range(len(offsets) - 1):
+            lo, hi = offsets[i], offsets[i + 1]
+            if weighted:
+                rows[i].update(zip(indices[lo:hi], self.weights[lo:hi]))
+            else:
+                rows[i].update(dict.fromkeys(indices[lo:hi], 1.0))
+        
+        pending_weights = self._pending_weights or [_KEEP] * len(self._pending_src)
+        for u, v, weight in zip(self._pending_src, self._pending_dst, pending_weights):
+            if weight != weight:
+                rows[u].setdefault(v, 1.0)
+                rows[v].setdefault(u, 1.0)
+            else:
+                rows[u][v] = weight
+                rows[v][u] = weight
+        
+        new_offsets = array('q', [0])
+        new_indices = array('i')
+        new_weights = array('d') if weighted else None
+        for row in rows:
+            columns = sorted(row)
+            new_indices.extend(columns)
+            new_offsets.append(len(new_indices))
+            if weighted:
+                new_weights.extend(row[c] for c in columns)
+        self.offsets, self.indices, self.weights = new_offsets, new_indices, new_weights
+    
+    def _compact_numpy(self):
+        """Vectorized CSR merge: sort packed (row, column) keys and dedupe"""
+        n = len(self.vertices)
+        offsets = _as_numpy(self.offsets, np.int64)
+        old_cols = _as_numpy(self.indices, np.int32).astype(np.int64)
+        old_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        src = _as_numpy(self._pending_src, np.int32).astype(np.int64)
+        dst = _as_numpy(self._pending_dst, np.int32).astype(np.int64)
+        
+        # Pending edges are interleaved in both directions to keep insertion order
+        rows = np.concatenate((old_rows, np.column_stack((src, dst)).ravel()))
+        cols = np.concatenate((old_cols, np.column_stack((dst, src)).ravel()))
+        keys = rows * n + cols
+        
+        if self.weights is None:
+            keys = np.unique(keys)
+            weights = None
+        else:
+            pending = _as_numpy(self._pending_weights, np.float64)
+            weights = np.concatenate((_as_numpy(self.weights, np.float64), np.repeat(pending, 2)))
+            # Later entries win; NaN entries only keep the edge (default weight 1)
+            order = np.argsort(keys, kind='stable')
+            keys, weights = keys[order], weights[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            positions = np.where(np.isnan(weights), -1, np.arange(len(keys)))
+            last = np.maximum.reduceat(positions, starts)
+            keys = keys[starts]
+            weights = np.where(last >= 0, weights[np.maximum(last, 0)], 1.0)
+        
+        rows, cols = np.divmod(keys, n)
+        new_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=new_offsets[1:])
+        self.offsets = _to_array('q', new_offsets)
+        self.indices = _to_array('i', cols.astype(np.int32))
+        if weights is not None:
+            self.weights = _to_array('d', weights.astype(np.float64))
+
+
+# Pending weight meaning "keep the current weight of the edge (1 if new)"
+_KEEP = float('nan')
+
+# Pending edges are merged into the CSR arrays once there are more than this
+# many (or more than 1/64 of the adjacency entries); fewer are read through the overlay
+OVERLAY_LIMIT = 4096
+
+
+def _as_numpy(buffer, dtype):
+    """Wrap an array.array buffer as a NumPy array without copying"""
+    if not len(buffer):
+        return np.zeros(0, dtype=dtype)
+    return np.frombuffer(buffer, dtype=dtype)
+
+
+def _to_array(typecode, values):
+    """Copy a NumPy array into an array.array of the given typecode"""
+    result = array(typecode)
+    result.frombytes(values.tobytes())
+    return result
+
+
+def _copy_array(typecode, buffer):
+    """Copy an array.array or a snapshot's memoryview into a new array.array"""
+    result = array(typecode)
+    result.frombytes(memoryview(buffer).cast('B'))
+    return result
+
+
+def to_csr(graph):
+    """
+    Get a CSR view of any graph backend
+    Returns (vertices, offsets, indices) with integer ids following graph.vertices
+    """
+    if isinstance(graph, CompactGraph):
+        offsets, indices = graph.to_csr()
+        return graph.vertices, offsets, indices
+    index = {vertex: i for i, vertex in enumerate(graph.vertices)}
+    offsets = array('q', [0])
+    indices = array('i')
+    for vertex in graph.vertices:
+        indices.extend(index[neighbor] for neighbor in graph.get_neighbors(vertex))
+        offsets.append(len(indices))
+    return graph.vertices, offsets, indices
+
+
+def to_edge_arrays(graph):
+    """
+    Get every edge of any graph backend once as integer endpoint arrays
+    Returns (vertices, src, dst) with src[k] < dst[k] for each edge k
+    """
+    vertices, offsets, indices = to_csr(graph)
+    return (vertices,) + _csr_edges(offsets, indices)
+
+
+def _csr_edges(offsets, indices):
+    """(src, dst) arrays holding each edge of CSR arrays once, src < dst"""
+    n = len(offsets) - 1
+    if np is not None:
+        rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(_as_numpy(offsets, np.int64)))
+        cols = _as_numpy(indices, np.int32)
+        keep = rows < cols
+        return _to_array('i', rows[keep]), _to_array('i', cols[keep])
+    src = array('i')
+    dst = array('i')
+    for i in range(n):
+        for j in indices[offsets[i]:offsets[i + 1]]:
+            if i < j:
+                src.append(i)
+                dst.append(j)
+    return src, dst
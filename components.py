@@ -0,0 +1,146 @@
+"""
+Component Decomposition Module for Course Scheduling
+Splits the conflict graph into connected components and colors them separately
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from compact_graph import to_csr
+from graph_coloring import color_graph, get_color_count
+from portfolio import graph_from_snapshot
+
+
+def component_labels(graph):
+    """
+    Label every vertex with the id of its connected component in O(V + E)
+    Returns (vertices, labels, count) with labels following graph.vertices
+    """
+    vertices, offsets, indices = to_csr(graph)
+    n = len(vertices)
+    labels = array('i', [-1]) * n
+    count = 0
+    for root in range(n):
+        if labels[root] >= 0:
+            continue
+        labels[root] = count
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            for u in indices[offsets[v]:offsets[v + 1]]:
+                if labels[u] < 0:
+                    labels[u] = count
+                    stack.append(u)
+        count += 1
+    return vertices, labels, count
+
+
+def connected_components(graph):
+    """Get the connected components as lists of courses, largest first"""
+    vertices, labels, count = component_labels(graph)
+    components = [[] for _ in range(count)]
+    for vertex, label in zip(vertices, labels):
+        components[label].append(vertex)
+    components.sort(key=len, reverse=True)
+    return components
+
+
+def component_stats(sizes):
+    """
+    Summarize component sizes: count, largest, isolated courses and a
+    histogram of sizes in power-of-two buckets ('1', '2-3', '4-7', ...)
+    """
+    histogram = {}
+    for size in sorted(sizes):
+        low = 1 << (size.bit_length() - 1)
+        label = str(low) if low == 1 else f"{low}-{2 * low - 1}"
+        histogram[label] = histogram.get(label, 0) + 1
+    return {
+        'components': len(sizes),
+        'largest': max(sizes) if sizes else 0,
+        'isolated': sum(1 for size in sizes if size == 1),
+        'size_histogram': histogram,
+    }
+
+
+def _component_snapshot(vertices, offsets, indices, ids):
+    """CSR snapshot (as made by portfolio.graph_snapshot) of the subgraph on ids"""
+    local = {g: i for i, g in enumerate(ids)}
+    sub_offsets = array('q', [0])
+    sub_indices = array('i')
+    for g in ids:
+        sub_indices.extend(local[u] for u in indices[offsets[g]:offsets[g + 1]])
+        sub_offsets.append(len(sub_indices))
+    return [vertices[g] for g in ids], sub_offsets.tobytes(), sub_indices.tobytes()
+
+
+def _color_component(snapshot, strategy):
+    """Color one component snapshot; returns colors in snapshot vertex order"""
+    subgraph = graph_from_snapshot(snapshot)
+    coloring = color_graph(subgraph, strategy)
+    return [coloring[vertex] for vertex in subgraph.vertices]
+
+
+def decomposed_coloring(graph, strategy='greedy', workers=None, min_parallel_size=1000,
+                        stats=None):
+    """
+    Color each connected component on its own and merge the results
+    
+    Components share no conflicts, so each one may reuse slots 0, 1, ... and
+    the merged schedule needs as many slots as the hardest component. Isolated
+    courses get slot 0 directly; components with at least min_parallel_size
+    courses are colored in a process pool when there are several of them, and
+    all the others together in a single run over their union.
+    Any strategy from graph_coloring.STRATEGIES can be used.
+    Returns a dictionary mapping vertices to colors (time slots); if a stats
+    dict is given, it receives component_stats() plus the slot count of the
+    five hardest components as (size, slots) pairs under 'hardest'.
+    """
+    vertices, offsets, indices = to_csr(graph)
+    _, labels, count = component_labels(graph)
+    members = [[] for _ in range(count)]
+    for i, label in enumerate(labels):
+        members[label].append(i)
+    
+    colors = [0] * len(vertices)
+    slots = [1] * count
+    large = [c for c in range(count) if len(members[c]) >= min_parallel_size]
+    small = [c for c in range(count) if 1 < len(members[c]) < min_parallel_size]
+    if len(large) < 2:
+        small, large = small + large, []
+    
+    # Small components share no conflicts either, so one run over their union
+    # colors them all without a snapshot and strategy setup per component;
+    # with no large ones the union is the graph minus its isolated courses
+    batch = [i for c in small for i in members[c]]
+    if batch:
+        if large:
+            result = _color_component(_component_snapshot(vertices, offsets, indices, batch),
+                                      strategy)
+        else:
+            coloring = color_graph(graph, strategy)
+            result = [coloring[vertices[i]] for i in batch]
+        for i, color in zip(batch, result):
+            colors[i] = color
+        for c in small:
+            slots[c] = max(colors[i] for i in members[c]) + 1
+    if large:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {c: executor.submit(_color_component,
+                                          _component_snapshot(vertices, offsets, indices,
+                                                              members[c]),
+                                          strategy)
+                       for c in large}
+            for c, future in futures.items():
+                result = future.result()
+                for i, color in zip(members[c], result):
+                    colors[i] = color
+                slots[c] = max(result) + 1
+    
+    coloring = dict(zip(vertices, colors))
+    if stats is not None:
+        stats.update(component_stats([len(m) for m in members]))
+        hardest = sorted(range(count), key=lambda c: (slots[c], len(members[c])), reverse=True)
+        stats['hardest'] = [(len(members[c]), slots[c]) for c in hardest[:5]]
+        stats['colors'] = get_color_count(coloring)
+    return coloring
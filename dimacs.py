@@ -0,0 +1,210 @@
+"""
+DIMACS Module for Course Scheduling
+Reads and writes DIMACS .col graph coloring instances and runs them as a benchmark
+"""
+
+import os
+import sys
+import time
+
+from graph_coloring import Graph, STRATEGIES, color_graph, get_color_count, validate_coloring
+from lower_bounds import compute_lower_bound
+
+# Best known (mostly proven optimal) color counts of standard DIMACS instances
+KNOWN_BEST = {
+    'anna': 11, 'david': 11, 'homer': 13, 'huck': 11, 'jean': 10, 'games120': 9,
+    'miles250': 8, 'miles500': 20, 'miles750': 31, 'miles1000': 42, 'miles1500': 73,
+    'myciel3': 4, 'myciel4': 5, 'myciel5': 6, 'myciel6': 7, 'myciel7': 8,
+    'queen5_5': 5, 'queen6_6': 7, 'queen7_7': 7, 'queen8_8': 9, 'queen8_12': 12,
+    'queen9_9': 10, 'queen10_10': 11, 'queen11_11': 11, 'queen12_12': 12,
+    'queen13_13': 13,
+    'le450_5a': 5, 'le450_5b': 5, 'le450_5c': 5, 'le450_5d': 5,
+    'le450_15a': 15, 'le450_15b': 15, 'le450_15c': 15, 'le450_15d': 15,
+    'le450_25a': 25, 'le450_25b': 25, 'le450_25c': 25, 'le450_25d': 25,
+    'DSJC125.1': 5, 'DSJC125.5': 17, 'DSJC125.9': 44,
+    'DSJC250.1': 8, 'DSJC250.5': 28, 'DSJC250.9': 72,
+    'DSJC500.1': 12, 'DSJC500.5': 47, 'DSJC500.9': 126,
+    'DSJC1000.1': 20, 'DSJC1000.5': 82, 'DSJC1000.9': 222,
+    'school1': 14, 'school1_nsh': 14,
+    'fpsol2.i.1': 65, 'mulsol.i.1': 49, 'zeroin.i.1': 49,
+}
+
+
+def read_dimacs(path, graph=None):
+    """
+    Read a DIMACS edge-format (.col) file into a graph
+    
+    Vertices are the integers 1..n from the 'p edge n m' line and are added
+    in one bulk call; 'e u v' lines are streamed into graph.add_edges, so the
+    file is never held in memory. Comment ('c') lines and self-loops are
+    skipped. Works with any graph backend (Graph by default).
+    """
+    if graph is None:
+        graph = Graph()
+    with open(path, encoding='ascii', errors='replace') as f:
+        for line in f:
+            if line.startswith('p'):
+                parts = line.split()
+                if len(parts) < 4:
+                    raise ValueError(f"Invalid problem line in {path}: {line.strip()}")
+                graph.add_vertices(range(1, int(parts[2]) + 1))
+                break
+            if line.startswith('e'):
+                raise ValueError(f"Edge before problem line in {path}")
+        else:
+            raise ValueError(f"No 'p edge' problem line in {path}")
+        graph.add_edges(_dimacs_edges(f))
+    return graph
+
+
+def _dimacs_edges(lines):
+    """Yield (u, v) pairs from the 'e u v' lines, skipping self-loops"""
+    for line in lines:
+        if line.startswith('e'):
+            _, u, v = line.split()[:3]
+            if u != v:
+                yield int(u), int(v)
+
+
+def write_dimacs(path, graph, comment=None):
+    """
+    Write any graph in DIMACS edge format, each edge once
+    Vertices are renumbered 1..n in graph.vertices order
+    """
+    index = {vertex: i for i, vertex in enumerate(graph.vertices, 1)}
+    edge_count = sum(graph.get_degree(vertex) for vertex in graph.vertices) // 2
+    with open(path, 'w', encoding='ascii') as f:
+        if comment:
+            for line in comment.splitlines():
+                f.write(f"c {line}\n")
+        f.write(f"p edge {len(index)} {edge_count}\n")
+        for vertex in graph.vertices:
+            i = index[vertex]
+            f.writelines(f"e {i} {index[neighbor]}\n"
+                         for neighbor in graph.get_neighbors(vertex) if index[neighbor] > i)
+
+
+def queen_graph(rows, cols=None):
+    """
+    The queenR_C instance: squares of a chessboard conflict when a queen on
+    one attacks the other (same row, column or diagonal)
+    """
+    cols = rows if cols is None else cols
+    graph = Graph()
+    squares = [(r, c) for r in range(rows) for c in range(cols)]
+    graph.add_vertices(range(1, len(squares) + 1))
+    graph.add_edges(
+        (i + 1, j + 1)
+        for i, (r1, c1) in enumerate(squares)
+        for j, (r2, c2) in enumerate(squares[i + 1:], i + 1)
+        if r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2)
+    )
+    return graph
+
+
+def mycielski_graph(k):
+    """
+    The myciel(k) instance: triangle-free graph with chromatic number k + 1,
+    built by repeated Mycielski construction starting from a single edge
+    """
+    edges = [(0, 1)]
+    n = 2
+    for _ in range(k - 1):
+        # Copy u_i of every vertex v_i plus a hub w adjacent to all copies
+        edges = (edges + [(u, v + n) for u, v in edges] + [(u + n, v) for u, v in edges]
+                 + [(i + n, 2 * n) for i in range(n)])
+        n = 2 * n + 1
+    graph = Graph()
+    graph.add_vertices(range(1, n + 1))
+    graph.add_edges((u + 1, v + 1) for u, v in edges)
+    return graph
+
+
+def generate_instances(directory):
+    """Write the queen and Mycielski DIMACS instances, which can be rebuilt offline"""
+    os.makedirs(directory, exist_ok=True)
+    instances = {f'queen{n}_{n}': queen_graph(n) for n in range(5, 14)}
+    instances['queen8_12'] = queen_graph(8, 12)
+    instances.update({f'myciel{k}': mycielski_graph(k) for k in range(3, 8)})
+    for name, graph in instances.items():
+        write_dimacs(os.path.join(directory, name + '.col'), graph,
+                     comment=f"{name} (generated by dimacs.py)")
+    return sorted(instances)
+
+
+def instance_name(path):
+    """Instance name of a .col file, e.g. 'DSJC125.1' for .../DSJC125.1.col"""
+    name = os.path.basename(path)
+    return name[:-4] if name.endswith('.col') else name
+
+
+def run_instances(paths, strategies=('greedy',)):
+    """
+    Color each instance with each strategy and print a comparison table
+    Returns a list of result dicts (instance, strategy, slots, bound, best, time, valid)
+    """
+    print(f"{'Instance':<16} {'V':>6} {'E':>8} {'Strategy':<14} {'Slots':>6} {'Bound':>6} "
+          f"{'Best':>5} {'Gap':>5} {'Load (s)':>9} {'Color (s)':>10} {'Valid':>6}")
+    print("-"*99)
+    results = []
+    for path in paths:
+        name = instance_name(path)
+        start = time.perf_counter()
+        graph = read_dimacs(path)
+        load_time = time.perf_counter() - start
+        edge_count = sum(graph.get_degree(v) for v in graph.vertices) // 2
+        best = KNOWN_BEST.get(name)
+        bound = compute_lower_bound(graph).value
+        for strategy in strategies:
+            start = time.perf_counter()
+            coloring = color_graph(graph, strategy, bound)
+            elapsed = time.perf_counter() - start
+            slots = get_color_count(coloring)
+            valid = validate_coloring(graph, coloring)
+            gap = f"{slots - best:+d}" if best is not None else "-"
+            print(f"{name:<16} {len(graph.vertices):>6} {edge_count:>8} {strategy:<14} "
+                  f"{slots:>6} {bound:>6} {best or '-':>5} {gap:>5} {load_time:>9.3f} {elapsed:>10.3f} "
+                  f"{str(valid):>6}")
+            results.append({'instance': name, 'strategy': strategy, 'slots': slots,
+                            'bound': bound, 'best': best, 'time': elapsed, 'valid': valid})
+    return results
+
+
+def main():
+    """
+    Run DIMACS instances through the coloring strategies
+    Usage: python dimacs.py FILE_OR_DIR... [--strategies greedy,dsatur]
+           python dimacs.py --generate DIR
+    """
+    args = sys.argv[1:]
+    if not args:
+        print(main.__doc__)
+        sys.exit(1)
+    if args[0] == '--generate':
+        directory = args[1] if len(args) > 1 else 'instances'
+        names = generate_instances(directory)
+        print(f"Wrote {len(names)} instances to {directory}")
+        return
+    
+    strategies = ['greedy']
+    if '--strategies' in args:
+        position = args.index('--strategies')
+        strategies = args[position + 1].split(',')
+        del args[position:position + 2]
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        print(f"Unknown strategies: {', '.join(unknown)} (choose from {', '.join(STRATEGIES)})")
+        sys.exit(1)
+    
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            paths.extend(sorted(os.path.join(arg, name) for name in os.listdir(arg)
+                                if name.endswith('.col')))
+        else:
+            paths.append(arg)
+    run_instances(paths, strategies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Enrollment Import Module for Course Scheduling
+Streams student enrollment records and builds a weighted conflict graph
+"""
+
+import csv
+import json
+import sys
+import time
+from array import array
+from collections import Counter
+from itertools import combinations
+
+from graph_coloring import Graph
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Course ids are packed into one integer per pair: (smaller id << 32) | larger id
+_PAIR_SHIFT = 32
+_PAIR_MASK = (1 << _PAIR_SHIFT) - 1
+
+
+def read_enrollment_csv(path, student_field='student', course_field='course',
+                        courses_field='courses', separator=';'):
+    """
+    Stream (student, courses) records from a CSV file
+    Accepts one row per student with a `courses` column ("CS101;MATH201"),
+    or one row per enrollment with a `course` column. The latter is streamed
+    one student at a time, so each student's rows must be consecutive (e.g.
+    sorted by student); a student whose rows are split raises ValueError
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        if courses_field in fields:
+            for row in reader:
+                courses = [c.strip() for c in row[courses_field].split(separator)]
+                yield row[student_field], [c for c in courses if c]
+        elif course_field in fields:
+            # Only student names are kept, to tell a split student from a new one
+            finished = set()
+            student, courses = None, []
+            for row in reader:
+                if row[student_field] != student:
+                    if courses:
+                        yield student, courses
+                        finished.add(student)
+                    student, courses = row[student_field], []
+                    if student in finished:
+                        raise ValueError(
+                            f"{path}, line {reader.line_num}: rows of student "
+                            f"'{student}' are not consecutive; sort the file by "
+                            f"'{student_field}' first")
+                courses.append(row[course_field].strip())
+            if courses:
+                yield student, courses
+        else:
+            raise ValueError(f"CSV file needs a '{course_field}' or '{courses_field}' column")
+
+
+def read_enrollment_jsonl(path, student_field='student', courses_field='courses'):
+    """
+    Stream (student, courses) records from a JSON Lines file
+    Each line is an object whose courses field is a list of course names;
+    any other line raises ValueError with its line number
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}, line {line_number}: invalid JSON ({e})") from None
+            if not isinstance(record, dict) or courses_field not in record:
+                raise ValueError(f"{path}, line {line_number}: "
+                                 f"expected an object with a '{courses_field}' list")
+            courses = record[courses_field]
+            if not isinstance(courses, list):
+                raise ValueError(f"{path}, line {line_number}: '{courses_field}' must be "
+                                 f"a list, not {type(courses).__name__}")
+            yield record.get(student_field), courses
+
+
+def read_enrollments(path):
+    """Stream (student, courses) records, choosing the reader from the file extension"""
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        return read_enrollment_jsonl(path)
+    return read_enrollment_csv(path)
+
+
+class ConflictGraphBuilder:
+    """
+    Accumulates shared-student counts between courses from enrollment records
+    
+    Course names are interned to integer ids and every pair of courses taken by
+    the same student is packed into a single integer key. Keys are buffered in a
+    fixed-size array and counted chunk by chunk, so memory depends on the number
+    of distinct conflicts, not on the size of the enrollment file.
+    """
+    
+    def __init__(self, chunk_size=1000000):
+        self.chunk_size = chunk_size
+        self.courses = []
+        self.index = {}
+        # Students enrolled in each course, by course id
+        self.enrolled = array('q')
+        self.rows = 0
+        self.pairs = 0
+        self.elapsed = 0.0
+        self._chunk = array('q')
+        self._counts = Counter()
+        self._keys = None
+        self._weights = None
+    
+    def add_student(self, courses):
+        """Add one student's course list"""
+        index = self.index
+        ids = set()
+        for course in courses:
+            course_id = index.get(course)
+            if course_id is None:
+                course_id = index[course] = len(self.courses)
+                self.courses.append(course)
+                self.enrolled.append(0)
+            ids.add(course_id)
+        
+        enrolled = self.enrolled
+        for course_id in ids:
+            enrolled[course_id] += 1
+        self.rows += 1
+        if len(ids) < 2:
+            return
+        chunk = self._chunk
+        start = len(chunk)
+        chunk.extend((a << _PAIR_SHIFT) | b for a, b in combinations(sorted(ids), 2))
+        self.pairs += len(chunk) - start
+        if len(chunk) >= self.chunk_size:
+            self._flush()
+    
+    def add_records(self, records, progress=None, progress_every=100000):
+        """
+        Consume (student, courses) records from any iterable
+        progress(builder) is called every progress_every records if given
+        """
+        start = time.perf_counter()
+        for count, (_, courses) in enumerate(records, 1):
+            self.add_student(courses)
+            if progress is not None and count % progress_every == 0:
+                self.elapsed += time.perf_counter() - start
+                start = time.perf_counter()
+                progress(self)
+        self._flush()
+        self.elapsed += time.perf_counter() - start
+    
+    def rows_per_second(self):
+        """Get the enrollment rows processed per second so far"""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+    
+    def course_sizes(self):
+        """Get a dict of course -> number of enrolled students"""
+        return dict(zip(self.courses, self.enrolled))
+    
+    def weighted_edges(self, min_shared=1):
+        """Yield (course1, course2, shared_students) for every conflict found"""
+        self._flush()
+        courses = self.courses
+        if self._keys is not None:
+            pairs = zip(self._keys.tolist(), self._weights.tolist())
+        else:
+            pairs = self._counts.items()
+        for key, weight in pairs:
+            if weight >= min_shared:
+                yield courses[key >> _PAIR_SHIFT], courses[key & _PAIR_MASK], weight
+    
+    def build(self, graph=None, min_shared=1):
+        """
+        Fill a graph (a new Graph by default) with courses and weighted conflicts
+        Shared-student counts are added to the weights of conflicts already in
+        the graph, so importing several enrollment files sums them
+        """
+        if graph is None:
+            graph = Graph()
+        graph.add_vertices(self.courses)
+        graph.add_weighted_edges(self.weighted_edges(min_shared), accumulate=True)
+        return graph
+    
+    def summary(self):
+        """Get a one-line summary of the import throughput"""
+        conflicts = len(self._keys) if self._keys is not None else len(self._counts)
+        return (f"{self.rows} students, {len(self.courses)} courses, "
+                f"{self.pairs} course pairs, {conflicts} conflicts "
+                f"in {self.elapsed:.2f}s ({self.rows_per_second():,.0f} rows/s)")
+    
+    def _flush(self):
+        """Count the buffered pair keys and merge them into the totals"""
+        chunk = self._chunk
+        if not chunk:
+            return
+        if np is not None:
+            # Sort-and-count the chunk, then merge with the running totals
+            keys, counts = np.unique(np.frombuffer(chunk, dtype=np.int64), return_counts=True)
+            if self._keys is not None:
+                keys, inverse = np.unique(np.concatenate((self._keys, keys)),
+                                          return_inverse=True)
+                counts = np.bincount(inverse, weights=np.concatenate((self._weights, counts)))
+            self._keys, self._weights = keys, counts.astype(np.int64)
+        else:
+            self._counts.update(chunk)
+        self._chunk = array('q')
+
+
+def build_conflict_graph(path, graph=None, min_shared=1, progress=None):
+    """
+    Build a weighted conflict graph from an enrollment CSV or JSONL file
+    Returns (graph, builder); builder holds the import statistics
+    """
+    builder = ConflictGraphBuilder()
+    builder.add_records(read_enrollments(path), progress=progress)
+    return builder.build(graph, min_shared), builder
+
+
+def main():
+    """Import an enrollment file from the command line and report throughput"""
+    if len(sys.argv) < 2:
+        print("Usage: python enrollment.py ENROLLMENT_FILE [MIN_SHARED]")
+        sys.exit(1)
+    min_shared = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    graph, builder = build_conflict_graph(
+        sys.argv[1], min_shared=min_shared,
+        progress=lambda b: print(f"  {b.rows} rows ({b.rows_per_second():,.0f} rows/s)")
+    )
+    print(builder.summary())
+    print(f"Graph: {len(graph.vertices)} courses, "
+          f"{sum(graph.get_degree(v) for v in graph.vertices) // 2} conflicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Exact Coloring Module for Course Scheduling
+Branch-and-bound search for the minimum number of time slots
+"""
+
+import sys
+import time
+
+from graph_coloring import greedy_coloring, dsatur_coloring, get_color_count
+
+
+class ExactColoringResult:
+    """Outcome of an exact coloring run"""
+    
+    def __init__(self, coloring, optimal, lower_bound, stats):
+        self.coloring = coloring
+        self.optimal = optimal
+        self.lower_bound = lower_bound
+        self.stats = stats
+    
+    @property
+    def color_count(self):
+        """Number of colors (time slots) in the best coloring found"""
+        return get_color_count(self.coloring)
+    
+    def __repr__(self):
+        status = "optimal" if self.optimal else "not proven optimal"
+        return (f"ExactColoringResult({self.color_count} colors, {status}, "
+                f"lower bound {self.lower_bound}, {self.stats['nodes']} nodes)")
+
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the time or node budget runs out"""
+
+
+def _popcount(mask):
+    """Number of set bits in a bitset"""
+    return bin(mask).count('1')
+
+
+def _bits(mask):
+    """Yield the positions of the set bits in a bitset"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def greedy_clique(adjacency, order):
+    """
+    Find a large clique with bitset intersections
+    adjacency[i] is the neighbor bitset of vertex i; order lists vertices by
+    decreasing degree. Every vertex in order is tried as a starting point
+    """
+    best = []
+    for start in order:
+        if _popcount(adjacency[start]) < len(best):
+            continue
+        clique = [start]
+        candidates = adjacency[start]
+        while candidates:
+            # Extend with the highest-degree candidate
+            for v in order:
+                if candidates >> v & 1:
+                    break
+            clique.append(v)
+            candidates &= adjacency[v]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def exact_coloring(graph, time_limit=10.0, node_limit=None, callback=None, lower_bound=None,
+                   stop=None):
+    """
+    Branch-and-bound coloring that proves the minimum number of colors
+    
+    Starts from the better of the greedy and DSatur colorings, prunes with a
+    clique lower bound and bitset color domains, and branches on the vertex
+    with the most distinct neighbor colors. Stops when optimality is proven or
+    when time_limit seconds / node_limit search nodes are used up.
+    callback(coloring, color_count) is called on every improved coloring.
+    A known lower_bound (e.g. from lower_bounds.compute_lower_bound) replaces
+    the greedy clique bound when it is larger, so the search can stop sooner.
+    stop (e.g. a threading.Event) ends the search early once it is set.
+    Returns an ExactColoringResult with the best coloring found.
+    """
+    start_time = time.perf_counter()
+    vertices = list(graph.vertices)
+    n = len(vertices)
+    
+    incumbent = min((greedy_coloring(graph), dsatur_coloring(graph)), key=get_color_count)
+    stats = {'nodes': 0, 'elapsed': 0.0, 'initial_colors': get_color_count(incumbent),
+             'improvements': 0, 'stopped': None}
+    if n == 0:
+        return ExactColoringResult({}, True, 0, stats)
+    
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    adjacency = [0] * n
+    for i, vertex in enumerate(vertices):
+        for neighbor in graph.get_neighbors(vertex):
+            j = index[neighbor]
+            if j != i:
+                adjacency[i] |= 1 << j
+    degrees = [_popcount(mask) for mask in adjacency]
+    order = sorted(range(n), key=lambda i: degrees[i], reverse=True)
+    
+    clique = greedy_clique(adjacency, order)
+    lower_bound = max(len(clique), lower_bound or 0)
+    best = [get_color_count(incumbent)]
+    best_colors = [incumbent[vertex] for vertex in vertices]
+    
+    if lower_bound >= best[0]:
+        stats['elapsed'] = time.perf_counter() - start_time
+        return ExactColoringResult(incumbent, True, lower_bound, stats)
+    
+    deadline = start_time + time_limit if time_limit is not None else None
+    colors = [-1] * n
+    # forbidden[i] is the bitset of colors already used by neighbors of vertex i
+    forbidden = [0] * n
+    
+    def assign(v, color):
+        """Color v and return the neighbors whose domain shrank"""
+        colors[v] = color
+        bit = 1 << color
+        changed = []
+        for u in _bits(adjacency[v]):
+            if colors[u] < 0 and not forbidden[u] & bit:
+                forbidden[u] |= bit
+                changed.append(u)
+        return changed
+    
+    def unassign(v, color, changed):
+        """Undo assign(v, color)"""
+        colors[v] = -1
+        bit = ~(1 << color)
+        for u in changed:
+            forbidden[u] &= bit
+    
+    # The clique needs pairwise different colors; fixing them breaks symmetry
+    uncolored = n
+    for color, v in enumerate(clique):
+        assign(v, color)
+        uncolored -= 1
+    
+    def search(used, uncolored):
+        stats['nodes'] += 1
+        if node_limit is not None and stats['nodes'] > node_limit:
+            stats['stopped'] = 'node limit'
+            raise _BudgetExceeded()
+        if deadline is not None and stats['nodes'] & 255 == 0 and time.perf_counter() > deadline:
+            stats['stopped'] = 'time limit'
+            raise _BudgetExceeded()
+        if stop is not None and stats['nodes'] & 255 == 0 and stop.is_set():
+            stats['stopped'] = 'cancelled'
+            raise _BudgetExceeded()
+        
+        if used >= best[0]:
+            return False
+        if uncolored == 0:
+            best[0] = used
+            best_colors[:] = colors
+            stats['improvements'] += 1
+            if callback is not None:
+                callback(dict(zip(vertices, colors)), used)
+            return used <= lower_bound
+        
+        # Only colors below best - 1 can lead to an improvement
+        limit_mask = (1 << (best[0] - 1)) - 1
+        v, v_saturation = -1, -1
+        for u in range(n):
+            if colors[u] < 0:
+                saturation = _popcount(forbidden[u] & limit_mask)
+                if saturation > v_saturation or (saturation == v_saturation and
+                                                 degrees[u] > degrees[v]):
+                    v, v_saturation = u, saturation
+        if v_saturation >= best[0] - 1:
+            return False
+        
+        for color in range(min(used + 1, best[0] - 1)):
+            if forbidden[v] >> color & 1:
+                continue
+            changed = assign(v, color)
+            done = search(max(used, color + 1), uncolored - 1)
+            unassign(v, color, changed)
+            if done:
+                return True
+            if color + 1 >= best[0] - 1:
+                break
+        return False
+    
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, n + 100))
+    try:
+        search(lower_bound, uncolored)
+        optimal = True
+    except _BudgetExceeded:
+        optimal = False
+    finally:
+        sys.setrecursionlimit(old_limit)
+    
+    stats['elapsed'] = time.perf_counter() - start_time
+    coloring = dict(zip(vertices, best_colors))
+    if best[0] <= lower_bound:
+        optimal = True
+    return ExactColoringResult(coloring, optimal, lower_bound, stats)
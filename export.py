@@ -0,0 +1,207 @@
+"""
+Export Module for Course Scheduling
+Streams a schedule to CSV, JSON Lines or iCalendar (.ics) files
+"""
+
+import csv
+import hashlib
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+
+class SlotCalendar:
+    """
+    Maps time slot numbers to real date/time blocks
+    
+    Each teaching day holds slots_per_day blocks of slot_minutes, starting at
+    day_start and separated by gap_minutes. Slots fill one day, then continue
+    on the next day listed in weekdays (0 = Monday).
+    """
+    
+    def __init__(self, start_date=None, day_start='09:00', slot_minutes=90,
+                 gap_minutes=15, slots_per_day=4, weekdays=(0, 1, 2, 3, 4)):
+        if slots_per_day < 1 or slot_minutes < 1 or not weekdays:
+            raise ValueError("A slot calendar needs at least one slot per day")
+        self.start_date = start_date or date.today()
+        hours, minutes = (int(part) for part in day_start.split(':'))
+        self.day_start = timedelta(hours=hours, minutes=minutes)
+        self.slot_length = timedelta(minutes=slot_minutes)
+        self.slot_step = timedelta(minutes=slot_minutes + gap_minutes)
+        self.slots_per_day = slots_per_day
+        self.weekdays = sorted(set(weekdays))
+        self._days = []
+    
+    def day(self, index):
+        """Date of the index-th teaching day"""
+        days = self._days
+        current = days[-1] + timedelta(days=1) if days else self.start_date
+        while len(days) <= index:
+            if current.weekday() in self.weekdays:
+                days.append(current)
+            current += timedelta(days=1)
+        return days[index]
+    
+    def slot_times(self, slot):
+        """(start, end) datetimes of a time slot"""
+        day_index, position = divmod(slot, self.slots_per_day)
+        day = self.day(day_index)
+        start = datetime(day.year, day.month, day.day) + self.day_start + position * self.slot_step
+        return start, start + self.slot_length
+    
+    def describe(self, slot):
+        """Human-readable block of a time slot, e.g. 'Mon 2024-09-02 09:00-10:30'"""
+        start, end = self.slot_times(slot)
+        return f"{start:%a %Y-%m-%d %H:%M}-{end:%H:%M}"
+
+
+def iter_schedule(coloring, batch=65536):
+    """
+    Yield (slot, course) pairs grouped by slot, courses in name order
+    Courses are collected a few consecutive slots at a time (about batch
+    courses, or one whole slot if it is larger) with one pass over the
+    coloring per group, so memory is bounded by the batch and the largest
+    slot rather than by the size of the schedule
+    """
+    sizes = Counter(coloring.values())
+    slots = sorted(sizes)
+    start = 0
+    while start < len(slots):
+        end = start + 1
+        total = sizes[slots[start]]
+        while end < len(slots) and total + sizes[slots[end]] <= batch:
+            total += sizes[slots[end]]
+            end += 1
+        group = {slot: [] for slot in slots[start:end]}
+        # The group is a run of consecutive used slots, so a range check selects it
+        low, high = slots[start], slots[end - 1]
+        for course, slot in coloring.items():
+            if low <= slot <= high:
+                group[slot].append(course)
+        for slot, courses in group.items():
+            courses.sort(key=str)
+            for course in courses:
+                yield slot, course
+        start = end
+
+
+def schedule_rows(coloring, calendar=None):
+    """Yield one dict per course with its slot and, given a calendar, start/end times"""
+    times = {}
+    for slot, course in iter_schedule(coloring):
+        row = {'course': course, 'slot': slot}
+        if calendar is not None:
+            # Courses arrive grouped by slot, so only the current slot is cached
+            if slot not in times:
+                start, end = calendar.slot_times(slot)
+                times = {slot: (start.isoformat(timespec='minutes'),
+                                end.isoformat(timespec='minutes'))}
+            row['start'], row['end'] = times[slot]
+        yield row
+
+
+def write_csv(f, coloring, calendar=None):
+    """Write a CSV schedule to an open text file; returns the number of rows"""
+    fields = ['course', 'slot'] + (['start', 'end'] if calendar is not None else [])
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    count = 0
+    for row in schedule_rows(coloring, calendar):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(f, coloring, calendar=None):
+    """Write one JSON object per course to an open text file; returns the count"""
+    count = 0
+    for row in schedule_rows(coloring, calendar):
+        f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def ics_lines(coloring, calendar):
+    """Yield the lines of an iCalendar file with one event per course"""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    yield 'BEGIN:VCALENDAR'
+    yield 'VERSION:2.0'
+    yield 'PRODID:-//Course Scheduler//Graph Coloring//EN'
+    times = {}
+    for slot, course in iter_schedule(coloring):
+        if slot not in times:
+            start, end = calendar.slot_times(slot)
+            times = {slot: (f'{start:%Y%m%dT%H%M%S}', f'{end:%Y%m%dT%H%M%S}')}
+        start, end = times[slot]
+        yield 'BEGIN:VEVENT'
+        yield f'UID:{_event_uid(course, slot)}@course-scheduler'
+        yield f'DTSTAMP:{stamp}'
+        yield f'DTSTART:{start}'
+        yield f'DTEND:{end}'
+        yield _fold(f'SUMMARY:{_escape(str(course))}')
+        yield f'DESCRIPTION:Time slot {slot}'
+        yield 'END:VEVENT'
+    yield 'END:VCALENDAR'
+
+
+def write_ics(f, coloring, calendar=None):
+    """Write an iCalendar file to an open text file; returns the number of events"""
+    calendar = calendar or SlotCalendar()
+    count = 0
+    for line in ics_lines(coloring, calendar):
+        f.write(line + '\r\n')
+        if line == 'BEGIN:VEVENT':
+            count += 1
+    return count
+
+
+# Export formats by file extension
+EXPORT_FORMATS = {
+    '.csv': write_csv,
+    '.jsonl': write_jsonl,
+    '.ics': write_ics,
+}
+
+
+def export_schedule(path, coloring, calendar=None):
+    """
+    Export a schedule to path, choosing the format from its extension
+    (.csv, .jsonl or .ics). Rows are written one at a time from generators.
+    Returns the number of courses written.
+    """
+    extension = path[path.rfind('.'):].lower() if '.' in path else ''
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {extension or path} "
+                         f"(use {', '.join(EXPORT_FORMATS)})")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        return EXPORT_FORMATS[extension](f, coloring, calendar)
+
+
+def _event_uid(course, slot):
+    """Stable event id: the same course in the same slot keeps its UID across exports"""
+    digest = hashlib.blake2b(f"{course!r}\0{slot}".encode('utf-8'), digest_size=10)
+    return f"course-{digest.hexdigest()}-slot-{slot}"
+
+
+def _escape(text):
+    """Escape text for an iCalendar property value"""
+    return (text.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _fold(line, limit=75):
+    """Fold a content line to at most limit octets per line (RFC 5545)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= limit:
+        return line
+    parts = []
+    while len(encoded) > limit:
+        cut = limit
+        # Do not split a multi-byte UTF-8 character
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
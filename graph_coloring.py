@@ -1,37 +1,94 @@
 """
 Graph Coloring Module for Course Scheduling
-Implements greedy algorithm for graph coloring
+Implements greedy and DSatur algorithms for graph coloring
 """
 
+import heapq
+import random
+
 
 class Graph:
     """Represents a graph where vertices are courses and edges are conflicts"""
     
     def __init__(self):
+        # Each adjacency entry is an insertion-ordered dict mapping a neighbor
+        # to the edge weight, so duplicate conflicts are detected in constant time
         self.adjacency_list = {}
         self.vertices = []
     
     def add_vertex(self, vertex):
         """Add a vertex (course) to the graph"""
         if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []
+            self.adjacency_list[vertex] = {}
             self.vertices.append(vertex)
     
-    def add_edge(self, vertex1, vertex2):
-        """Add an edge (conflict) between two vertices"""
+    def add_vertices(self, vertices):
+        """Add many vertices (courses) from any iterable, keeping insertion order"""
+        adjacency_list = self.adjacency_list
+        append = self.vertices.append
+        for vertex in vertices:
+            if vertex not in adjacency_list:
+                adjacency_list[vertex] = {}
+                append(vertex)
+    
+    def add_edge(self, vertex1, vertex2, weight=None):
+        """
+        Add an edge (conflict) between two vertices
+        New edges get weight 1 unless a weight (e.g. shared students) is given
+        """
         if vertex1 not in self.adjacency_list:
             self.add_vertex(vertex1)
         if vertex2 not in self.adjacency_list:
             self.add_vertex(vertex2)
         
-        if vertex2 not in self.adjacency_list[vertex1]:
-            self.adjacency_list[vertex1].append(vertex2)
-        if vertex1 not in self.adjacency_list[vertex2]:
-            self.adjacency_list[vertex2].append(vertex1)
+        if weight is None:
+            self.adjacency_list[vertex1].setdefault(vertex2, 1)
+            self.adjacency_list[vertex2].setdefault(vertex1, 1)
+        else:
+            self.adjacency_list[vertex1][vertex2] = weight
+            self.adjacency_list[vertex2][vertex1] = weight
+    
+    def add_edges(self, edges):
+        """Add many edges (conflicts) from any iterable of vertex pairs"""
+        adjacency_list = self.adjacency_list
+        append = self.vertices.append
+        for vertex1, vertex2 in edges:
+            neighbors1 = adjacency_list.get(vertex1)
+            if neighbors1 is None:
+                neighbors1 = adjacency_list[vertex1] = {}
+                append(vertex1)
+            neighbors2 = adjacency_list.get(vertex2)
+            if neighbors2 is None:
+                neighbors2 = adjacency_list[vertex2] = {}
+                append(vertex2)
+            neighbors1.setdefault(vertex2, 1)
+            neighbors2.setdefault(vertex1, 1)
+    
+    def add_weighted_edges(self, edges, accumulate=False):
+        """
+        Add many edges from any iterable of (vertex1, vertex2, weight) triples
+        With accumulate, weights are added to those of existing edges (e.g.
+        shared students from another enrollment file) instead of replacing them
+        """
+        adjacency_list = self.adjacency_list
+        append = self.vertices.append
+        for vertex1, vertex2, weight in edges:
+            neighbors1 = adjacency_list.get(vertex1)
+            if neighbors1 is None:
+                neighbors1 = adjacency_list[vertex1] = {}
+                append(vertex1)
+            neighbors2 = adjacency_list.get(vertex2)
+            if neighbors2 is None:
+                neighbors2 = adjacency_list[vertex2] = {}
+                append(vertex2)
+            if accumulate:
+                weight = neighbors1.get(vertex2, 0) + weight
+            neighbors1[vertex2] = weight
+            neighbors2[vertex1] = weight
     
     def get_degree(self, vertex):
         """Get the degree (number of neighbors) of a vertex"""
-        return len(self.adjacency_list.get(vertex, []))
+        return len(self.adjacency_list.get(vertex, ()))
     
     def get_vertices_sorted_by_degree(self):
         """Get vertices sorted by degree in descending order"""
@@ -39,19 +96,36 @@ class Graph:
     
     def get_neighbors(self, vertex):
         """Get all neighbors of a vertex"""
-        return self.adjacency_list.get(vertex, [])
+        return self.adjacency_list.get(vertex, {}).keys()
+    
+    def get_edge_weight(self, vertex1, vertex2):
+        """Get the weight of an edge, or 0 if the vertices do not conflict"""
+        return self.adjacency_list.get(vertex1, {}).get(vertex2, 0)
+    
+    def get_weighted_neighbors(self, vertex):
+        """Get (neighbor, weight) pairs for all neighbors of a vertex"""
+        return self.adjacency_list.get(vertex, {}).items()
 
 
-def greedy_coloring(graph):
+def greedy_coloring(graph, stats=None):
     """
     Greedy algorithm for graph coloring
     Returns a dictionary mapping vertices to colors (time slots)
+    An instrumentation.ColoringStats passed as stats receives phase times and counters
     """
     if not graph.vertices:
         return {}
     
+    # Array-backed graphs are colored on integer ids instead of course names
+    if hasattr(graph, 'to_csr'):
+        return _greedy_coloring_csr(graph, stats=stats)
+    
     # Sort vertices by degree (largest first) for better coloring
+    if stats is not None:
+        stats.phase('sort')
     vertices_sorted = graph.get_vertices_sorted_by_degree()
+    if stats is not None:
+        stats.phase('color')
     
     # Dictionary to store color assignment
     colors = {}
@@ -71,9 +145,226 @@ def greedy_coloring(graph):
         
         colors[vertex] = color
     
+    if stats is not None:
+        _count_coloring(graph, colors.values(), stats)
+    return colors
+
+
+def _count_coloring(graph, colors, stats):
+    """
+    Add the work of a greedy-style pass to stats without touching the hot loop:
+    every vertex scans all its neighbors once, and picking color c probes
+    colors 0..c, so the counts follow from the degrees and the result
+    """
+    stats.count(neighbor_visits=sum(graph.get_degree(vertex) for vertex in graph.vertices),
+                color_probes=sum(colors) + len(graph.vertices))
+
+
+def _greedy_coloring_csr(graph, order=None, stats=None):
+    """Greedy coloring over the CSR arrays of a CompactGraph"""
+    offsets, indices = graph.to_csr()
+    index = graph.index
+    colors = [-1] * len(graph.vertices)
+    
+    if order is None:
+        if stats is not None:
+            stats.phase('sort')
+        order = graph.get_vertices_sorted_by_degree()
+    if stats is not None:
+        stats.phase('color')
+    for vertex in order:
+        i = index[vertex]
+        used_colors = {colors[j] for j in indices[offsets[i]:offsets[i + 1]]}
+        
+        color = 0
+        while color in used_colors:
+            color += 1
+        
+        colors[i] = color
+    
+    if stats is not None:
+        stats.count(neighbor_visits=len(indices), color_probes=sum(colors) + len(colors))
+    return dict(zip(graph.vertices, colors))
+
+
+def ordered_coloring(graph, order):
+    """
+    Greedy coloring that visits the vertices in the given order
+    Returns a dictionary mapping vertices to colors (time slots)
+    """
+    if hasattr(graph, 'to_csr'):
+        return _greedy_coloring_csr(graph, order)
+    
+    colors = {}
+    for vertex in order:
+        used_colors = set()
+        for neighbor in graph.get_neighbors(vertex):
+            if neighbor in colors:
+                used_colors.add(colors[neighbor])
+        
+        color = 0
+        while color in used_colors:
+            color += 1
+        
+        colors[vertex] = color
+    
     return colors
 
 
+def smallest_last_ordering(graph):
+    """
+    Smallest-last vertex order (Matula-Beck) using degree buckets, O(V + E)
+    Repeatedly removes a vertex of minimum remaining degree; the removal order
+    reversed colors dense cores first
+    """
+    degrees = {vertex: graph.get_degree(vertex) for vertex in graph.vertices}
+    # Each bucket is an insertion-ordered dict used as a set of vertices
+    buckets = [{} for _ in range(max(degrees.values(), default=0) + 1)]
+    for vertex, degree in degrees.items():
+        buckets[degree][vertex] = None
+    
+    removed = set()
+    order = []
+    degree = 0
+    for _ in range(len(degrees)):
+        # Removing a vertex lowers the minimum degree by at most one
+        degree = max(degree - 1, 0)
+        while not buckets[degree]:
+            degree += 1
+        vertex, _ = buckets[degree].popitem()
+        removed.add(vertex)
+        order.append(vertex)
+        for neighbor in graph.get_neighbors(vertex):
+            if neighbor not in removed:
+                neighbor_degree = degrees[neighbor]
+                del buckets[neighbor_degree][neighbor]
+                buckets[neighbor_degree - 1][neighbor] = None
+                degrees[neighbor] = neighbor_degree - 1
+    
+    order.reverse()
+    return order
+
+
+def random_ordering(graph, seed=None):
+    """Vertices in a random (reproducible for a given seed) order"""
+    order = list(graph.vertices)
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def dsatur_coloring(graph, stats=None):
+    """
+    DSatur (degree of saturation) algorithm for graph coloring
+    Colors next the vertex with the most distinct colors among its neighbors,
+    breaking ties by degree. Returns a dictionary mapping vertices to colors
+    """
+    if not graph.vertices:
+        return {}
+    
+    if stats is not None:
+        stats.phase('init')
+    colors = {}
+    neighbor_colors = {vertex: set() for vertex in graph.vertices}
+    degrees = {vertex: graph.get_degree(vertex) for vertex in graph.vertices}
+    position = {vertex: i for i, vertex in enumerate(graph.vertices)}
+    
+    # Max-priority queue on (saturation, degree); entries whose saturation is
+    # out of date are skipped when popped instead of being removed
+    heap = [(0, -degrees[vertex], position[vertex], vertex) for vertex in graph.vertices]
+    heapq.heapify(heap)
+    
+    if stats is not None:
+        stats.phase('color')
+    while heap:
+        saturation, _, _, vertex = heapq.heappop(heap)
+        used_colors = neighbor_colors[vertex]
+        if vertex in colors or -saturation != len(used_colors):
+            continue
+        
+        # Find the smallest available color
+        color = 0
+        while color in used_colors:
+            color += 1
+        colors[vertex] = color
+        
+        # Raise the saturation of uncolored neighbors that did not see this color yet
+        for neighbor in graph.get_neighbors(vertex):
+            if neighbor not in colors:
+                seen = neighbor_colors[neighbor]
+                if color not in seen:
+                    seen.add(color)
+                    heapq.heappush(heap, (-len(seen), -degrees[neighbor],
+                                          position[neighbor], neighbor))
+    
+    if stats is not None:
+        _count_coloring(graph, colors.values(), stats)
+    return colors
+
+
+def exact_strategy(graph, lower_bound=None):
+    """Branch-and-bound coloring with the default time budget (see exact_coloring)"""
+    from exact_coloring import exact_coloring
+    return exact_coloring(graph, lower_bound=lower_bound).coloring
+
+
+def parallel_strategy(graph):
+    """Jones-Plassmann coloring in vectorized rounds (see parallel_coloring)"""
+    from parallel_coloring import jones_plassmann_coloring
+    return jones_plassmann_coloring(graph)
+
+
+def smallest_last_coloring(graph):
+    """Greedy coloring in smallest-last order"""
+    return ordered_coloring(graph, smallest_last_ordering(graph))
+
+
+def random_order_coloring(graph, seed=0):
+    """Greedy coloring in a random order"""
+    return ordered_coloring(graph, random_ordering(graph, seed))
+
+
+def portfolio_strategy(graph, lower_bound=None):
+    """Best of several strategies run in parallel processes (see portfolio)"""
+    from portfolio import run_portfolio
+    return run_portfolio(graph, lower_bound=lower_bound).coloring
+
+
+def components_strategy(graph):
+    """DSatur run separately on each connected component (see components)"""
+    from components import decomposed_coloring
+    return decomposed_coloring(graph, 'dsatur')
+
+
+# Coloring strategies selectable by name
+STRATEGIES = {
+    'greedy': greedy_coloring,
+    'dsatur': dsatur_coloring,
+    'smallest_last': smallest_last_coloring,
+    'random': random_order_coloring,
+    'exact': exact_strategy,
+    'parallel': parallel_strategy,
+    'portfolio': portfolio_strategy,
+    'components': components_strategy,
+}
+
+# Strategies that accept a lower_bound and stop searching once they reach it
+BOUNDED_STRATEGIES = {'exact', 'portfolio'}
+
+
+def color_graph(graph, strategy='greedy', lower_bound=None):
+    """
+    Color the graph with the named strategy (see STRATEGIES)
+    Returns a dictionary mapping vertices to colors (time slots)
+    A known lower bound on the slots is passed to the strategies that search
+    for better colorings (BOUNDED_STRATEGIES), so they stop once they reach it
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown coloring strategy: {strategy}")
+    if lower_bound is not None and strategy in BOUNDED_STRATEGIES:
+        return STRATEGIES[strategy](graph, lower_bound=lower_bound)
+    return STRATEGIES[strategy](graph)
+
+
 def get_color_count(coloring):
     """Get the number of colors used in the coloring"""
     if not coloring:
@@ -81,8 +372,12 @@ def get_color_count(coloring):
     return max(coloring.values()) + 1
 
 
-def validate_coloring(graph, coloring):
+def validate_coloring(graph, coloring, stats=None):
     """Validate that the coloring is correct (no adjacent vertices have same color)"""
+    if stats is not None:
+        stats.phase('validate')
+    if hasattr(graph, 'to_csr'):
+        return _validate_coloring_csr(graph, coloring)
     for vertex in graph.vertices:
         if vertex not in coloring:
             return False
@@ -93,4 +388,19 @@ def validate_coloring(graph, coloring):
     return True
 
 
+def _validate_coloring_csr(graph, coloring):
+    """Validate a coloring over the CSR arrays of a CompactGraph"""
+    offsets, indices = graph.to_csr()
+    colors = []
+    for vertex in graph.vertices:
+        if vertex not in coloring:
+            return False
+        colors.append(coloring[vertex])
+    for i, vertex_color in enumerate(colors):
+        for j in indices[offsets[i]:offsets[i + 1]]:
+            if colors[j] == vertex_color:
+                return False
+    return True
+
+
 
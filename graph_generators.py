@@ -0,0 +1,132 @@
+"""
+Graph Generators for Course Scheduling
+Seeded synthetic and enrollment-shaped conflict graphs for benchmarks and tests
+"""
+
+import math
+import random
+from itertools import accumulate
+
+from enrollment import ConflictGraphBuilder
+
+
+def course_names(num_courses, prefix='C'):
+    """Course names C000000, C000001, ..."""
+    return [f"{prefix}{i:06d}" for i in range(num_courses)]
+
+
+def erdos_renyi(num_vertices, num_edges, seed=0):
+    """
+    Random graph with exactly num_edges distinct conflicts (G(n, m) model)
+    Returns (names, edges) with edges as pairs of course names
+    """
+    num_edges = min(num_edges, num_vertices * (num_vertices - 1) // 2)
+    rng = random.Random(seed)
+    names = course_names(num_vertices)
+    seen = set()
+    edges = []
+    while len(edges) < num_edges:
+        u = rng.randrange(num_vertices)
+        v = rng.randrange(num_vertices)
+        if u == v:
+            continue
+        key = (u, v) if u < v else (v, u)
+        if key not in seen:
+            seen.add(key)
+            edges.append((names[u], names[v]))
+    return names, edges
+
+
+def power_law(num_vertices, num_edges, exponent=2.5, seed=0):
+    """
+    Chung-Lu graph whose degrees follow a power law with the given exponent
+    A few hub courses conflict with many others, most with only a handful
+    Returns (names, edges); duplicate draws are dropped, so the graph may
+    have slightly fewer than num_edges conflicts
+    """
+    rng = random.Random(seed)
+    names = course_names(num_vertices)
+    weights = [(i + 1) ** (-1.0 / (exponent - 1)) for i in range(num_vertices)]
+    cumulative = list(accumulate(weights))
+    population = range(num_vertices)
+    seen = set()
+    edges = []
+    # Oversample a little to make up for self-loops and repeated pairs
+    for _ in range(4):
+        needed = num_edges - len(edges)
+        if needed <= 0:
+            break
+        ends = rng.choices(population, cum_weights=cumulative, k=2 * needed)
+        for u, v in zip(ends[::2], ends[1::2]):
+            key = (u, v) if u < v else (v, u)
+            if u != v and key not in seen:
+                seen.add(key)
+                edges.append((names[u], names[v]))
+                if len(edges) == num_edges:
+                    break
+    return names, edges
+
+
+def complete_graph(num_vertices):
+    """Every course conflicts with every other course; needs num_vertices slots"""
+    names = course_names(num_vertices)
+    edges = [(names[i], names[j]) for i in range(num_vertices) for j in range(i + 1, num_vertices)]
+    return names, edges
+
+
+def complete_bipartite(left, right):
+    """Two groups of courses where every pair across the groups conflicts; 2 slots"""
+    left_names = course_names(left, 'L')
+    right_names = course_names(right, 'R')
+    edges = [(a, b) for a in left_names for b in right_names]
+    return left_names + right_names, edges
+
+
+def enrollment_records(num_students, num_courses, mean_load=4.5, departments=None, seed=0):
+    """
+    Yield (student, courses) records with realistic course loads
+    
+    Each student belongs to a department and takes a course load drawn
+    around mean_load (1 to 8 courses). About three quarters of the courses
+    come from the student's own department; course popularity inside a
+    department follows a Zipf-like distribution, so introductory courses
+    are shared by many students and electives by few.
+    """
+    rng = random.Random(seed)
+    names = course_names(num_courses)
+    if departments is None:
+        departments = max(1, int(math.sqrt(num_courses) / 2))
+    # Split the courses into departments of similar size
+    groups = [names[d::departments] for d in range(departments)]
+    cumulative = [list(accumulate(1.0 / (rank + 1) for rank in range(len(group))))
+                  for group in groups]
+    everything = list(accumulate(1.0 / (rank + 1) for rank in range(num_courses)))
+    
+    for student in range(num_students):
+        department = rng.randrange(departments)
+        load = min(8, max(1, int(round(rng.gauss(mean_load, 1.5)))))
+        courses = set()
+        for _ in range(load * 3):
+            if len(courses) >= load:
+                break
+            if rng.random() < 0.75 and groups[department]:
+                courses.add(rng.choices(groups[department],
+                                        cum_weights=cumulative[department])[0])
+            else:
+                courses.add(rng.choices(names, cum_weights=everything)[0])
+        yield f"S{student:07d}", sorted(courses)
+
+
+def enrollment_graph(num_students, num_courses, mean_load=4.5, seed=0):
+    """
+    Conflict graph derived from enrollment_records()
+    Returns (names, edges, weights) with weights counting shared students
+    """
+    builder = ConflictGraphBuilder()
+    builder.add_records(enrollment_records(num_students, num_courses, mean_load, seed=seed))
+    edges = []
+    weights = []
+    for course1, course2, weight in builder.weighted_edges():
+        edges.append((course1, course2))
+        weights.append(weight)
+    return course_names(num_courses), edges, weights
@@ -0,0 +1,402 @@
+"""
+Graph View Module for Course Scheduler
+Conflict graph window with a force-directed layout and level-of-detail drawing
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from background import BackgroundJob
+from compact_graph import to_edge_arrays, _as_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Single courses are drawn when at most this many are on screen, groups otherwise
+NODE_LIMIT = 1500
+# Course names are shown when at most this many courses are on screen
+LABEL_LIMIT = 60
+# Most conflict lines drawn at once
+EDGE_LIMIT = 4000
+# Side in pixels of the screen cells whose courses are merged into one group
+CELL_SIZE = 24
+# Largest graph whose layout uses exact all-pairs repulsion
+EXACT_REPULSION_LIMIT = 2000
+EDGE_COLOR = '#B0B0B0'
+UNSCHEDULED_COLOR = '#D0D0D0'
+
+
+def force_layout(vertex_count, src, dst, iterations=50, seed=0, progress=None, stop=None):
+    """
+    Fruchterman-Reingold layout of a graph given as edge endpoint arrays
+    
+    Courses start at random positions in the unit square. Each iteration sums
+    the attraction along all conflicts with np.bincount (O(E)) and the
+    repulsion between courses: exact for small graphs, otherwise from the
+    centers of mass of a grid of cells (O(V * cells), a one-level Barnes-Hut).
+    A weak pull towards the center keeps isolated courses close to the rest.
+    Moves are capped by a temperature that falls linearly.
+    
+    progress(fraction) is called after every iteration, and the layout ends
+    early once stop (e.g. a threading.Event) is set. Needs NumPy; returns an
+    (n, 2) array of positions in the unit square.
+    """
+    n = vertex_count
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    if n < 2:
+        return pos
+    src = np.asarray(src, dtype=np.intp)
+    dst = np.asarray(dst, dtype=np.intp)
+    k = 1.0 / np.sqrt(n)
+    grid = min(16, max(4, int(np.sqrt(n) / 8)))
+    
+    for iteration in range(iterations):
+        if stop is not None and stop.is_set():
+            break
+        disp = _repulsion(pos, k, None if n <= EXACT_REPULSION_LIMIT else grid)
+        
+        # Attraction d^2 / k along every conflict, added to both ends
+        delta = pos[dst] - pos[src]
+        distance = np.sqrt((delta ** 2).sum(axis=1))
+        force = delta * (distance / k)[:, None]
+        for axis in (0, 1):
+            disp[:, axis] += np.bincount(src, weights=force[:, axis], minlength=n)
+            disp[:, axis] -= np.bincount(dst, weights=force[:, axis], minlength=n)
+        disp += (0.5 - pos) * 0.5
+        
+        temperature = 0.1 * (1 - iteration / iterations) + 0.002
+        length = np.sqrt((disp ** 2).sum(axis=1))
+        scale = np.minimum(length, temperature) / np.maximum(length, 1e-12)
+        pos = np.clip(pos + disp * scale[:, None], 0.0, 1.0)
+        if progress is not None:
+            progress((iteration + 1) / iterations)
+    return pos
+
+
+def _repulsion(pos, k, grid, chunk_elements=2_000_000):
+    """
+    Repulsive displacement k^2 / d of every course, from all other courses
+    (grid None) or from the centers of mass of a grid x grid cell partition
+    """
+    n = len(pos)
+    if grid is None:
+        centers = pos
+        masses = np.ones(n)
+    else:
+        cells = np.minimum((pos * grid).astype(np.intp), grid - 1)
+        cell_ids = cells[:, 0] * grid + cells[:, 1]
+        masses = np.bincount(cell_ids, minlength=grid * grid).astype(float)
+        occupied = masses > 0
+        centers = np.stack([np.bincount(cell_ids, weights=pos[:, axis], minlength=grid * grid)
+                            for axis in (0, 1)], axis=1)[occupied] / masses[occupied, None]
+        masses = masses[occupied]
+    
+    disp = np.empty_like(pos)
+    # Softening keeps courses at (almost) the same spot from exploding apart
+    softening = (0.01 * k) ** 2
+    step = max(1, chunk_elements // len(centers))
+    for start in range(0, n, step):
+        block = pos[start:start + step]
+        dx = block[:, 0, None] - centers[None, :, 0]
+        dy = block[:, 1, None] - centers[None, :, 1]
+        weight = masses / (dx * dx + dy * dy + softening)
+        # sum_j (p_i - c_j) w_ij = p_i * sum_j w_ij - (w @ c)_i
+        disp[start:start + step] = block * weight.sum(axis=1)[:, None] - weight @ centers
+    return disp * (k * k)
+
+
+class GraphView:
+    """
+    Window showing the conflict graph with courses colored by time slot
+    
+    The layout runs in a background thread. Drawing depends on how many
+    courses are on screen: up to NODE_LIMIT they are drawn one by one with a
+    fixed random sample of at most EDGE_LIMIT conflicts; beyond that, the
+    courses in each CELL_SIZE screen cell form one group, drawn in the color
+    of its most common slot and linked to other groups by its heaviest
+    conflict bundles. Canvas items are kept and moved between redraws instead
+    of being recreated. Drag to pan, use the mouse wheel to zoom, click a
+    course for its details or a group to zoom into it.
+    """
+    
+    def __init__(self, root, graph, coloring, slot_color, on_close=None):
+        if np is None:
+            raise ImportError("The conflict graph view needs NumPy")
+        self.slot_color = slot_color
+        self.on_close = on_close
+        vertices, src, dst = to_edge_arrays(graph)
+        self.vertices = list(vertices)
+        self.src = _as_numpy(src, np.int32).astype(np.intp)
+        self.dst = _as_numpy(dst, np.int32).astype(np.intp)
+        n = len(self.vertices)
+        self.degrees = (np.bincount(self.src, minlength=n) +
+                        np.bincount(self.dst, minlength=n))
+        # The same random order of conflicts for every redraw, so sampled lines do not flicker
+        order = np.random.default_rng(0).permutation(len(self.src))
+        self.sample_src = self.src[order]
+        self.sample_dst = self.dst[order]
+        self.slots = self._slot_array(coloring)
+        
+        self.pos = None
+        self.scale = 1.0
+        self.offset = np.zeros(2)
+        self.screen = None
+        # What the last redraw showed, for clicks: ('courses', ids) or ('groups', centers, counts)
+        self.shown = None
+        self.node_items = []
+        self.edge_items = []
+        self.label_items = []
+        self.drawn = {'nodes': 0, 'edges': 0, 'labels': 0}
+        self._render_job = None
+        self._drag = None
+        
+        self.window = tk.Toplevel(root)
+        self.window.title("Conflict Graph")
+        self.window.geometry("800x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        toolbar = ttk.Frame(self.window)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Button(toolbar, text="Fit", command=self.fit).pack(side=tk.LEFT, padx=5, pady=2)
+        self.status = ttk.Label(toolbar, text="Computing layout...")
+        self.status.pack(side=tk.LEFT, padx=5)
+        self.canvas = tk.Canvas(self.window, background='white')
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        self.canvas.bind('<Configure>', lambda event: self.schedule_render())
+        self.canvas.bind('<ButtonPress-1>', self._on_press)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<ButtonRelease-1>', self._on_release)
+        self.canvas.bind('<MouseWheel>', lambda event: self.zoom(
+            1.25 if event.delta > 0 else 0.8, event.x, event.y))
+        self.canvas.bind('<Button-4>', lambda event: self.zoom(1.25, event.x, event.y))
+        self.canvas.bind('<Button-5>', lambda event: self.zoom(0.8, event.x, event.y))
+        
+        self.job = BackgroundJob(lambda job: force_layout(
+            n, self.src, self.dst, stop=job.stop_event,
+            progress=lambda fraction: job.progress("Computing layout", fraction)))
+        self.job.start()
+        self.window.after(100, self._poll_layout)
+    
+    def _slot_array(self, coloring):
+        """Slot of every course in layout order (-1 = unscheduled)"""
+        get = coloring.get
+        return np.fromiter((get(vertex, -1) for vertex in self.vertices), dtype=np.int64,
+                           count=len(self.vertices))
+    
+    def set_coloring(self, coloring):
+        """Recolor the courses after the schedule changed (new courses need a new view)"""
+        self.slots = self._slot_array(coloring)
+        self.schedule_render()
+    
+    def close(self):
+        self.job.cancel()
+        if self._render_job is not None:
+            self.canvas.after_cancel(self._render_job)
+        self.window.destroy()
+        if self.on_close is not None:
+            self.on_close()
+    
+    def _poll_layout(self):
+        if not self.window.winfo_exists():
+            return
+        for message in self.job.poll():
+            if message[0] == 'progress':
+                self.status.config(text=f"Computing layout... {message[2]:.0%}")
+            elif message[0] == 'error':
+                self.status.config(text=f"Layout failed: {message[1]}")
+                return
+            elif message[0] == 'done':
+                self.pos = message[1]
+                self.fit()
+                return
+        self.window.after(100, self._poll_layout)
+    
+    def fit(self):
+        """Scale and center the layout in the window"""
+        if self.pos is None:
+            return
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1:
+            # Not drawn yet: use the requested size
+            width, height = self.canvas.winfo_reqwidth(), self.canvas.winfo_reqheight()
+        # Percentiles, so a few courses pushed to the border do not shrink the rest
+        low, high = np.percentile(self.pos, [1, 99], axis=0)
+        span = np.maximum(high - low, 1e-9)
+        self.scale = 0.9 * min(width / span[0], height / span[1])
+        self.offset = np.array([width, height]) / 2 - (low + high) / 2 * self.scale
+        self.render()
+    
+    def zoom(self, factor, x, y):
+        """Zoom by factor, keeping the point under the cursor in place"""
+        cursor = np.array([x, y], dtype=float)
+        self.offset = cursor - (cursor - self.offset) * factor
+        self.scale *= factor
+        self.schedule_render()
+    
+    def schedule_render(self, delay=30):
+        """Redraw once events have settled (drags and wheel turns come in bursts)"""
+        if self._render_job is not None:
+            self.canvas.after_cancel(self._render_job)
+        self._render_job = self.canvas.after(delay, self.render)
+    
+    def render(self):
+        """Redraw at the level of detail that fits the current zoom"""
+        self._render_job = None
+        if self.pos is None:
+            return
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.screen = screen = self.pos * self.scale + self.offset
+        visible = ((screen[:, 0] >= 0) & (screen[:, 0] < width) &
+                   (screen[:, 1] >= 0) & (screen[:, 1] < height))
+        ids = np.flatnonzero(visible)
+        if len(ids) <= NODE_LIMIT:
+            self._render_courses(screen, visible, ids)
+        else:
+            self._render_groups(screen, ids, width)
+    
+    def _render_courses(self, screen, visible, ids):
+        # Conflicts with an end on screen, in the fixed sample order
+        on_screen = visible[self.sample_src] | visible[self.sample_dst]
+        src = self.sample_src[on_screen][:EDGE_LIMIT]
+        dst = self.sample_dst[on_screen][:EDGE_LIMIT]
+        lines = np.hstack([screen[src], screen[dst]]).tolist()
+        
+        radius = min(8.0, max(2.5, self.scale / np.sqrt(max(len(self.pos), 1)) * 0.25))
+        centers = screen[ids]
+        ovals = np.hstack([centers - radius, centers + radius]).tolist()
+        fills = [self._fill(slot) for slot in self.slots[ids].tolist()]
+        labels = []
+        if len(ids) <= LABEL_LIMIT:
+            labels = [(x, y - radius - 7, str(self.vertices[i]))
+                      for (x, y), i in zip(centers.tolist(), ids.tolist())]
+        self._draw(lines, [1] * len(lines), ovals, fills, labels)
+        self.shown = ('courses', ids)
+        self.status.config(
+            text=f"{len(self.vertices)} courses, {len(self.src)} conflicts | showing "
+                 f"{len(ids)} courses, {len(lines)} of {int(on_screen.sum())} conflicts")
+    
+    def _render_groups(self, screen, ids, width):
+        cells = (screen[ids] // CELL_SIZE).astype(np.int64)
+        columns = width // CELL_SIZE + 1
+        keys, group_of, counts = np.unique(cells[:, 1] * columns + cells[:, 0],
+                                           return_inverse=True, return_counts=True)
+        group_of = group_of.ravel()
+        groups = len(keys)
+        centers = np.stack([np.bincount(group_of, weights=screen[ids, axis], minlength=groups)
+                            for axis in (0, 1)], axis=1) / counts[:, None]
+        
+        # Most common slot of each group: count (group, slot) pairs, keep each group's largest
+        slots = self.slots[ids]
+        base = int(slots.max()) + 2
+        pairs, pair_counts = np.unique(group_of * base + (slots + 1), return_counts=True)
+        order = np.lexsort((pair_counts, pairs // base))
+        pairs = pairs[order]
+        last = np.r_[pairs[1:] // base != pairs[:-1] // base, True]
+        dominant = np.empty(groups, dtype=np.int64)
+        dominant[pairs[last] // base] = pairs[last] % base - 1
+        
+        # Conflicts between different groups, bundled; the heaviest bundles are drawn
+        group_ids = np.full(len(self.vertices), -1, dtype=np.int64)
+        group_ids[ids] = group_of
+        a, b = group_ids[self.src], group_ids[self.dst]
+        keep = (a >= 0) & (b >= 0) & (a != b)
+        links, link_counts = np.unique(np.minimum(a[keep], b[keep]) * groups +
+                                       np.maximum(a[keep], b[keep]), return_counts=True)
+        top = np.argsort(link_counts)[::-1][:EDGE_LIMIT]
+        lines = np.hstack([centers[links[top] // groups],
+                           centers[links[top] % groups]]).tolist()
+        widths = np.minimum(1 + np.log2(link_counts[top]), 6).tolist()
+        
+        radius = np.minimum(CELL_SIZE / 2 - 1, 2 + 1.5 * np.log2(counts))[:, None]
+        ovals = np.hstack([centers - radius, centers + radius]).tolist()
+        fills = [self._fill(slot) for slot in dominant.tolist()]
+        self._draw(lines, widths, ovals, fills, [])
+        self.shown = ('groups', centers, counts)
+        self.status.config(
+            text=f"{len(self.vertices)} courses, {len(self.src)} conflicts | showing "
+                 f"{len(ids)} courses in {groups} groups, {len(lines)} of {len(links)} "
+                 f"group links (zoom in for single courses)")
+    
+    def _fill(self, slot):
+        return self.slot_color(slot) if slot >= 0 else UNSCHEDULED_COLOR
+    
+    def _draw(self, lines, widths, ovals, fills, labels):
+        """Move the pooled canvas items into place, creating or hiding items as needed"""
+        canvas = self.canvas
+        for i, (coords, width) in enumerate(zip(lines, widths)):
+            if i < len(self.edge_items):
+                item = self.edge_items[i]
+                canvas.coords(item, *coords)
+                canvas.itemconfigure(item, width=width, state=tk.NORMAL)
+            else:
+                self.edge_items.append(canvas.create_line(*coords, fill=EDGE_COLOR,
+                                                          width=width, tags=('edge',)))
+        for i, (coords, fill) in enumerate(zip(ovals, fills)):
+            if i < len(self.node_items):
+                item = self.node_items[i]
+                canvas.coords(item, *coords)
+                canvas.itemconfigure(item, fill=fill, state=tk.NORMAL)
+            else:
+                self.node_items.append(canvas.create_oval(*coords, fill=fill,
+                                                          outline='#606060', tags=('node',)))
+        for i, (x, y, text) in enumerate(labels):
+            if i < len(self.label_items):
+                item = self.label_items[i]
+                canvas.coords(item, x, y)
+                canvas.itemconfigure(item, text=text, state=tk.NORMAL)
+            else:
+                self.label_items.append(canvas.create_text(x, y, text=text, tags=('label',)))
+        for items, kind, count in ((self.edge_items, 'edges', len(lines)),
+                                   (self.node_items, 'nodes', len(ovals)),
+                                   (self.label_items, 'labels', len(labels))):
+            for item in items[count:self.drawn[kind]]:
+                canvas.itemconfigure(item, state=tk.HIDDEN)
+            self.drawn[kind] = count
+        canvas.tag_raise('node')
+        canvas.tag_raise('label')
+    
+    def _on_press(self, event):
+        self._drag = (event.x, event.y, False)
+    
+    def _on_drag(self, event):
+        if self._drag is None:
+            return
+        x, y, _ = self._drag
+        dx, dy = event.x - x, event.y - y
+        # Move what is drawn right away; the redraw adds what came into view
+        self.canvas.move('all', dx, dy)
+        self.offset = self.offset + (dx, dy)
+        self._drag = (event.x, event.y, True)
+        self.schedule_render(delay=60)
+    
+    def _on_release(self, event):
+        dragged = self._drag is not None and self._drag[2]
+        self._drag = None
+        if not dragged and self.shown is not None:
+            self._select(event.x, event.y)
+    
+    def _select(self, x, y):
+        """Describe the course under the cursor, or zoom into the group under it"""
+        point = np.array([x, y], dtype=float)
+        if self.shown[0] == 'courses':
+            ids = self.shown[1]
+            if not len(ids):
+                return
+            distance = np.sqrt(((self.screen[ids] - point) ** 2).sum(axis=1))
+            nearest = int(distance.argmin())
+            if distance[nearest] > 10:
+                return
+            i = int(ids[nearest])
+            slot = int(self.slots[i])
+            self.status.config(
+                text=f"{self.vertices[i]}: {'slot ' + str(slot) if slot >= 0 else 'not scheduled'}"
+                     f", {int(self.degrees[i])} conflicts")
+        else:
+            _, centers, counts = self.shown
+            distance = np.sqrt(((centers - point) ** 2).sum(axis=1))
+            nearest = int(distance.argmin())
+            if distance[nearest] <= CELL_SIZE:
+                self.zoom(2.0, *centers[nearest])
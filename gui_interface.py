@@ -2,21 +2,59 @@
 GUI interface for Course Scheduler using Tkinter
 """
 
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from graph_coloring import Graph, greedy_coloring, get_color_count, validate_coloring
+from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
+from datetime import date, datetime
+from graph_coloring import (Graph, STRATEGIES, BOUNDED_STRATEGIES, color_graph, get_color_count,
+                            validate_coloring)
+from enrollment import ConflictGraphBuilder, read_enrollments
+from incremental import IncrementalColoring
+from tabu_search import tabu_improve
+from snapshot import SnapshotError, load_snapshot, save_snapshot
+from export import SlotCalendar, export_schedule
+from instrumentation import instrumented_coloring
+from validation import find_violations
+from lower_bounds import compute_lower_bound, format_gap
+from capacity import capacity_coloring, capacity_lower_bound, fill_report
+from soft_conflicts import minimize_conflicts
+from result_cache import ResultCache, cache_dir_option
+from compact_graph import CompactGraph, to_edge_arrays
+from virtual_view import VirtualView
+from background import BackgroundJob
+from exact_coloring import exact_coloring
+from portfolio import run_portfolio
+from graph_view import GraphView
+
+# Strategies that keep their best schedule so far when generation is cancelled
+STOPPABLE_STRATEGIES = {'exact', 'portfolio'}
 
 
 class CourseSchedulerGUI:
     """GUI interface for course scheduling"""
     
-    def __init__(self, root):
+    # Milliseconds between checks for messages from a background job
+    POLL_INTERVAL = 100
+    
+    def __init__(self, root, cache_dir=None):
         self.root = root
         self.root.title("Course Scheduler - Graph Coloring")
         self.root.geometry("900x700")
         
         self.graph = Graph()
         self.coloring = {}
+        # Set once a schedule exists, so later changes only repair affected courses
+        self.incremental = None
+        # Enrolled students per course, from imported enrollment files
+        self.course_sizes = {}
+        # Colorings of graphs seen before; kept on disk across sessions only
+        # when a cache directory is given (--cache-dir)
+        self.cache = ResultCache(directory=cache_dir)
+        # Background generation in progress, and what to do with its result
+        self.job = None
+        self.job_finish = None
+        # Open conflict graph window
+        self.graph_view = None
         
         # Color palette for time slots
         self.color_palette = [
@@ -55,16 +93,23 @@ class CourseSchedulerGUI:
         ttk.Button(left_panel, text="Add Course", 
                   command=self.add_course).grid(row=0, column=2, pady=5, padx=5)
         
-        # Course list
-        ttk.Label(left_panel, text="Courses:").grid(row=1, column=0, columnspan=3, 
-                                                     sticky=tk.W, pady=(10, 5))
+        # Course list (only the visible rows are drawn; the search filters both lists)
+        course_header = ttk.Frame(left_panel)
+        course_header.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 5))
+        ttk.Label(course_header, text="Courses:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        ttk.Entry(course_header, width=15,
+                  textvariable=self.search_var).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(course_header, text="Search:").pack(side=tk.RIGHT)
+        
         self.course_listbox = tk.Listbox(left_panel, height=8, width=30)
         self.course_listbox.grid(row=2, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E))
         
-        scrollbar1 = ttk.Scrollbar(left_panel, orient="vertical", 
-                                   command=self.course_listbox.yview)
+        scrollbar1 = ttk.Scrollbar(left_panel, orient="vertical")
         scrollbar1.grid(row=2, column=3, sticky=(tk.N, tk.S))
-        self.course_listbox.configure(yscrollcommand=scrollbar1.set)
+        self.course_view = VirtualView(
+            self.course_listbox, scrollbar1,
+            lambda course: f"{course} ({self.graph.get_degree(course)} conflicts)")
         
         # Conflict selection
         ttk.Label(left_panel, text="Select courses with conflicts:").grid(row=3, column=0, 
@@ -75,12 +120,17 @@ class CourseSchedulerGUI:
         conflict_frame = ttk.Frame(left_panel)
         conflict_frame.grid(row=4, column=0, columnspan=3, pady=5)
         
+        # Type part of a name; the drop-down lists the first matching courses
         ttk.Label(conflict_frame, text="Course 1:").grid(row=0, column=0, padx=5)
-        self.conflict_course1 = ttk.Combobox(conflict_frame, width=15, state="readonly")
+        self.conflict_course1 = ttk.Combobox(conflict_frame, width=15)
+        self.conflict_course1.configure(
+            postcommand=lambda: self.fill_course_choices(self.conflict_course1))
         self.conflict_course1.grid(row=0, column=1, padx=5)
         
         ttk.Label(conflict_frame, text="Course 2:").grid(row=0, column=2, padx=5)
-        self.conflict_course2 = ttk.Combobox(conflict_frame, width=15, state="readonly")
+        self.conflict_course2 = ttk.Combobox(conflict_frame, width=15)
+        self.conflict_course2.configure(
+            postcommand=lambda: self.fill_course_choices(self.conflict_course2))
         self.conflict_course2.grid(row=0, column=3, padx=5)
         
         ttk.Button(conflict_frame, text="Add Conflict", 
@@ -92,10 +142,13 @@ class CourseSchedulerGUI:
         self.conflict_listbox = tk.Listbox(left_panel, height=6, width=30)
         self.conflict_listbox.grid(row=6, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E))
         
-        scrollbar2 = ttk.Scrollbar(left_panel, orient="vertical", 
-                                   command=self.conflict_listbox.yview)
+        scrollbar2 = ttk.Scrollbar(left_panel, orient="vertical")
         scrollbar2.grid(row=6, column=3, sticky=(tk.N, tk.S))
-        self.conflict_listbox.configure(yscrollcommand=scrollbar2.set)
+        self.conflict_view = VirtualView(
+            self.conflict_listbox, scrollbar2,
+            lambda pair: f"{pair[0]} <-> {pair[1]}",
+            lambda pair, text: text in str(pair[0]).lower() or text in str(pair[1]).lower())
+        self.search_var.trace_add('write', lambda *args: self.search_lists())
         
         # Buttons
         button_frame = ttk.Frame(left_panel)
@@ -103,9 +156,57 @@ class CourseSchedulerGUI:
         
         ttk.Button(button_frame, text="Generate Schedule", 
                   command=self.generate_schedule).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fit to Slots...", 
+                  command=self.fit_to_slots).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Import Enrollments...", 
+                  command=self.import_enrollments).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear All", 
                   command=self.clear_data).pack(side=tk.LEFT, padx=5)
         
+        # Scheduling options
+        options_frame = ttk.Frame(left_panel)
+        options_frame.grid(row=8, column=0, columnspan=3, pady=5, sticky=tk.W)
+        
+        ttk.Label(options_frame, text="Strategy:").pack(side=tk.LEFT, padx=5)
+        self.strategy_combo = ttk.Combobox(options_frame, width=12, state="readonly",
+                                           values=list(STRATEGIES))
+        self.strategy_combo.set('greedy')
+        self.strategy_combo.pack(side=tk.LEFT, padx=5)
+        
+        self.optimize_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Optimize (tabu search)",
+                       variable=self.optimize_var).pack(side=tk.LEFT, padx=5)
+        
+        self.stats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Show stats",
+                       variable=self.stats_var).pack(side=tk.LEFT, padx=5)
+        
+        # Slot capacity (blank = unlimited)
+        capacity_frame = ttk.Frame(left_panel)
+        capacity_frame.grid(row=9, column=0, columnspan=3, pady=5, sticky=tk.W)
+        
+        ttk.Label(capacity_frame, text="Slot capacity:").pack(side=tk.LEFT, padx=5)
+        self.capacity_entry = ttk.Entry(capacity_frame, width=8)
+        self.capacity_entry.pack(side=tk.LEFT, padx=5)
+        self.capacity_unit = ttk.Combobox(capacity_frame, width=10, state="readonly",
+                                          values=['courses', 'students'])
+        self.capacity_unit.set('courses')
+        self.capacity_unit.pack(side=tk.LEFT, padx=5)
+        ttk.Label(capacity_frame, text="(blank = unlimited)").pack(side=tk.LEFT, padx=5)
+        
+        # Saving and loading
+        file_frame = ttk.Frame(left_panel)
+        file_frame.grid(row=10, column=0, columnspan=3, pady=5)
+        
+        ttk.Button(file_frame, text="Save...", 
+                  command=self.save_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(file_frame, text="Load...", 
+                  command=self.load_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(file_frame, text="Export...", 
+                  command=self.export_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(file_frame, text="Graph View...", 
+                  command=self.show_graph_view).pack(side=tk.LEFT, padx=5)
+        
         # Right panel - Schedule
         right_panel = ttk.LabelFrame(main_frame, text="Schedule", padding="10")
         right_panel.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
@@ -132,11 +233,21 @@ class CourseSchedulerGUI:
             self.schedule_tree.heading(col, text=col)
             self.schedule_tree.column(col, width=150, anchor=tk.CENTER)
         
-        scrollbar3 = ttk.Scrollbar(schedule_frame, orient="vertical", 
-                                   command=self.schedule_tree.yview)
+        scrollbar3 = ttk.Scrollbar(schedule_frame, orient="vertical")
         scrollbar3.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.schedule_tree.configure(yscrollcommand=scrollbar3.set)
         self.schedule_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.schedule_view = VirtualView(self.schedule_tree, scrollbar3, self.schedule_row)
+        # Slots whose color tag has been configured
+        self.slot_tags = set()
+        
+        schedule_search = ttk.Frame(schedule_frame)
+        schedule_search.grid(row=1, column=0, columnspan=2, sticky=tk.E, pady=(5, 0))
+        ttk.Label(schedule_search, text="Search:").pack(side=tk.LEFT)
+        self.schedule_search_var = tk.StringVar()
+        ttk.Entry(schedule_search, width=15,
+                  textvariable=self.schedule_search_var).pack(side=tk.LEFT, padx=5)
+        self.schedule_search_var.trace_add(
+            'write', lambda *args: self.schedule_view.search(self.schedule_search_var.get()))
         
         # Color legend
         legend_frame = ttk.LabelFrame(right_panel, text="Time Slot Colors", padding="5")
@@ -144,9 +255,21 @@ class CourseSchedulerGUI:
         
         self.legend_canvas = tk.Canvas(legend_frame, height=50)
         self.legend_canvas.pack(fill=tk.BOTH, expand=True)
+        
+        # Progress of background generation
+        progress_frame = ttk.Frame(right_panel)
+        progress_frame.grid(row=3, column=0, sticky=(tk.W, tk.E))
+        progress_frame.columnconfigure(0, weight=1)
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=1.0)
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=5)
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", state=tk.DISABLED,
+                                        command=self.cancel_job)
+        self.cancel_button.grid(row=0, column=1, padx=5)
     
     def add_course(self):
         """Add a new course"""
+        if self.is_busy():
+            return
         course = self.course_entry.get().strip()
         if not course:
             messagebox.showwarning("Warning", "Please enter a course name!")
@@ -156,13 +279,20 @@ class CourseSchedulerGUI:
             messagebox.showinfo("Info", f"Course '{course}' already exists!")
             return
         
-        self.graph.add_vertex(course)
-        self.update_course_list()
+        if self.incremental is not None:
+            moves = self.incremental.add_vertex(course)
+        else:
+            self.graph.add_vertex(course)
+            moves = []
+        self.update_course_list(added=[course])
         self.course_entry.delete(0, tk.END)
-        messagebox.showinfo("Success", f"Course '{course}' added successfully!")
+        messagebox.showinfo("Success", f"Course '{course}' added successfully!"
+                                       f"{self._apply_moves(moves)}")
     
     def add_conflict(self):
         """Add a conflict between two courses"""
+        if self.is_busy():
+            return
         course1 = self.conflict_course1.get()
         course2 = self.conflict_course2.get()
         
@@ -174,75 +304,517 @@ class CourseSchedulerGUI:
             messagebox.showwarning("Warning", "A course cannot conflict with itself!")
             return
         
-        self.graph.add_edge(course1, course2)
+        for course in (course1, course2):
+            if course not in self.graph.vertices:
+                messagebox.showwarning("Warning", f"Course '{course}' does not exist!")
+                return
+        
+        is_new = not self.graph.get_edge_weight(course1, course2)
+        if self.incremental is not None:
+            moves = self.incremental.add_edge(course1, course2)
+        else:
+            self.graph.add_edge(course1, course2)
+            moves = []
+        if is_new:
+            self.update_conflict_list(added=[(course1, course2)])
+        # Redraws the visible rows, which show the new degrees
+        self.course_view.refresh()
+        messagebox.showinfo("Success", f"Conflict added between '{course1}' and '{course2}'"
+                                       f"{self._apply_moves(moves)}")
+    
+    def import_enrollments(self):
+        """Import courses and conflicts from a student enrollment file"""
+        if self.is_busy():
+            return
+        path = filedialog.askopenfilename(
+            title="Import Enrollments",
+            filetypes=[("Enrollment files", "*.csv *.jsonl"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        builder = ConflictGraphBuilder()
+        try:
+            builder.add_records(read_enrollments(path))
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Error", f"Could not import enrollments:\n{e}")
+            return
+        
+        builder.build(self.graph)
+        for course, students in builder.course_sizes().items():
+            self.course_sizes[course] = self.course_sizes.get(course, 0) + students
+        moves = self.incremental.repair() if self.incremental is not None else []
+        self.update_course_list()
+        self.update_conflict_list()
+        messagebox.showinfo("Success", f"Imported {builder.summary()}"
+                                       f"{self._apply_moves(moves)}")
+    
+    def save_data(self):
+        """Save courses, conflicts and the schedule to a binary snapshot"""
+        path = filedialog.asksaveasfilename(
+            title="Save Snapshot", defaultextension=".snap",
+            filetypes=[("Schedule snapshots", "*.snap"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        try:
+            save_snapshot(path, self.graph, self.coloring or None)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save snapshot:\n{e}")
+            return
+        messagebox.showinfo("Success", f"Saved {len(self.graph.vertices)} courses"
+                                       f"{' and the schedule' if self.coloring else ''}")
+    
+    def load_data(self):
+        """Load courses, conflicts and the schedule from a binary snapshot"""
+        if self.is_busy():
+            return
+        path = filedialog.askopenfilename(
+            title="Load Snapshot",
+            filetypes=[("Schedule snapshots", "*.snap"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        try:
+            graph, coloring = load_snapshot(path)
+        except (OSError, SnapshotError) as e:
+            messagebox.showerror("Error", f"Could not load snapshot:\n{e}")
+            return
+        
+        self.close_graph_view()
+        self.graph = graph
+        self.update_course_list()
         self.update_conflict_list()
-        messagebox.showinfo("Success", f"Conflict added between '{course1}' and '{course2}'")
+        if coloring and validate_coloring(graph, coloring):
+            self.coloring = coloring
+            self.incremental = IncrementalColoring(graph, coloring)
+            self.display_schedule()
+            self.info_label.config(
+                text=f"Schedule loaded! Time slots used: {get_color_count(coloring)} | "
+                     f"Courses scheduled: {len(coloring)}"
+            )
+        else:
+            self.coloring = {}
+            self.incremental = None
+            self.schedule_view.clear()
+            self.legend_canvas.delete("all")
+            self.info_label.config(text="No schedule generated yet.")
+    
+    def export_data(self):
+        """Export the schedule to CSV, JSON Lines or iCalendar"""
+        if not self.coloring:
+            messagebox.showwarning("Warning", "Please generate schedule first!")
+            return
+        
+        path = filedialog.asksaveasfilename(
+            title="Export Schedule", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("iCalendar", "*.ics")]
+        )
+        if not path:
+            return
+        start = simpledialog.askstring("Export Schedule", "First day (YYYY-MM-DD):",
+                                       initialvalue=date.today().isoformat(),
+                                       parent=self.root)
+        if start is None:
+            return
+        
+        try:
+            calendar = SlotCalendar(datetime.strptime(start.strip(), "%Y-%m-%d").date())
+            count = export_schedule(path, self.coloring, calendar)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not export schedule:\n{e}")
+            return
+        messagebox.showinfo("Success", f"Exported {count} courses")
+    
+    def _apply_moves(self, moves, limit=10):
+        """Refresh the schedule after an incremental update and describe the moves"""
+        if not moves:
+            return ""
+        self.display_schedule(added=[course for course, old_slot, _ in moves
+                                     if old_slot is None])
+        self.info_label.config(
+            text=f"Schedule updated! Time slots used: {self.incremental.slot_count} | "
+                 f"Courses scheduled: {len(self.coloring)}"
+        )
+        lines = []
+        for course, old_slot, new_slot in moves[:limit]:
+            if old_slot is None:
+                lines.append(f"{course}: scheduled in slot {new_slot}")
+            else:
+                lines.append(f"{course}: slot {old_slot} -> slot {new_slot}")
+        if len(moves) > limit:
+            lines.append(f"... and {len(moves) - limit} more")
+        return "\n\nSchedule updated:\n" + "\n".join(lines)
+    
+    def update_course_list(self, added=None):
+        """
+        Update the course list: append the added courses, or reload every
+        course from the graph when added is None
+        """
+        if added is None:
+            self.course_view.set_items(self.graph.vertices)
+        else:
+            self.course_view.extend(added)
     
-    def update_course_list(self):
-        """Update the course listbox and comboboxes"""
-        # Update listbox
-        self.course_listbox.delete(0, tk.END)
+    def update_conflict_list(self, added=None):
+        """
+        Update the conflict list: append the added course pairs, or reload
+        every conflict from the graph (each once) when added is None
+        """
+        if added is None:
+            vertices, src, dst = to_edge_arrays(self.graph)
+            self.conflict_view.set_items(zip(map(vertices.__getitem__, src),
+                                             map(vertices.__getitem__, dst)))
+        else:
+            self.conflict_view.extend(added)
+    
+    def search_lists(self):
+        """Filter the course and conflict lists by the search text"""
+        text = self.search_var.get()
+        self.course_view.search(text)
+        self.conflict_view.search(text)
+    
+    def fill_course_choices(self, combobox, limit=100):
+        """Offer the first courses containing the typed text in a conflict drop-down"""
+        text = combobox.get().strip().lower()
+        choices = []
         for course in self.graph.vertices:
-            degree = self.graph.get_degree(course)
-            self.course_listbox.insert(tk.END, f"{course} ({degree} conflicts)")
-        
-        # Update comboboxes
-        self.conflict_course1['values'] = self.graph.vertices
-        self.conflict_course2['values'] = self.graph.vertices
-    
-    def update_conflict_list(self):
-        """Update the conflict listbox"""
-        self.conflict_listbox.delete(0, tk.END)
-        conflicts_added = set()
-        
-        for vertex in self.graph.vertices:
-            neighbors = self.graph.get_neighbors(vertex)
-            for neighbor in neighbors:
-                # Add each conflict only once
-                conflict_pair = tuple(sorted([vertex, neighbor]))
-                if conflict_pair not in conflicts_added:
-                    conflicts_added.add(conflict_pair)
-                    self.conflict_listbox.insert(tk.END, f"{vertex} <-> {neighbor}")
+            if text in str(course).lower():
+                choices.append(course)
+                if len(choices) == limit:
+                    break
+        combobox['values'] = choices
     
     def generate_schedule(self):
-        """Generate schedule using graph coloring"""
+        """Generate schedule using graph coloring (in a background thread)"""
+        if self.is_busy():
+            return
         if not self.graph.vertices:
             messagebox.showwarning("Warning", "Please add courses first!")
             return
-        
-        self.coloring = greedy_coloring(self.graph)
-        
-        if validate_coloring(self.graph, self.coloring):
+        capacity_text = self.capacity_entry.get().strip()
+        if capacity_text:
+            try:
+                capacity = int(capacity_text)
+            except ValueError:
+                messagebox.showwarning("Warning", "Slot capacity must be a whole number!")
+                return
+            if capacity > 0:
+                self.generate_capacity_schedule(capacity)
+                return
+        
+        # Tk variables are read here; the worker thread must not touch widgets
+        graph = self.job_graph()
+        strategy = self.strategy_combo.get()
+        optimize = self.optimize_var.get()
+        show_stats = self.stats_var.get()
+        
+        def work(job):
+            # Searching strategies get the bound up front so they can stop at it
+            bound = None
+            if strategy in BOUNDED_STRATEGIES:
+                job.progress("Computing a lower bound...")
+                bound = compute_lower_bound(graph, time_limit=0.5)
+            lower_bound = bound.value if bound is not None else None
+            
+            job.progress(f"Coloring with {strategy}...")
+            stats = None
+            if show_stats:
+                coloring, stats = instrumented_coloring(graph, strategy,
+                                                        lower_bound=lower_bound)
+                valid = stats.valid
+            else:
+                coloring, valid = self.cached_coloring(job, graph, strategy, lower_bound)
+            if job.cancelled and strategy not in STOPPABLE_STRATEGIES:
+                return None
+            
+            if valid:
+                if bound is None:
+                    bound = compute_lower_bound(graph, time_limit=0.5,
+                                                target=get_color_count(coloring))
+                # No need to optimize a schedule that already meets the lower bound
+                if optimize and get_color_count(coloring) > bound.value and not job.cancelled:
+                    coloring = self.optimize_schedule(job, graph, coloring,
+                                                      min_colors=bound.value)
+            return coloring, valid, bound, stats, strategy
+        
+        self.start_job(f"Generating schedule ({strategy})...", work, self.finish_schedule)
+    
+    def cached_coloring(self, job, graph, strategy, lower_bound):
+        """
+        Worker side of generate_schedule: color through the result cache
+        Searching strategies report each better schedule and stop when the job
+        is cancelled; a cancelled run is not cached. Returns (coloring, valid).
+        """
+        if not self.cache.caches(strategy):
+            return self.cache.color(graph, strategy, lower_bound)
+        # A cache hit is checked against the conflicts before it is returned
+        fingerprint, key = self.cache.prepare(graph, strategy, lower_bound)
+        coloring = self.cache.lookup(fingerprint, key)
+        if coloring is not None:
+            return coloring, True
+        
+        def improved(coloring, color_count):
+            job.best(coloring, f"Best schedule so far: {color_count} time slots")
+        
+        if strategy == 'exact':
+            coloring = exact_coloring(graph, lower_bound=lower_bound, callback=improved,
+                                      stop=job.stop_event).coloring
+        elif strategy == 'portfolio':
+            coloring = run_portfolio(graph, lower_bound=lower_bound, callback=improved,
+                                     stop=job.stop_event).coloring
+        else:
+            coloring = color_graph(graph, strategy, lower_bound)
+        valid = validate_coloring(graph, coloring)
+        if valid and not job.cancelled:
+            self.cache.store(fingerprint, key, coloring)
+        return coloring, valid
+    
+    def finish_schedule(self, result, cancelled):
+        """Show the outcome of generate_schedule (on the UI thread)"""
+        if result is None:
+            self.info_label.config(text="Schedule generation cancelled.")
+            return
+        self.coloring, valid, bound, stats, strategy = result
+        if valid:
             color_count = get_color_count(self.coloring)
+            gap = format_gap(color_count, bound.value)
             self.display_schedule()
+            status = "Stopped early, best schedule kept" if cancelled else "Schedule generated"
             self.info_label.config(
-                text=f"Schedule generated! Time slots used: {color_count} | "
+                text=f"{status}! Time slots used / lower bound: {gap} | "
                      f"Courses scheduled: {len(self.coloring)}"
             )
-            messagebox.showinfo("Success", 
-                              f"Schedule generated successfully!\n"
-                              f"Time slots used: {color_count}")
+            message = (f"{status} successfully!\nTime slots used: {color_count}\n"
+                       f"Time slots used / lower bound: {gap}")
+            if stats is not None:
+                message += f"\n\nColoring statistics:\n{stats.summary()}"
+            elif self.cache.caches(strategy):
+                message += (f"\nResult cache: {'hit' if self.cache.last_hit else 'miss'} "
+                            f"({self.cache.summary()})")
+            messagebox.showinfo("Success", message)
+            self.incremental = IncrementalColoring(self.graph, self.coloring)
         else:
-            messagebox.showerror("Error", "Invalid coloring generated!")
+            self.incremental = None
+            messagebox.showerror("Error", "Invalid coloring generated!\n\n"
+                               + find_violations(self.graph, self.coloring).summary())
     
-    def display_schedule(self):
-        """Display the schedule in the treeview"""
-        # Clear existing items
-        for item in self.schedule_tree.get_children():
-            self.schedule_tree.delete(item)
+    def generate_capacity_schedule(self, capacity):
+        """Generate a schedule that keeps every time slot within the capacity"""
+        graph = self.job_graph()
+        unit = self.capacity_unit.get()
+        sizes = self.course_sizes if unit == 'students' else None
+        
+        def work(job):
+            try:
+                coloring = capacity_coloring(graph, capacity, sizes)
+            except ValueError as e:
+                return e
+            if job.cancelled:
+                return None
+            if not validate_coloring(graph, coloring):
+                return coloring, None
+            job.progress("Computing a lower bound...")
+            color_count = get_color_count(coloring)
+            bound = max(compute_lower_bound(graph, time_limit=0.5, target=color_count).value,
+                        capacity_lower_bound(graph, capacity, sizes))
+            return coloring, bound
+        
+        def finish(result, cancelled):
+            if result is None:
+                self.info_label.config(text="Schedule generation cancelled.")
+                return
+            if isinstance(result, ValueError):
+                messagebox.showerror("Error",
+                                     f"Could not schedule within the slot capacity:\n{result}")
+                return
+            self.coloring, bound = result
+            # Capacity changes are not repaired incrementally; generate again instead
+            self.incremental = None
+            if bound is None:
+                messagebox.showerror("Error", "Invalid coloring generated!\n\n"
+                                   + find_violations(self.graph, self.coloring).summary())
+                return
+            color_count = get_color_count(self.coloring)
+            gap = format_gap(color_count, bound)
+            self.display_schedule()
+            self.info_label.config(
+                text=f"Schedule generated! Time slots used / lower bound: {gap} | "
+                     f"Capacity: {capacity} {unit} per slot"
+            )
+            messagebox.showinfo("Success",
+                                f"Schedule generated successfully!\nTime slots used: {color_count}\n"
+                                f"Time slots used / lower bound: {gap}\n\nSlot fill levels:\n"
+                                + fill_report(self.coloring, capacity, sizes))
         
-        # Add schedule items
-        for course in sorted(self.coloring.keys()):
-            slot = self.coloring[course]
-            color = self.get_color_for_slot(slot)
-            self.schedule_tree.insert('', tk.END, values=(course, slot, '■'), 
-                                     tags=(f'slot{slot}',))
-            # Tag items for color coding
-            self.schedule_tree.tag_configure(f'slot{slot}', background=color)
+        self.start_job(f"Generating schedule (capacity {capacity} {unit})...", work, finish)
+    
+    def fit_to_slots(self, time_limit=5.0):
+        """Schedule into a given number of slots, keeping weighted clashes to a minimum"""
+        if self.is_busy():
+            return
+        if not self.graph.vertices:
+            messagebox.showwarning("Warning", "Please add courses first!")
+            return
+        slots = simpledialog.askinteger("Fit to Slots", "Number of available time slots:",
+                                        parent=self.root, minvalue=1)
+        if slots is None:
+            return
+        
+        graph = self.job_graph()
+        initial = self.coloring or None
+        
+        def work(job):
+            def report(clash_weight):
+                job.progress(f"Minimizing clashes in {slots} time slots: "
+                             f"clash weight {clash_weight:g}", job.elapsed / time_limit)
+            
+            return minimize_conflicts(graph, slots, coloring=initial, time_limit=time_limit,
+                                      callback=report, stop=job.stop_event)
+        
+        def finish(result, cancelled):
+            self.coloring = result.coloring
+            # Only a clash-free schedule can be kept valid incrementally
+            self.incremental = None if result.clashes else IncrementalColoring(self.graph,
+                                                                               self.coloring)
+            self.display_schedule()
+            self.info_label.config(
+                text=f"Fitted into {slots} time slots | Clashing pairs: {len(result.clashes)} | "
+                     f"Clash weight: {result.total_weight:g}"
+            )
+            messagebox.showinfo("Fit to Slots", result.clash_report(limit=15))
+        
+        self.start_job(f"Minimizing clashes in {slots} time slots...", work, finish)
+    
+    def optimize_schedule(self, job, graph, coloring, time_limit=5.0, min_colors=1):
+        """
+        Worker side: run the tabu search improver down to min_colors slots,
+        reporting progress and each schedule with fewer slots through the job
+        """
+        start = job.elapsed
+        
+        def report(k, conflicts):
+            job.progress(f"Optimizing: trying {k} time slots, {conflicts} conflicts left",
+                         (job.elapsed - start) / time_limit)
+        
+        def improved(coloring, k):
+            job.best(coloring, f"Optimizing: best schedule so far uses {k} time slots")
+        
+        result = tabu_improve(graph, coloring, time_limit=time_limit, min_colors=min_colors,
+                              callback=report, on_improvement=improved, stop=job.stop_event)
+        if validate_coloring(graph, result.coloring):
+            return result.coloring
+        return coloring
+    
+    def job_graph(self):
+        """
+        Graph for a background job to read
+        Reads of a CompactGraph merge its pending conflicts, so the job gets a
+        compacted copy and the lists, views and save/export on the UI thread
+        keep reading self.graph; Graph reads change nothing and it is shared
+        """
+        if isinstance(self.graph, CompactGraph):
+            return self.graph.copy()
+        return self.graph
+    
+    def start_job(self, title, work, finish):
+        """
+        Run work(job) in a background thread (see background.BackgroundJob) and
+        call finish(result, cancelled) on the UI thread when it is done
+        """
+        self.job = BackgroundJob(work)
+        self.job_finish = finish
+        self.info_label.config(text=title)
+        self.progress_bar.configure(mode='indeterminate')
+        self.progress_bar.start(15)
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.job.start()
+        self.root.after(self.POLL_INTERVAL, self.poll_job)
+    
+    def poll_job(self):
+        """Apply the messages of the running job; reschedules itself until it is done"""
+        job = self.job
+        best = None
+        outcome = None
+        for message in job.poll():
+            if message[0] == 'progress':
+                _, text, fraction = message
+                self.info_label.config(text=text)
+                if fraction is None:
+                    continue
+                if str(self.progress_bar.cget('mode')) != 'determinate':
+                    self.progress_bar.stop()
+                    self.progress_bar.configure(mode='determinate', maximum=1.0)
+                self.progress_bar['value'] = min(fraction, 1.0)
+            elif message[0] == 'best':
+                # Only the latest of several improvements needs to be drawn
+                best = message
+            else:
+                outcome = message
+        if best is not None and outcome is None:
+            self.coloring = best[1]
+            self.display_schedule()
+            self.info_label.config(text=best[2])
+        if outcome is None:
+            self.root.after(self.POLL_INTERVAL, self.poll_job)
+            return
+        
+        self.job = None
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode='determinate')
+        self.progress_bar['value'] = 0
+        self.cancel_button.configure(state=tk.DISABLED)
+        if outcome[0] == 'error':
+            self.info_label.config(text="Schedule generation failed.")
+            messagebox.showerror("Error", f"Schedule generation failed:\n{outcome[1]}")
+            return
+        self.job_finish(outcome[1], job.cancelled)
+    
+    def cancel_job(self):
+        """Ask the running job to stop; searching solvers keep their best schedule"""
+        if self.job is not None:
+            self.job.cancel()
+            self.info_label.config(text="Cancelling...")
+    
+    def is_busy(self):
+        """True (with a warning) while a background job is using the graph"""
+        if self.job is None:
+            return False
+        messagebox.showwarning("Busy", "Please wait for the running schedule generation "
+                                       "to finish, or cancel it.")
+        return True
+    
+    def display_schedule(self, added=None):
+        """
+        Display the schedule in the treeview; with added (newly scheduled
+        courses) only those are inserted and the visible rows redrawn
+        """
+        if added is None:
+            self.schedule_view.set_items(sorted(self.coloring.keys()))
+        else:
+            self.schedule_view.insert_sorted(added)
+        
+        if self.graph_view is not None:
+            self.graph_view.set_coloring(self.coloring)
         
         # Update legend
         self.update_legend()
     
+    def schedule_row(self, course):
+        """Treeview values and tags of one visible schedule row"""
+        slot = self.coloring.get(course)
+        if slot is None:
+            return (course, '', ''), ()
+        # One color tag per slot, configured the first time the slot is shown
+        if slot not in self.slot_tags:
+            self.schedule_tree.tag_configure(f'slot{slot}',
+                                             background=self.get_color_for_slot(slot))
+            self.slot_tags.add(slot)
+        return (course, slot, '■'), (f'slot{slot}',)
+    
     def get_color_for_slot(self, slot):
         """Get color for a time slot"""
         return self.color_palette[slot % len(self.color_palette)]
@@ -268,14 +840,42 @@ class CourseSchedulerGUI:
             self.legend_canvas.create_text(x + 20, 40, text=f"Slot {slot}")
             x += slot_width
     
+    def show_graph_view(self):
+        """
+        Open a window with the conflict graph, courses colored by time slot
+        A window that is already open is replaced, so the view includes
+        courses and conflicts added since it was opened
+        """
+        if not self.graph.vertices:
+            messagebox.showwarning("Warning", "Please add courses first!")
+            return
+        self.close_graph_view()
+        try:
+            self.graph_view = GraphView(self.root, self.graph, self.coloring,
+                                        self.get_color_for_slot, on_close=self._graph_view_closed)
+        except ImportError as e:
+            messagebox.showerror("Error", str(e))
+    
+    def close_graph_view(self):
+        if self.graph_view is not None:
+            self.graph_view.close()
+    
+    def _graph_view_closed(self):
+        self.graph_view = None
+    
     def clear_data(self):
         """Clear all data"""
+        if self.is_busy():
+            return
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all data?"):
+            self.close_graph_view()
             self.graph = Graph()
             self.coloring = {}
-            self.course_listbox.delete(0, tk.END)
-            self.conflict_listbox.delete(0, tk.END)
-            self.schedule_tree.delete(*self.schedule_tree.get_children())
+            self.incremental = None
+            self.course_sizes = {}
+            self.course_view.clear()
+            self.conflict_view.clear()
+            self.schedule_view.clear()
             self.info_label.config(text="No schedule generated yet.")
             self.legend_canvas.delete("all")
             self.conflict_course1.set('')
@@ -286,7 +886,7 @@ class CourseSchedulerGUI:
 def main():
     """Main function to run the GUI"""
     root = tk.Tk()
-    app = CourseSchedulerGUI(root)
+    app = CourseSchedulerGUI(root, cache_dir=cache_dir_option(sys.argv[1:]))
     root.mainloop()
 
 
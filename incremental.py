@@ -0,0 +1,127 @@
+"""
+Incremental Scheduling Module for Course Scheduling
+Keeps an existing coloring valid while courses and conflicts are added
+"""
+
+from graph_coloring import greedy_coloring, get_color_count
+
+
+class IncrementalColoring:
+    """
+    Wraps a graph and its coloring so updates only recolor affected courses
+    
+    add_vertex/add_edge update the graph and repair the coloring in place:
+    a clashing course first moves to a free existing slot (O(degree)), then
+    tries to free a slot by moving a single blocking neighbor (bounded by
+    max_neighborhood neighbor visits), and only opens a new slot as a last
+    resort. Every update returns the moves made as (course, old_slot, new_slot)
+    tuples, with old_slot None for newly scheduled courses.
+    """
+    
+    def __init__(self, graph, coloring=None, max_neighborhood=1000):
+        self.graph = graph
+        self.coloring = coloring if coloring is not None else greedy_coloring(graph)
+        self.slot_count = get_color_count(self.coloring)
+        self.max_neighborhood = max_neighborhood
+    
+    def add_vertex(self, vertex):
+        """Add a course and schedule it if it is new"""
+        self.graph.add_vertex(vertex)
+        if vertex in self.coloring:
+            return []
+        return self._repair_vertex(vertex, allow_new_slot=True)
+    
+    def add_edge(self, vertex1, vertex2, weight=None):
+        """Add a conflict and repair the schedule if both courses share a slot"""
+        self.graph.add_edge(vertex1, vertex2, weight)
+        moves = []
+        for vertex in (vertex1, vertex2):
+            if vertex not in self.coloring:
+                moves.extend(self._repair_vertex(vertex, allow_new_slot=True))
+        if self.coloring[vertex1] != self.coloring[vertex2]:
+            return moves
+        
+        # Prefer moving the course with fewer conflicts; open a new slot only
+        # if neither course can be placed in an existing one
+        endpoints = sorted((vertex1, vertex2), key=self.graph.get_degree)
+        for vertex in endpoints:
+            repaired = self._repair_vertex(vertex, allow_new_slot=False)
+            if repaired:
+                return moves + repaired
+        return moves + self._repair_vertex(endpoints[0], allow_new_slot=True)
+    
+    def add_edges(self, edges):
+        """Add many conflicts, returning all moves made"""
+        moves = []
+        for vertex1, vertex2 in edges:
+            moves.extend(self.add_edge(vertex1, vertex2))
+        return moves
+    
+    def repair(self, vertices=None):
+        """
+        Repair the coloring around the given courses (all courses by default)
+        Useful after the graph was changed without going through this wrapper
+        """
+        moves = []
+        for vertex in (self.graph.vertices if vertices is None else vertices):
+            moves.extend(self._repair_vertex(vertex, allow_new_slot=True))
+        return moves
+    
+    def _repair_vertex(self, vertex, allow_new_slot):
+        """
+        Give vertex a slot that none of its neighbors uses
+        Returns the moves made, or [] if vertex was already valid or could not
+        be placed without a new slot (and allow_new_slot is False)
+        """
+        coloring = self.coloring
+        current = coloring.get(vertex)
+        blockers = {}
+        for neighbor in self.graph.get_neighbors(vertex):
+            color = coloring.get(neighbor)
+            if color is not None and neighbor != vertex:
+                blockers.setdefault(color, []).append(neighbor)
+        if current is not None and current not in blockers:
+            return []
+        
+        # A free existing slot costs a single move
+        for color in range(self.slot_count):
+            if color not in blockers:
+                return [self._move(vertex, color)]
+        
+        # Free a slot whose only occupant among the neighbors can move elsewhere
+        budget = self.max_neighborhood
+        for color in range(self.slot_count):
+            group = blockers[color]
+            if len(group) != 1:
+                continue
+            neighbor = group[0]
+            budget -= self.graph.get_degree(neighbor)
+            if budget < 0:
+                break
+            target = self._free_slot(neighbor, ignore=vertex, exclude=color)
+            if target is not None:
+                return [self._move(neighbor, target), self._move(vertex, color)]
+        
+        if not allow_new_slot:
+            return []
+        return [self._move(vertex, self.slot_count)]
+    
+    def _free_slot(self, vertex, ignore, exclude):
+        """Smallest existing slot (other than exclude) unused by vertex's neighbors"""
+        used = {exclude}
+        coloring = self.coloring
+        for neighbor in self.graph.get_neighbors(vertex):
+            if neighbor != ignore and neighbor in coloring:
+                used.add(coloring[neighbor])
+        for color in range(self.slot_count):
+            if color not in used:
+                return color
+        return None
+    
+    def _move(self, vertex, color):
+        """Assign vertex to a slot and record the move"""
+        old = self.coloring.get(vertex)
+        self.coloring[vertex] = color
+        if color >= self.slot_count:
+            self.slot_count = color + 1
+        return (vertex, old, color)
@@ -0,0 +1,214 @@
+"""
+Instrumentation Module for Course Scheduling
+Counters, phase timings and profiling hooks for the coloring pipeline
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+
+from graph_coloring import color_graph, greedy_coloring, dsatur_coloring, validate_coloring
+
+# Strategies that report neighbor visits and color probes; the others are timed only
+COUNTING_STRATEGIES = {
+    'greedy': greedy_coloring,
+    'dsatur': dsatur_coloring,
+}
+
+
+class ColoringStats:
+    """
+    Work done by one coloring run
+    
+    neighbor_visits counts adjacency entries scanned while coloring,
+    color_probes counts candidate colors tested, and phases maps each phase
+    ('sort', 'color', 'validate', ...) to its wall time in seconds. The coloring functions
+    switch phases with phase(name) and report counters once at the end with
+    count(), so the hot loops carry no instrumentation. Callbacks are told
+    when each phase starts and finishes.
+    """
+    
+    def __init__(self, callbacks=()):
+        self.neighbor_visits = 0
+        self.color_probes = 0
+        self.phases = {}
+        self.callbacks = list(callbacks)
+        self.counted = False
+        self.valid = None
+        self._phase = None
+        self._phase_start = 0.0
+    
+    def phase(self, name):
+        """End the current phase (if any) and start timing the named one"""
+        self._end_phase()
+        self._phase = name
+        for callback in self.callbacks:
+            callback.phase_started(name)
+        self._phase_start = time.perf_counter()
+    
+    def count(self, neighbor_visits=0, color_probes=0):
+        """Add to the work counters"""
+        self.neighbor_visits += neighbor_visits
+        self.color_probes += color_probes
+        self.counted = True
+    
+    def finish(self):
+        """End the current phase and notify the callbacks that the run is over"""
+        self._end_phase()
+        for callback in self.callbacks:
+            callback.finished(self)
+    
+    def _end_phase(self):
+        if self._phase is None:
+            return
+        elapsed = time.perf_counter() - self._phase_start
+        name, self._phase = self._phase, None
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        for callback in self.callbacks:
+            callback.phase_finished(name, elapsed)
+    
+    @property
+    def total_time(self):
+        """Wall time over all phases"""
+        return sum(self.phases.values())
+    
+    def as_dict(self):
+        """Plain dict of the counters and phase times, e.g. for JSON output"""
+        return {
+            'neighbor_visits': self.neighbor_visits if self.counted else None,
+            'color_probes': self.color_probes if self.counted else None,
+            'phases': dict(self.phases),
+            'total_time': self.total_time,
+        }
+    
+    def summary(self):
+        """Multi-line human-readable report"""
+        lines = []
+        if self.counted:
+            lines.append(f"Neighbor visits: {self.neighbor_visits:,}")
+            lines.append(f"Color probes: {self.color_probes:,}")
+        else:
+            lines.append("Neighbor visits: - (not counted for this strategy)")
+        for name, seconds in self.phases.items():
+            lines.append(f"{name.capitalize()} phase: {seconds * 1000:.2f} ms")
+        lines.append(f"Total: {self.total_time * 1000:.2f} ms")
+        return '\n'.join(lines)
+    
+    def __repr__(self):
+        return (f"ColoringStats(neighbor_visits={self.neighbor_visits}, "
+                f"color_probes={self.color_probes}, total_time={self.total_time:.4f})")
+
+
+class StatsCallback:
+    """Base class for ColoringStats callbacks; override the hooks you need"""
+    
+    def phase_started(self, name):
+        pass
+    
+    def phase_finished(self, name, elapsed):
+        pass
+    
+    def finished(self, stats):
+        pass
+
+
+class LoggingCallback(StatsCallback):
+    """Log each phase and the final counters through the logging module"""
+    
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('course_scheduler')
+        self.level = level
+    
+    def phase_finished(self, name, elapsed):
+        self.logger.log(self.level, "phase %s took %.2f ms", name, elapsed * 1000)
+    
+    def finished(self, stats):
+        self.logger.log(self.level, "coloring done: %d neighbor visits, %d color probes",
+                        stats.neighbor_visits, stats.color_probes)
+
+
+class ProfileCallback(StatsCallback):
+    """
+    Run cProfile over selected phases (all phases by default)
+    Profiles are kept per phase in self.profiles; report() formats the top entries
+    """
+    
+    def __init__(self, phases=None):
+        self.phases = set(phases) if phases is not None else None
+        self.profiles = {}
+        self._profile = None
+    
+    def phase_started(self, name):
+        if self.phases is None or name in self.phases:
+            self._profile = self.profiles.setdefault(name, cProfile.Profile())
+            self._profile.enable()
+    
+    def phase_finished(self, name, elapsed):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+    
+    def report(self, limit=10, sort='cumulative'):
+        """Text report of the most expensive calls in each profiled phase"""
+        out = io.StringIO()
+        for name, profile in self.profiles.items():
+            out.write(f"--- {name} ---\n")
+            pstats.Stats(profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class JSONTraceCallback(StatsCallback):
+    """
+    Record phases as Chrome trace events (chrome://tracing, Perfetto)
+    The trace is written to path when the run finishes, or call write() yourself
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []
+        self._origin = time.perf_counter()
+        self._start = 0.0
+    
+    def phase_started(self, name):
+        self._start = time.perf_counter()
+    
+    def phase_finished(self, name, elapsed):
+        self.events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                            'ts': (self._start - self._origin) * 1e6, 'dur': elapsed * 1e6})
+    
+    def finished(self, stats):
+        self.events.append({'name': 'counters', 'ph': 'C', 'pid': 1, 'tid': 1,
+                            'ts': (time.perf_counter() - self._origin) * 1e6,
+                            'args': {'neighbor_visits': stats.neighbor_visits,
+                                     'color_probes': stats.color_probes}})
+        if self.path is not None:
+            self.write(self.path)
+    
+    def write(self, path):
+        """Write the trace as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events}, f)
+
+
+def instrumented_coloring(graph, strategy='greedy', callbacks=(), validate=True,
+                          lower_bound=None):
+    """
+    Color graph with the given strategy and return (coloring, stats)
+    
+    greedy and dsatur report their neighbor visits and color probes; other
+    strategies are timed as a single 'color' phase. With validate=True the
+    result is also checked and the check is timed as the 'validate' phase
+    (stats.valid holds the outcome). lower_bound is passed on as in color_graph.
+    """
+    stats = ColoringStats(callbacks)
+    if strategy in COUNTING_STRATEGIES:
+        coloring = COUNTING_STRATEGIES[strategy](graph, stats=stats)
+    else:
+        stats.phase('color')
+        coloring = color_graph(graph, strategy, lower_bound)
+    stats.valid = validate_coloring(graph, coloring, stats=stats) if validate else None
+    stats.finish()
+    return coloring, stats
@@ -0,0 +1,198 @@
+"""
+Load Test for the Scheduling Service
+Concurrent keep-alive clients sending a mix of schedule, validate and mutate requests
+
+    python loadtest.py --spawn [--clients 32] [--requests 200] [--courses 2000] [--conflicts 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import subprocess
+import sys
+import time
+
+from service import DEFAULT_PORT, HOST
+
+
+class Client:
+    """Minimal HTTP/1.1 JSON client over one keep-alive connection"""
+    
+    def __init__(self, port):
+        self.port = port
+        self.reader = None
+        self.writer = None
+    
+    async def request(self, method, path, body=None):
+        """Send one request; returns (status, response dict)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+                          f"Content-Type: application/json\r\n"
+                          f"Content-Length: {len(payload)}\r\n\r\n".encode('latin-1') + payload)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            if key.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def load_graph(client, name, courses, conflicts, seed=0, batch=5000):
+    """Create a random graph on the service in batched mutations"""
+    rng = random.Random(seed)
+    vertices = [f"C{i}" for i in range(courses)]
+    await client.request('DELETE', f"/graphs/{name}")
+    await client.request('POST', f"/graphs/{name}/mutate", {'vertices': vertices})
+    edges = set()
+    while len(edges) < min(conflicts, courses * (courses - 1) // 2):
+        a, b = rng.sample(range(courses), 2)
+        edges.add((min(a, b), max(a, b)))
+    edges = [[vertices[a], vertices[b]] for a, b in edges]
+    for i in range(0, len(edges), batch):
+        await client.request('POST', f"/graphs/{name}/mutate", {'edges': edges[i:i + batch]})
+    return vertices
+
+
+async def run_client(port, name, vertices, requests, mix, latencies, rng):
+    """One client: send requests of randomly chosen kinds, recording latencies per kind"""
+    client = Client(port)
+    coloring = None
+    kinds, weights = zip(*mix.items())
+    try:
+        for _ in range(requests):
+            kind = rng.choices(kinds, weights)[0]
+            if kind == 'validate' and coloring is None:
+                kind = 'schedule'
+            if kind == 'schedule':
+                body = {'strategy': 'greedy'}
+            elif kind == 'validate':
+                body = {'coloring': coloring}
+            else:
+                a, b = rng.sample(vertices, 2)
+                body = {'edges': [[a, b]]}
+            start = time.perf_counter()
+            status, response = await client.request('POST', f"/graphs/{name}/{kind}", body)
+            latencies[kind].append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"{kind} failed with {status}: {response.get('error')}")
+            if kind == 'schedule':
+                coloring = response['coloring']
+    finally:
+        client.close()
+
+
+async def run_load_test(port, clients, requests, courses, conflicts, mix, seed=0):
+    """Load a graph, run the clients concurrently and print latency percentiles"""
+    setup = Client(port)
+    name = 'loadtest'
+    start = time.perf_counter()
+    vertices = await load_graph(setup, name, courses, conflicts, seed)
+    _, info = await setup.request('GET', f"/graphs/{name}")
+    print(f"Loaded {info['courses']} courses, {info['conflicts']} conflicts "
+          f"in {time.perf_counter() - start:.2f}s")
+    
+    latencies = {kind: [] for kind in mix}
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(port, name, vertices, requests, mix, latencies,
+                                      random.Random(seed + i + 1))
+                           for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    _, counters = await setup.request('GET', '/stats')
+    setup.close()
+    
+    total = sum(len(values) for values in latencies.values())
+    print(f"{clients} clients x {requests} requests: {total} requests in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} requests/s)")
+    print(f"{'Request':<10} {'Count':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    everything = sorted(value for values in latencies.values() for value in values)
+    for kind, values in list(latencies.items()) + [('all', everything)]:
+        values = sorted(values)
+        if not values:
+            continue
+        print(f"{kind:<10} {len(values):>7} {percentile(values, 0.50) * 1000:>9.2f} "
+              f"{percentile(values, 0.99) * 1000:>9.2f} {values[-1] * 1000:>9.2f}")
+    print(f"Service: {counters['schedules_computed']} schedules computed, "
+          f"{counters['coalesced']} coalesced, {counters['cached']} cached, "
+          f"{counters['executor_runs']} in worker processes")
+
+
+def spawn_service(workers=None):
+    """Start service.py on a free port; returns (process, port)"""
+    command = [sys.executable, 'service.py', '--port', '0']
+    if workers:
+        command += ['--workers', str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith('Serving on'):
+        process.kill()
+        raise RuntimeError(f"Service did not start: {line!r}")
+    return process, int(line.rsplit(':', 1)[1])
+
+
+def main(argv=None):
+    """Command line entry point: python loadtest.py [options]"""
+    parser = argparse.ArgumentParser(
+        description="Measure latency and throughput of the scheduling service")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"port of a running service (default: {DEFAULT_PORT})")
+    parser.add_argument('--spawn', action='store_true',
+                        help="start a service on a free port for the test")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes of a spawned service")
+    parser.add_argument('--clients', type=int, default=32,
+                        help="concurrent connections (default: 32)")
+    parser.add_argument('--requests', type=int, default=200,
+                        help="requests per client (default: 200)")
+    parser.add_argument('--courses', type=int, default=2000,
+                        help="courses in the test graph (default: 2000)")
+    parser.add_argument('--conflicts', type=int, default=20000,
+                        help="conflicts in the test graph (default: 20000)")
+    parser.add_argument('--mutate', type=float, default=0.05,
+                        help="fraction of requests that add a conflict (default: 0.05)")
+    parser.add_argument('--validate', type=float, default=0.25,
+                        help="fraction of requests that validate a schedule (default: 0.25)")
+    args = parser.parse_args(argv)
+    
+    mix = {'schedule': max(0.0, 1 - args.mutate - args.validate),
+           'validate': args.validate, 'mutate': args.mutate}
+    process = None
+    port = args.port
+    if args.spawn:
+        process, port = spawn_service(args.workers)
+    try:
+        asyncio.run(run_load_test(port, args.clients, args.requests, args.courses,
+                                  args.conflicts, mix))
+    except ConnectionRefusedError:
+        print(f"Error: no service on {HOST}:{port} (start it or use --spawn)")
+        return 2
+    finally:
+        if process is not None:
+            # SIGINT lets the service shut down its worker processes too
+            process.send_signal(signal.SIGINT)
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
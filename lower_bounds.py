@@ -0,0 +1,129 @@
+"""
+Lower Bounds Module for Course Scheduling
+Fast lower bounds on the number of time slots, to report the optimality gap
+"""
+
+import time
+
+from exact_coloring import _popcount
+
+
+class LowerBound:
+    """
+    Best lower bound found for a graph
+    value is the larger of the clique size and the degree-sequence bound;
+    any valid schedule needs at least value time slots
+    """
+    
+    def __init__(self, value, clique, degree_bound, elapsed):
+        self.value = value
+        self.clique = clique
+        self.degree_bound = degree_bound
+        self.elapsed = elapsed
+    
+    def gap(self, color_count):
+        """Slots above the bound (0 means the schedule is provably optimal)"""
+        return color_count - self.value
+    
+    def __repr__(self):
+        return (f"LowerBound({self.value}, clique {len(self.clique)}, "
+                f"degree bound {self.degree_bound}, {self.elapsed:.3f}s)")
+
+
+def degree_lower_bound(graph):
+    """
+    Cheap lower bound from the degree sequence alone (O(V))
+    
+    - Every independent set misses a vertex cover, which needs at least
+      m / max_degree vertices, so a slot holds at most n - m / max_degree
+      courses and at least n / (n - m / max_degree) slots are needed
+    - Turán: a graph with m edges has a clique of n^2 / (n^2 - 2m) vertices
+    """
+    n = len(graph.vertices)
+    if n == 0:
+        return 0
+    degrees = [graph.get_degree(vertex) for vertex in graph.vertices]
+    degree_sum = sum(degrees)
+    if degree_sum == 0:
+        return 1
+    max_degree = max(degrees)
+    # Integer ceilings of 2n*max_degree / (2n*max_degree - 2m) and n^2 / (n^2 - 2m)
+    cover = -(-2 * n * max_degree // (2 * n * max_degree - degree_sum))
+    turan = -(-n * n // (n * n - degree_sum)) if degree_sum < n * n else n
+    return max(2, cover, turan)
+
+
+def clique_search(graph, time_limit=1.0, target=None):
+    """
+    Heuristic maximum clique search with a time budget
+    
+    Courses are tried as clique seeds in decreasing degree order. For each
+    seed, its neighbors that could still be part of a larger clique (degree
+    at least the best size so far) get local neighbor bitsets, and a clique
+    is grown greedily from every one of them, always adding the highest-
+    degree candidate (the lowest set bit). The search stops when time_limit
+    seconds are used, a clique of target courses is found (e.g. the slots
+    of a known schedule, which no clique can exceed) or no remaining seed has
+    enough neighbors to beat the best clique. Returns the clique as a list of
+    courses.
+    """
+    deadline = time.perf_counter() + time_limit
+    degree = {vertex: graph.get_degree(vertex) for vertex in graph.vertices}
+    order = sorted(graph.vertices, key=degree.__getitem__, reverse=True)
+    best = order[:1]
+    for seed in order:
+        if degree[seed] < len(best) or time.perf_counter() > deadline:
+            break
+        if target is not None and len(best) >= target:
+            break
+        size = len(best)
+        # Local ids follow global degree, so the lowest set bit is the best candidate
+        candidates = sorted((v for v in graph.get_neighbors(seed)
+                             if v != seed and degree[v] >= size),
+                            key=degree.__getitem__, reverse=True)
+        if len(candidates) < size:
+            continue
+        local = {v: i for i, v in enumerate(candidates)}
+        adjacency = []
+        for v in candidates:
+            mask = 0
+            for w in graph.get_neighbors(v):
+                j = local.get(w)
+                if j is not None:
+                    mask |= 1 << j
+            adjacency.append(mask)
+        
+        starts = sorted(range(len(candidates)), key=lambda i: _popcount(adjacency[i]),
+                        reverse=True)
+        for start in starts:
+            # The clique holds seed + start + a subset of start's local neighbors
+            if _popcount(adjacency[start]) + 2 <= len(best) or time.perf_counter() > deadline:
+                break
+            clique = [start]
+            remaining = adjacency[start]
+            while remaining:
+                low = remaining & -remaining
+                v = low.bit_length() - 1
+                clique.append(v)
+                remaining &= adjacency[v]
+            if len(clique) + 1 > len(best):
+                best = [seed] + [candidates[i] for i in clique]
+    return best
+
+
+def compute_lower_bound(graph, time_limit=1.0, target=None):
+    """
+    Best of the clique search and the degree-sequence bound; returns a LowerBound
+    Pass the slot count of a schedule as target to stop as soon as it is proven optimal
+    """
+    start = time.perf_counter()
+    clique = clique_search(graph, time_limit, target)
+    degree_bound = degree_lower_bound(graph)
+    return LowerBound(max(len(clique), degree_bound), clique, degree_bound,
+                      time.perf_counter() - start)
+
+
+def format_gap(color_count, bound):
+    """'slots used / lower bound' with the gap, e.g. '7 / 6 (gap 1)' or '6 / 6 (optimal)'"""
+    gap = color_count - bound
+    return f"{color_count} / {bound} ({'optimal' if gap <= 0 else f'gap {gap}'})"
@@ -1,6 +1,13 @@
 """
 Main entry point for Course Scheduler
-Allows user to choose between text and GUI interfaces
+Allows user to choose between text and GUI interfaces, or run headless:
+
+    python main.py [--cache-dir [DIR]]
+    python main.py schedule --input DIR [--strategy NAME] [--workers N]
+    python main.py serve [--port 8765] [--workers N]
+
+--cache-dir keeps generated schedules on disk across sessions (in DIR, or
+~/.course_scheduler/cache); without it the interfaces cache in memory only.
 """
 
 import sys
@@ -8,6 +15,19 @@ import sys
 
 def main():
     """Main function to choose interface"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'schedule':
+        # Headless batch mode; keep tkinter and the interfaces out of the import path
+        from batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        # Local scheduling service (see service.py)
+        from service import main as service_main
+        service_main(sys.argv[2:])
+        return
+    
+    from result_cache import cache_dir_option
+    cache_dir = cache_dir_option(sys.argv[1:])
+    
     print("="*50)
     print("Course Scheduler - Graph Coloring")
     print("="*50)
@@ -25,7 +45,7 @@ def main():
             sys.exit(0)
         elif choice == '1':
             from text_interface import CourseSchedulerText
-            scheduler = CourseSchedulerText()
+            scheduler = CourseSchedulerText(cache_dir=cache_dir)
             scheduler.run()
             break
         elif choice == '2':
@@ -33,7 +53,7 @@ def main():
                 import tkinter as tk
                 from gui_interface import CourseSchedulerGUI
                 root = tk.Tk()
-                app = CourseSchedulerGUI(root)
+                app = CourseSchedulerGUI(root, cache_dir=cache_dir)
                 root.mainloop()
                 break
             except ImportError:
@@ -0,0 +1,151 @@
+"""
+Parallel Coloring Module for Course Scheduling
+Jones-Plassmann style coloring in rounds of independent sets
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from compact_graph import to_csr
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def jones_plassmann_coloring(graph, seed=0, workers=1, largest_first=True, stats=None):
+    """
+    Color the graph in rounds using random vertex priorities
+    
+    Each vertex gets a priority: its degree with random tie-breaking when
+    largest_first is set (like greedy_coloring), otherwise a random one.
+    In every round, all uncolored vertices
+    whose higher-priority neighbors are already colored form an independent
+    set; they are colored at once with the smallest color missing among those
+    neighbors. Rounds are vectorized with NumPy; with workers > 1 the vertices
+    of a large round are split across a thread pool (NumPy releases the GIL,
+    so the chunks run in parallel without copying the graph).
+    Without NumPy the equivalent sequential greedy in priority order is used.
+    Returns a dictionary mapping vertices to colors (time slots); if a stats
+    dict is given, the number of rounds is stored in stats['rounds'].
+    """
+    vertices, offsets, indices = to_csr(graph)
+    n = len(vertices)
+    if n == 0:
+        return {}
+    
+    if np is None:
+        priority = list(range(n))
+        random.Random(seed).shuffle(priority)
+        if largest_first:
+            priority = [(offsets[i + 1] - offsets[i]) * n + priority[i] for i in range(n)]
+        colors = _priority_greedy(offsets, indices, priority)
+        if stats is not None:
+            stats['rounds'] = None
+        return dict(zip(vertices, colors))
+    
+    priority = np.random.default_rng(seed).permutation(n)
+    if largest_first:
+        priority = np.diff(np.frombuffer(offsets, dtype=np.int64)) * n + priority
+    colors, rounds = _jones_plassmann_numpy(offsets, indices, priority, workers)
+    if stats is not None:
+        stats['rounds'] = rounds
+    return dict(zip(vertices, colors.tolist()))
+
+
+def _priority_greedy(offsets, indices, priority):
+    """Sequential greedy coloring in decreasing priority order"""
+    colors = [-1] * len(priority)
+    for i in sorted(range(len(priority)), key=priority.__getitem__, reverse=True):
+        used_colors = {colors[j] for j in indices[offsets[i]:offsets[i + 1]]}
+        color = 0
+        while color in used_colors:
+            color += 1
+        colors[i] = color
+    return colors
+
+
+def _gather(offsets, targets, ready):
+    """
+    Gather the CSR rows of the ready vertices
+    Returns (owner, target) arrays listing every entry of those rows
+    """
+    starts = offsets[ready]
+    lengths = offsets[ready + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    # Position of each gathered entry: its row start plus its rank inside the row
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    positions = shifts + np.arange(total)
+    return np.repeat(ready, lengths), targets[positions]
+
+
+def _smallest_missing(owners, neighbor_colors, ready):
+    """Smallest color not used by the given neighbor colors, for each ready vertex"""
+    result = np.zeros(len(ready), dtype=np.int64)
+    if len(owners) == 0:
+        return result
+    # Unique (owner, color) pairs sorted by owner, then color
+    width = int(neighbor_colors.max()) + 2
+    keys = np.sort(owners * width + neighbor_colors)
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+    owner_ids, used = np.divmod(keys, width)
+    starts = np.flatnonzero(np.r_[True, owner_ids[1:] != owner_ids[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    # Inside a group, the k-th smallest used color equals k until the first gap
+    ranks = np.arange(len(keys)) - np.repeat(starts, counts)
+    gaps = np.where(used != ranks, ranks, width)
+    missing = np.minimum(np.minimum.reduceat(gaps, starts), counts)
+    result[np.searchsorted(ready, owner_ids[starts])] = missing
+    return result
+
+
+def _jones_plassmann_numpy(offsets, indices, priority, workers):
+    """Run Jones-Plassmann rounds over CSR arrays; returns (colors, rounds)"""
+    n = len(priority)
+    offsets = np.frombuffer(offsets, dtype=np.int64) if len(offsets) else np.zeros(1, np.int64)
+    cols = np.frombuffer(indices, dtype=np.int32).astype(np.int64) if len(indices) \
+        else np.zeros(0, np.int64)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    
+    # Split each CSR row into higher- and lower-priority neighbors. A vertex
+    # waits for exactly its higher-priority neighbors, which are also the only
+    # ones colored before it; coloring it releases its lower-priority neighbors
+    row_priority, col_priority = priority[rows], priority[cols]
+    higher = col_priority > row_priority
+    lower = col_priority < row_priority
+    up_cols, down_targets = cols[higher], cols[lower]
+    up_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[higher], minlength=n), out=up_offsets[1:])
+    down_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[lower], minlength=n), out=down_offsets[1:])
+    
+    colors = np.full(n, -1, dtype=np.int64)
+    waiting = np.diff(up_offsets)
+    ready = np.flatnonzero(waiting == 0)
+    rounds = 0
+    
+    def color_chunk(chunk):
+        owners, neighbors = _gather(up_offsets, up_cols, chunk)
+        return _smallest_missing(owners, colors[neighbors], chunk)
+    
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while len(ready):
+            rounds += 1
+            if pool is not None and len(ready) >= 10000:
+                chunks = np.array_split(ready, workers)
+                colors[ready] = np.concatenate(list(pool.map(color_chunk, chunks)))
+            else:
+                colors[ready] = color_chunk(ready)
+            
+            _, released = _gather(down_offsets, down_targets, ready)
+            waiting -= np.bincount(released, minlength=n)
+            ready = np.flatnonzero((waiting == 0) & (colors < 0))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return colors, rounds
@@ -0,0 +1,197 @@
+"""
+Portfolio Module for Course Scheduling
+Runs several coloring strategies in parallel processes and keeps the best
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from array import array
+
+from graph_coloring import (greedy_coloring, dsatur_coloring, smallest_last_coloring,
+                            random_order_coloring, get_color_count, validate_coloring)
+from compact_graph import CompactGraph, to_csr
+from lower_bounds import compute_lower_bound
+from validation import find_violations
+
+
+# Strategies a portfolio run can use; 'random' is run once per seed
+PORTFOLIO_STRATEGIES = {
+    'largest_first': lambda graph, seed: greedy_coloring(graph),
+    'smallest_last': lambda graph, seed: smallest_last_coloring(graph),
+    'dsatur': lambda graph, seed: dsatur_coloring(graph),
+    'random': lambda graph, seed: random_order_coloring(graph, seed),
+}
+
+# Graph snapshot installed once in each worker process
+_worker_graph = None
+
+
+class PortfolioResult:
+    """Best coloring of a portfolio run together with per-strategy timings"""
+    
+    def __init__(self, coloring, strategy, runs, lower_bound, elapsed, stopped):
+        self.coloring = coloring
+        self.strategy = strategy
+        self.runs = runs
+        self.lower_bound = lower_bound
+        self.elapsed = elapsed
+        self.stopped = stopped
+    
+    @property
+    def color_count(self):
+        """Number of colors (time slots) in the best coloring"""
+        return get_color_count(self.coloring)
+    
+    def __repr__(self):
+        return (f"PortfolioResult({self.color_count} colors by {self.strategy}, "
+                f"lower bound {self.lower_bound}, {len(self.runs)} runs, "
+                f"{self.elapsed:.2f}s, stopped: {self.stopped})")
+
+
+def graph_snapshot(graph):
+    """Serialize any graph backend into a compact, picklable CSR snapshot"""
+    vertices, offsets, indices = to_csr(graph)
+    return list(vertices), offsets.tobytes(), indices.tobytes()
+
+
+def graph_from_snapshot(snapshot):
+    """Rebuild a CompactGraph from graph_snapshot() output"""
+    vertices, offsets_bytes, indices_bytes = snapshot
+    graph = CompactGraph()
+    graph.add_vertices(vertices)
+    graph.offsets = array('q')
+    graph.offsets.frombytes(offsets_bytes)
+    graph.indices = array('i')
+    graph.indices.frombytes(indices_bytes)
+    return graph
+
+
+def _init_worker(snapshot):
+    """Process pool initializer: unpack the graph once per worker"""
+    global _worker_graph
+    if hasattr(os, 'nice'):
+        # Below the calling process, whose baseline is the guaranteed result
+        os.nice(5)
+    _worker_graph = graph_from_snapshot(snapshot)
+
+
+def _run_strategy(name, seed):
+    """Run one strategy in a worker; returns (name, seed, colors, elapsed, valid)"""
+    graph = _worker_graph
+    start = time.perf_counter()
+    coloring = PORTFOLIO_STRATEGIES[name](graph, seed)
+    elapsed = time.perf_counter() - start
+    valid = validate_coloring(graph, coloring)
+    # Send colors back as a flat array in vertex order, not as a dict of names
+    colors = array('i', (coloring[vertex] for vertex in graph.vertices))
+    return name, seed, colors.tobytes(), elapsed, valid
+
+
+def run_portfolio(graph, strategies=('largest_first', 'smallest_last', 'dsatur'),
+                  random_restarts=8, time_limit=30.0, lower_bound=None, workers=None,
+                  callback=None, stop=None):
+    """
+    Run several coloring strategies at once in a process pool
+    
+    The graph is shipped to each worker once as a CSR snapshot. Random-order
+    restarts use seeds 0..random_restarts-1. While the workers start, the
+    calling process runs largest-first itself, so a valid coloring exists
+    from the first fraction of a second whatever the time limit. The run
+    stops at time_limit seconds, or as soon as a valid coloring reaches the
+    lower bound (computed with compute_lower_bound unless given); the worker
+    processes are then terminated, including those still coloring.
+    callback(coloring, color_count) is called on every improved coloring, and
+    setting stop (e.g. a threading.Event) ends the run early with the best so far.
+    Returns a PortfolioResult with the best valid coloring and all run timings.
+    """
+    start = time.perf_counter()
+    if not graph.vertices:
+        return PortfolioResult({}, None, [], 0, 0.0, 'empty graph')
+    tasks = [(name, 0) for name in strategies if name != 'largest_first']
+    tasks += [('random', seed) for seed in range(random_restarts)]
+    vertices = list(graph.vertices)
+    
+    # multiprocessing.Pool rather than ProcessPoolExecutor: terminate() also
+    # stops workers in the middle of a strategy
+    if workers is None:
+        # Leave a core to the baseline coloring in this process
+        workers = max(1, (os.cpu_count() or 2) - 1)
+    pool = multiprocessing.Pool(workers, initializer=_init_worker,
+                                initargs=(graph_snapshot(graph),))
+    outcomes = queue.Queue()
+    for name, seed in tasks:
+        pool.apply_async(_run_strategy, (name, seed),
+                         callback=outcomes.put, error_callback=outcomes.put)
+    outstanding = len(tasks)
+    runs = []
+    best_colors, best_name, best_count = None, None, None
+    stopped = 'completed'
+    
+    def record(outcome):
+        nonlocal best_colors, best_name, best_count
+        name, seed, colors, elapsed, valid = outcome
+        count = max(colors) + 1 if colors else 0
+        label = f"random (seed {seed})" if name == 'random' else name
+        runs.append({'strategy': label, 'colors': count,
+                     'elapsed': elapsed, 'valid': valid})
+        if valid and (best_count is None or count < best_count):
+            best_colors, best_name, best_count = colors, label, count
+            if callback is not None:
+                callback(dict(zip(vertices, colors)), count)
+    
+    try:
+        # Cheap baseline in this process, kept as the result if nothing beats it
+        run_start = time.perf_counter()
+        baseline = greedy_coloring(graph)
+        record(('largest_first', 0, array('i', (baseline[vertex] for vertex in vertices)),
+                time.perf_counter() - run_start, find_violations(graph, baseline).valid))
+        remaining = time_limit - (time.perf_counter() - start)
+        if lower_bound is None:
+            if remaining > 0 and not (stop is not None and stop.is_set()):
+                # Search for the bound while the workers are already coloring
+                lower_bound = compute_lower_bound(
+                    graph, time_limit=min(1.0, remaining / 10)).value
+            else:
+                # No time left for a search: every non-empty graph needs one slot
+                lower_bound = 1
+        while outstanding:
+            if best_count is not None and best_count <= lower_bound:
+                stopped = 'lower bound reached'
+                break
+            remaining = time_limit - (time.perf_counter() - start)
+            if remaining <= 0:
+                stopped = 'time limit'
+                break
+            if stop is not None:
+                if stop.is_set():
+                    stopped = 'cancelled'
+                    break
+                # Wake up regularly to notice the stop request
+                remaining = min(remaining, 0.1)
+            try:
+                outcome = outcomes.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            outstanding -= 1
+            if isinstance(outcome, BaseException):
+                raise outcome
+            name, seed, colors_bytes, elapsed, valid = outcome
+            colors = array('i')
+            colors.frombytes(colors_bytes)
+            record((name, seed, colors, elapsed, valid))
+        else:
+            if best_count is not None and best_count <= lower_bound:
+                stopped = 'lower bound reached'
+    finally:
+        pool.terminate()
+    
+    if best_colors is None:
+        # No valid coloring at all (only possible with self-conflicts)
+        coloring = baseline
+        best_name = 'largest_first (invalid)'
+    else:
+        coloring = dict(zip(vertices, best_colors))
+    return PortfolioResult(coloring, best_name, runs, lower_bound,
+                           time.perf_counter() - start, stopped)
@@ -0,0 +1,371 @@
+"""
+Result Cache Module for Course Scheduling
+Content-addressed cache of coloring results with memory and disk LRU tiers
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+
+from compact_graph import to_edge_arrays, _as_numpy
+from graph_coloring import BOUNDED_STRATEGIES, color_graph, validate_coloring
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Default directory of the disk tier when the interfaces are started with --cache-dir
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.course_scheduler', 'cache')
+
+# Disk entry layout (little-endian): magic, course count n, then n int32 slots
+# in canonical course order
+CACHE_MAGIC = b'CSCHEDRC'
+_HEADER = struct.Struct('<8sQ')
+_SUFFIX = '.colors'
+
+# Strategies that take about as long as fingerprinting the graph; caching them
+# would make a hit no faster than a fresh run, so they bypass the cache
+UNCACHED_STRATEGIES = {'greedy', 'random', 'parallel'}
+
+
+class GraphFingerprint:
+    """
+    Canonical form of a graph: courses sorted by repr(), edges as sorted pairs
+    of canonical ids. digest does not depend on insertion order; src/dst are
+    kept to verify cached colorings without another pass over the graph.
+    """
+    
+    def __init__(self, vertices, order, src, dst, digest):
+        self.vertices = vertices
+        # order[r] = position in vertices of the course with canonical id r
+        self.order = order
+        self.src = src
+        self.dst = dst
+        self.digest = digest
+
+
+def graph_fingerprint(graph):
+    """
+    Hash the vertex set and edge set of any graph backend (O(E log E))
+    Two graphs with the same courses and conflicts get the same digest,
+    whatever order they were added in; edge weights are not included
+    """
+    vertices, src, dst = to_edge_arrays(graph)
+    n = len(vertices)
+    names = [repr(vertex) for vertex in vertices]
+    order = sorted(range(n), key=names.__getitem__)
+    rank = array('i', bytes(4 * n))
+    for r, i in enumerate(order):
+        rank[i] = r
+    
+    if np is not None:
+        ranks = _as_numpy(rank, np.int32)
+        a = ranks[_as_numpy(src, np.int32)]
+        b = ranks[_as_numpy(dst, np.int32)]
+        low = np.minimum(a, b)
+        high = np.maximum(a, b)
+        codes = np.sort(low.astype(np.int64) * n + high)
+        src, dst = low, high
+        edge_bytes = codes.tobytes()
+    else:
+        pairs = sorted((min(rank[i], rank[j]), max(rank[i], rank[j]))
+                       for i, j in zip(src, dst))
+        src = array('i', (low for low, _ in pairs))
+        dst = array('i', (high for _, high in pairs))
+        edge_bytes = array('q', (low * n + high for low, high in pairs)).tobytes()
+    
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(struct.pack('<QQ', n, len(src)))
+    digest.update('\0'.join(names[i] for i in order).encode('utf-8'))
+    digest.update(edge_bytes)
+    return GraphFingerprint(vertices, order, src, dst, digest.hexdigest())
+
+
+def _colors_fit(fingerprint, colors):
+    """Check canonical-order colors against the fingerprint's edges (O(V + E))"""
+    if len(colors) != len(fingerprint.order):
+        return False
+    if np is not None and len(colors):
+        slots = np.frombuffer(colors, dtype=np.int32)
+        if slots.min() < 0:
+            return False
+        return not np.any(slots[fingerprint.src] == slots[fingerprint.dst])
+    if any(color < 0 for color in colors):
+        return False
+    return all(colors[a] != colors[b] for a, b in zip(fingerprint.src, fingerprint.dst))
+
+
+def search_budget(strategy):
+    """
+    Time/node limits a searching strategy (BOUNDED_STRATEGIES) runs with by
+    default; a run that hits them depends on them, so they are part of its key
+    """
+    if strategy == 'exact':
+        from exact_coloring import exact_coloring as search
+    elif strategy == 'portfolio':
+        from portfolio import run_portfolio as search
+    else:
+        return {}
+    parameters = inspect.signature(search).parameters
+    return {name: parameters[name].default for name in ('time_limit', 'node_limit')
+            if name in parameters}
+
+
+def cache_dir_option(args):
+    """
+    Disk tier directory requested on a command line: DIR for "--cache-dir DIR",
+    DEFAULT_CACHE_DIR for a bare "--cache-dir", None (memory only) without it
+    """
+    if '--cache-dir' not in args:
+        return None
+    position = args.index('--cache-dir') + 1
+    if position < len(args) and not args[position].startswith('--'):
+        return args[position]
+    return DEFAULT_CACHE_DIR
+
+
+class ResultCache:
+    """
+    Coloring results keyed by graph fingerprint, strategy and parameters
+    
+    The memory tier keeps the capacity most recently used results. With a
+    directory, results are also written there as small binary files (slots
+    in canonical course order) and the least recently used files are deleted
+    once they take more than max_disk_bytes. Every hit is checked against the
+    graph's edges before it is returned; entries that fail are dropped.
+    color() runs the UNCACHED_STRATEGIES directly, without fingerprinting.
+    """
+    
+    def __init__(self, capacity=32, directory=None, max_disk_bytes=64 * 1024 * 1024):
+        self.capacity = capacity
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.last_hit = False
+        self.disk_bytes = 0
+        if directory is not None:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self.disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            except OSError:
+                # An unusable directory only disables the disk tier
+                self.directory = None
+    
+    @staticmethod
+    def caches(strategy):
+        """Whether color() goes through the cache for strategy"""
+        return strategy not in UNCACHED_STRATEGIES
+    
+    @staticmethod
+    def make_key(fingerprint, strategy, params=None):
+        """Cache key for a fingerprinted graph colored by strategy with params"""
+        text = json.dumps([fingerprint.digest, strategy, params or {}], sort_keys=True)
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=20).hexdigest()
+    
+    def lookup(self, fingerprint, key):
+        """Verified coloring stored under key, or None"""
+        colors = self.memory.get(key)
+        if colors is not None:
+            self.memory.move_to_end(key)
+        else:
+            colors = self._read_disk(key)
+            if colors is not None:
+                self._remember(key, colors)
+        if colors is not None and not _colors_fit(fingerprint, colors):
+            self.rejected += 1
+            self.discard(key)
+            colors = None
+        self.last_hit = colors is not None
+        if colors is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        vertices = fingerprint.vertices
+        return {vertices[i]: colors[r] for r, i in enumerate(fingerprint.order)}
+    
+    def store(self, fingerprint, key, coloring):
+        """Store a (valid) coloring of the fingerprinted graph under key"""
+        vertices = fingerprint.vertices
+        colors = array('i', (coloring[vertices[i]] for i in fingerprint.order))
+        self._remember(key, colors)
+        self._write_disk(key, colors)
+    
+    def get(self, graph, strategy, **params):
+        """Cached coloring of graph for strategy and params, or None"""
+        fingerprint = graph_fingerprint(graph)
+        return self.lookup(fingerprint, self.make_key(fingerprint, strategy, params))
+    
+    def put(self, graph, strategy, coloring, **params):
+        """Cache coloring as the result of strategy with params on graph"""
+        fingerprint = graph_fingerprint(graph)
+        self.store(fingerprint, self.make_key(fingerprint, strategy, params), coloring)
+    
+    def prepare(self, graph, strategy, lower_bound=None):
+        """
+        (fingerprint, key) of a color_graph() call, for lookup() and store()
+        The lower bound and the default search budget are part of the key only
+        for the searching strategies, the only ones whose result they change
+        """
+        params = {}
+        if strategy in BOUNDED_STRATEGIES:
+            params.update(search_budget(strategy))
+            if lower_bound is not None:
+                params['lower_bound'] = lower_bound
+        fingerprint = graph_fingerprint(graph)
+        return fingerprint, self.make_key(fingerprint, strategy, params)
+    
+    def color(self, graph, strategy='greedy', lower_bound=None):
+        """
+        color_graph() through the cache; returns (coloring, valid)
+        Hits are already verified; on a miss the new coloring is validated
+        and stored only if valid. UNCACHED_STRATEGIES are just run and validated.
+        """
+        if not self.caches(strategy):
+            self.last_hit = False
+            coloring = color_graph(graph, strategy, lower_bound)
+            return coloring, validate_coloring(graph, coloring)
+        fingerprint, key = self.prepare(graph, strategy, lower_bound)
+        coloring = self.lookup(fingerprint, key)
+        if coloring is not None:
+            return coloring, True
+        coloring = color_graph(graph, strategy, lower_bound)
+        valid = validate_coloring(graph, coloring)
+        if valid:
+            self.store(fingerprint, key, coloring)
+        return coloring, valid
+    
+    def discard(self, key):
+        """Remove key from both tiers"""
+        self.memory.pop(key, None)
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.disk_bytes -= size
+            except OSError:
+                pass
+    
+    def clear(self):
+        """Remove every entry from both tiers"""
+        self.memory.clear()
+        if self.directory is not None:
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.disk_bytes = 0
+    
+    @property
+    def lookups(self):
+        return self.hits + self.misses
+    
+    @property
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache"""
+        return self.hits / self.lookups if self.lookups else 0.0
+    
+    def summary(self):
+        """One-line hit rate report"""
+        text = (f"hit rate {self.hit_rate:.0%} ({self.hits} of {self.lookups} lookups), "
+                f"{len(self.memory)} in memory")
+        if self.directory is not None:
+            text += f", {self.disk_bytes / 1024:.1f} KB on disk"
+        if self.rejected:
+            text += f", {self.rejected} rejected"
+        return text
+    
+    def __repr__(self):
+        return f"ResultCache({self.summary()})"
+    
+    def _remember(self, key, colors):
+        self.memory[key] = colors
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+    
+    def _disk_entries(self):
+        """(path, size, mtime) of every cache file"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, info.st_size, info.st_mtime))
+        return entries
+    
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Touch the file so disk eviction sees it as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, count = _HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or len(data) != _HEADER.size + 4 * count:
+            return None
+        colors = array('i')
+        colors.frombytes(data[_HEADER.size:])
+        return colors
+    
+    def _write_disk(self, key, colors):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        data = _HEADER.pack(CACHE_MAGIC, len(colors)) + colors.tobytes()
+        temporary = None
+        try:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            # Write to a file of our own, then rename, so readers never see a
+            # partial file and concurrent writers of the same key do not mix
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=key,
+                                             suffix='.tmp', delete=False) as f:
+                temporary = f.name
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if temporary is not None and os.path.exists(temporary):
+                try:
+                    os.remove(temporary)
+                except OSError:
+                    pass
+            return
+        self.disk_bytes += len(data) - old_size
+        if self.disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+    
+    def _evict_disk(self):
+        """Delete the least recently used files until the disk tier fits its size"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.disk_bytes = total
@@ -0,0 +1,389 @@
+"""
+Scheduling Service for Course Scheduling
+Local asyncio HTTP/JSON service that keeps named conflict graphs in memory
+
+Endpoints (JSON bodies and responses, localhost only):
+
+    GET    /graphs                  names, versions and sizes of all graphs
+    GET    /graphs/NAME             version and size of one graph
+    POST   /graphs/NAME/mutate      {"vertices": [...], "edges": [[a, b], [a, b, weight], ...]}
+    POST   /graphs/NAME/schedule    {"strategy": "greedy"}  -> slots, coloring, valid
+    POST   /graphs/NAME/validate    {"coloring": {...}}     -> conflicts, uncolored
+    DELETE /graphs/NAME
+    GET    /stats                   request, coalescing and executor counters
+"""
+
+import asyncio
+import json
+import math
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import unquote
+
+from compact_graph import CompactGraph
+from graph_coloring import STRATEGIES, color_graph, get_color_count, validate_coloring
+from portfolio import graph_snapshot, graph_from_snapshot
+from validation import find_violations
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Graphs with fewer adjacency entries are read and colored on the event loop
+# directly; a round trip to a thread or worker process would cost more
+INLINE_LIMIT = 20000
+
+# Constructive strategies fast enough to run on the event loop for small graphs;
+# searching strategies (exact, portfolio, ...) always run in an executor
+INLINE_STRATEGIES = {'greedy', 'dsatur', 'smallest_last'}
+
+# Strategies that start their own process pools and therefore run in a thread
+SELF_PARALLEL_STRATEGIES = {'portfolio', 'components'}
+
+# Largest accepted request body (a mutation of about two million edges)
+MAX_BODY = 64 * 1024 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large',
+            500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+    """Error returned to the client with an HTTP status"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _content_length(headers):
+    """Body size announced by the Content-Length header, checked against MAX_BODY"""
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise ServiceError(400, "Invalid Content-Length header") from None
+    if length < 0:
+        raise ServiceError(400, "Invalid Content-Length header")
+    if length > MAX_BODY:
+        raise ServiceError(413, f"Request body larger than {MAX_BODY} bytes")
+    return length
+
+
+def _check_course(name):
+    """Course names must be strings (they become JSON object keys in schedules)"""
+    if not isinstance(name, str):
+        raise ServiceError(400, f"Invalid course name {name!r}: use a string")
+
+
+def _color_resident(resident, strategy):
+    """Color a resident graph in place; returns (version, coloring, valid)"""
+    coloring = color_graph(resident.graph, strategy)
+    return resident.version, coloring, validate_coloring(resident.graph, coloring)
+
+
+def _snapshot_resident(resident):
+    """(version, CSR snapshot) of a resident graph"""
+    return resident.version, graph_snapshot(resident.graph)
+
+
+def _color_snapshot(snapshot, strategy):
+    """Worker process: color a graph snapshot; returns (colors bytes, valid)"""
+    graph = graph_from_snapshot(snapshot)
+    coloring = color_graph(graph, strategy)
+    colors = array('i', (coloring[vertex] for vertex in graph.vertices))
+    return colors.tobytes(), validate_coloring(graph, coloring)
+
+
+class ResidentGraph:
+    """A named graph held by the service; version increases with every mutation"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.graph = CompactGraph()
+        self.version = 0
+        # Latest schedule per strategy: strategy -> (version, response)
+        self.schedules = {}
+        # Held by mutations and by reads that may run in a thread, so a
+        # thread never sees the graph change under it
+        self.lock = asyncio.Lock()
+    
+    def info(self):
+        return {'name': self.name, 'version': self.version,
+                'courses': len(self.graph.vertices), 'conflicts': self.graph.edge_count()}
+
+
+class SchedulingService:
+    """
+    Holds named graphs and answers schedule/validate requests
+    
+    Only cheap strategies on small graphs run on the event loop. Other
+    colorings run in a process pool (strategies with their own pools in a
+    thread), and O(E) reads of large graphs (merging pending conflicts,
+    snapshots, validation) in a reader thread, so the event loop keeps
+    serving other requests.
+    Concurrent schedule requests for the same graph version and strategy
+    share one computation, and the result is kept until the graph changes.
+    """
+    
+    def __init__(self, workers=None):
+        self.graphs = {}
+        self.processes = ProcessPoolExecutor(max_workers=workers)
+        self.threads = ThreadPoolExecutor(max_workers=2)
+        self.readers = ThreadPoolExecutor(max_workers=2)
+        # (name, version, strategy) -> future of a schedule being computed
+        self.pending = {}
+        self.counters = {'requests': 0, 'schedules_computed': 0, 'coalesced': 0,
+                         'cached': 0, 'executor_runs': 0, 'mutations': 0}
+    
+    def close(self):
+        self.processes.shutdown(wait=False)
+        self.threads.shutdown(wait=False)
+        self.readers.shutdown(wait=False)
+    
+    def _graph(self, name, create=False):
+        resident = self.graphs.get(name)
+        if resident is None:
+            if not create:
+                raise ServiceError(404, f"No graph named {name!r}")
+            resident = self.graphs[name] = ResidentGraph(name)
+        return resident
+    
+    async def _read(self, resident, function, *args):
+        """
+        function(*args) on a resident graph while no mutation can change it;
+        in a reader thread once the graph is large
+        """
+        async with resident.lock:
+            if resident.graph.size_hint() < INLINE_LIMIT:
+                return function(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.readers, function, *args)
+    
+    async def info(self, name):
+        resident = self._graph(name)
+        return await self._read(resident, resident.info)
+    
+    async def mutate(self, name, body):
+        """Apply a batch of added courses and conflicts in one step"""
+        resident = self._graph(name, create=True)
+        graph = resident.graph
+        vertices = body.get('vertices', [])
+        edges = body.get('edges', [])
+        if not isinstance(vertices, list) or not isinstance(edges, list):
+            raise ServiceError(400, "'vertices' and 'edges' must be lists")
+        # Check the whole batch first so a bad course or edge leaves the graph unchanged
+        for vertex in vertices:
+            _check_course(vertex)
+        plain = []
+        weighted = []
+        for edge in edges:
+            if not isinstance(edge, list) or len(edge) not in (2, 3):
+                raise ServiceError(400, f"Invalid edge {edge!r}: use [a, b] or [a, b, weight]")
+            _check_course(edge[0])
+            _check_course(edge[1])
+            if edge[0] == edge[1]:
+                raise ServiceError(400, f"Invalid edge {edge!r}: a course cannot conflict "
+                                        f"with itself")
+            if len(edge) == 3:
+                weight = edge[2]
+                if (not isinstance(weight, (int, float)) or isinstance(weight, bool)
+                        or not math.isfinite(weight) or weight <= 0):
+                    raise ServiceError(400, f"Invalid weight in {edge!r}: use a positive number")
+                weighted.append(edge)
+            else:
+                plain.append(edge)
+        async with resident.lock:
+            graph.add_vertices(vertices)
+            graph.add_edges(plain)
+            graph.add_weighted_edges(weighted)
+            if vertices or edges:
+                resident.version += 1
+                self.counters['mutations'] += 1
+        return {'name': name, 'version': resident.version,
+                'added_vertices': len(vertices), 'added_edges': len(edges)}
+    
+    async def schedule(self, name, body):
+        """Color the current version of a graph, sharing work with identical requests"""
+        resident = self._graph(name)
+        strategy = body.get('strategy', 'greedy')
+        if strategy not in STRATEGIES:
+            raise ServiceError(400, f"Unknown coloring strategy: {strategy}")
+        version = resident.version
+        cached = resident.schedules.get(strategy)
+        if cached is not None and cached[0] == version:
+            self.counters['cached'] += 1
+            return cached[1]
+        
+        key = (name, version, strategy)
+        future = self.pending.get(key)
+        if future is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(future)
+        future = self.pending[key] = asyncio.ensure_future(
+            self._compute_schedule(resident, strategy))
+        # The computation outlives a cancelled first requester (shield), and its
+        # entry is removed when it ends, whoever is still waiting for it
+        future.add_done_callback(lambda done: self._finish_pending(key, done))
+        return await asyncio.shield(future)
+    
+    def _finish_pending(self, key, future):
+        try:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+        finally:
+            if not future.cancelled():
+                # Mark the error as retrieved when every waiter has gone
+                future.exception()
+    
+    async def _compute_schedule(self, resident, strategy):
+        start = time.perf_counter()
+        if strategy in INLINE_STRATEGIES and resident.graph.size_hint() < INLINE_LIMIT:
+            version, coloring, valid = await self._read(resident, _color_resident,
+                                                        resident, strategy)
+        else:
+            # The snapshot freezes this version; later mutations do not affect the run
+            version, snapshot = await self._read(resident, _snapshot_resident, resident)
+            executor = (self.threads if strategy in SELF_PARALLEL_STRATEGIES
+                        else self.processes)
+            self.counters['executor_runs'] += 1
+            loop = asyncio.get_event_loop()
+            colors_bytes, valid = await loop.run_in_executor(
+                executor, _color_snapshot, snapshot, strategy)
+            colors = array('i')
+            colors.frombytes(colors_bytes)
+            coloring = dict(zip(snapshot[0], colors))
+        self.counters['schedules_computed'] += 1
+        response = {'name': resident.name, 'version': version, 'strategy': strategy,
+                    'slots': get_color_count(coloring), 'valid': valid,
+                    'elapsed': time.perf_counter() - start, 'coloring': coloring}
+        if resident.version == version:
+            resident.schedules[strategy] = (version, response)
+        return response
+    
+    async def validate(self, name, body):
+        """Check a client-supplied schedule against the current graph"""
+        resident = self._graph(name)
+        coloring = body.get('coloring')
+        if not isinstance(coloring, dict):
+            raise ServiceError(400, "'coloring' must be an object of course -> slot")
+        report = await self._read(resident, find_violations, resident.graph, coloring)
+        return {'name': name, 'version': resident.version, 'valid': report.valid,
+                'conflicts': report.conflicts, 'uncolored': report.uncolored}
+    
+    async def handle(self, method, path, body):
+        """Route one request; returns (status, response dict)"""
+        self.counters['requests'] += 1
+        parts = [unquote(part) for part in path.split('?')[0].strip('/').split('/')]
+        if parts == ['stats']:
+            return 200, dict(self.counters, graphs=len(self.graphs))
+        if not parts or parts[0] != 'graphs':
+            raise ServiceError(404, f"Unknown path {path}")
+        if len(parts) == 1:
+            return 200, {'graphs': [await self._read(resident, resident.info)
+                                    for resident in list(self.graphs.values())]}
+        name = parts[1]
+        action = parts[2] if len(parts) > 2 else None
+        if action is None:
+            if method == 'GET':
+                return 200, await self.info(name)
+            if method == 'DELETE':
+                self._graph(name)
+                del self.graphs[name]
+                return 200, {'deleted': name}
+        elif method == 'POST':
+            if action == 'mutate':
+                return 200, await self.mutate(name, body)
+            if action == 'schedule':
+                return 200, await self.schedule(name, body)
+            if action == 'validate':
+                return 200, await self.validate(name, body)
+        raise ServiceError(405, f"{method} not supported on {path}")
+    
+    async def serve_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                
+                raw = None
+                try:
+                    length = _content_length(headers)
+                    raw = await reader.readexactly(length) if length else b''
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise ServiceError(400, "Request body must be a JSON object")
+                    status, response = await self.handle(method, path, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except ServiceError as e:
+                    status, response = e.status, {'error': str(e)}
+                except ValueError as e:
+                    status, response = 400, {'error': str(e)}
+                except Exception as e:
+                    status, response = 500, {'error': f"{type(e).__name__}: {e}"}
+                
+                # A rejected body was not read, so the connection cannot be reused
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1' and raw is not None)
+                payload = json.dumps(response).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                             f"\r\n".encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_service(port=DEFAULT_PORT, workers=None, ready=None):
+    """Serve on localhost until cancelled; ready(port) is called once listening"""
+    service = SchedulingService(workers)
+    server = await asyncio.start_server(service.serve_connection, HOST, port)
+    port = server.sockets[0].getsockname()[1]
+    if ready is not None:
+        ready(port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(args=None):
+    """
+    Run the scheduling service on localhost
+    Usage: python service.py [--port 8765] [--workers N]
+    """
+    if args is None:
+        args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+    try:
+        asyncio.run(run_service(port, workers,
+                                ready=lambda p: print(f"Serving on http://{HOST}:{p}",
+                                                      flush=True)))
+    except KeyboardInterrupt:
+        print("Stopped")
+
+
+if __name__ == "__main__":
+    main()
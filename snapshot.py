@@ -0,0 +1,154 @@
+"""
+Snapshot Module for Course Scheduling
+Versioned binary save/load of a conflict graph and its schedule
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from compact_graph import CompactGraph
+
+# File layout (little-endian), every section starting on an 8-byte boundary:
+#   header   magic, version, flags, course count n, CSR entry count m, name bytes
+#   names    UTF-8 course names separated by NUL bytes
+#   offsets  n + 1 int64 CSR row offsets
+#   indices  m int32 neighbor ids
+#   weights  m float64 edge weights            (FLAG_WEIGHTS)
+#   colors   n int32 time slots, -1 = unscheduled  (FLAG_COLORING)
+SNAPSHOT_MAGIC = b'CSCHEDSN'
+SNAPSHOT_VERSION = 1
+FLAG_WEIGHTS = 1
+FLAG_COLORING = 2
+FLAG_INT_NAMES = 4
+_HEADER = struct.Struct('<8sIIQQQ')
+
+
+class SnapshotError(Exception):
+    """Raised when a file is not a snapshot or has an unsupported version"""
+
+
+def save_snapshot(path, graph, coloring=None):
+    """
+    Write the graph (any backend) and optionally its coloring to path
+    Course names are stored as text; integer names are restored as integers.
+    Names must be all strings or all integers (e.g. a DIMACS graph), since a
+    mix such as 1 and "1" could not be told apart when loading
+    """
+    flags = 0
+    if graph.vertices and all(type(vertex) is int for vertex in graph.vertices):
+        flags |= FLAG_INT_NAMES
+    else:
+        for vertex in graph.vertices:
+            if type(vertex) is not str:
+                raise ValueError(f"Cannot save course name {vertex!r} "
+                                 f"({type(vertex).__name__}): snapshots need all course "
+                                 f"names to be strings, or all to be integers")
+    
+    compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+    offsets, indices = compact.to_csr()
+    vertices = compact.vertices
+    names = [str(vertex) for vertex in vertices]
+    if any('\0' in name for name in names):
+        raise ValueError("Course names must not contain NUL characters")
+    name_blob = '\0'.join(names).encode('utf-8')
+    
+    weights = compact.weights
+    if weights is not None and all(weight == 1 for weight in weights):
+        weights = None
+    if weights is not None:
+        flags |= FLAG_WEIGHTS
+    if coloring is not None:
+        flags |= FLAG_COLORING
+        colors = array('i', (coloring.get(vertex, -1) for vertex in vertices))
+    
+    sections = [name_blob, offsets, indices]
+    if weights is not None:
+        sections.append(weights)
+    if coloring is not None:
+        sections.append(colors)
+    
+    # Write to a temporary file first so an interrupted save keeps the old snapshot
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags,
+                             len(vertices), len(indices), len(name_blob)))
+        for section in sections:
+            if sys.byteorder != 'little' and not isinstance(section, bytes):
+                section = array(section.typecode if isinstance(section, array)
+                                else section.format, section)
+                section.byteswap()
+            data = memoryview(section).cast('B')
+            f.write(data)
+            f.write(b'\0' * (-len(data) % 8))
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path):
+    """
+    Memory-map a snapshot and return (graph, coloring)
+    
+    The graph is a CompactGraph whose CSR arrays are read-only views of the
+    mapped file, so opening a large graph costs little more than decoding the
+    course names, and processes loading the same file share its pages. The
+    arrays are copied the first time the graph is modified. coloring is None
+    if the snapshot holds no schedule.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise SnapshotError(f"{path} is not a course schedule snapshot")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, flags, n, m, name_bytes = _HEADER.unpack_from(buffer)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{path} is not a course schedule snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} in {path}")
+    
+    lengths = [name_bytes, (n + 1) * 8, m * 4]
+    if flags & FLAG_WEIGHTS:
+        lengths.append(m * 8)
+    if flags & FLAG_COLORING:
+        lengths.append(n * 4)
+    if _HEADER.size + sum(length + (-length % 8) for length in lengths[:-1]) \
+            + lengths[-1] > size:
+        raise SnapshotError(f"{path} is truncated")
+    
+    view = memoryview(buffer)
+    position = _HEADER.size
+    
+    def section(length, typecode):
+        """Next section of the file as a zero-copy view"""
+        nonlocal position
+        data = view[position:position + length]
+        position += length + (-length % 8)
+        if typecode is None:
+            return data
+        values = data.cast(typecode)
+        if sys.byteorder != 'little':
+            values = array(typecode, values)
+            values.byteswap()
+        return values
+    
+    names = bytes(section(name_bytes, None)).decode('utf-8').split('\0') if n else []
+    if flags & FLAG_INT_NAMES:
+        names = [int(name) for name in names]
+    offsets = section((n + 1) * 8, 'q')
+    indices = section(m * 4, 'i')
+    weights = section(m * 8, 'd') if flags & FLAG_WEIGHTS else None
+    colors = section(n * 4, 'i') if flags & FLAG_COLORING else None
+    
+    graph = CompactGraph()
+    graph.vertices = names
+    graph.index = {name: i for i, name in enumerate(names)}
+    graph.offsets, graph.indices, graph.weights = offsets, indices, weights
+    if weights is not None:
+        graph._enable_weights()
+    
+    coloring = None
+    if colors is not None:
+        coloring = {name: color for name, color in zip(names, colors) if color >= 0}
+    return graph, coloring
+
@@ -0,0 +1,214 @@
+"""
+Soft Conflicts Module for Course Scheduling
+Fits a schedule into a fixed number of time slots, minimizing weighted clashes
+"""
+
+import math
+import random
+import time
+
+from compact_graph import to_csr
+from graph_coloring import dsatur_coloring, get_color_count
+
+
+class SoftConflictResult:
+    """Best assignment found for a fixed number of slots and its remaining clashes"""
+    
+    def __init__(self, coloring, slots, clashes, stats):
+        self.coloring = coloring
+        self.slots = slots
+        # (course1, course2, weight) for every conflict inside one slot, heaviest first
+        self.clashes = clashes
+        self.stats = stats
+    
+    @property
+    def color_count(self):
+        """Number of colors (time slots) in use"""
+        return get_color_count(self.coloring)
+    
+    @property
+    def total_weight(self):
+        """Total weight of the remaining clashes (students with two exams at once)"""
+        return sum(weight for _, _, weight in self.clashes)
+    
+    def clash_report(self, limit=20):
+        """Text listing the remaining clashes by course pair, heaviest first"""
+        if not self.clashes:
+            return f"No clashes: every conflict fits into {self.slots} time slots"
+        lines = [f"{len(self.clashes)} clashing course pairs, total weight "
+                 f"{self.total_weight:g}:"]
+        lines.extend(f"  {course1} <-> {course2}: {weight:g} (slot {self.coloring[course1]})"
+                     for course1, course2, weight in self.clashes[:limit])
+        if len(self.clashes) > limit:
+            lines.append(f"  ... and {len(self.clashes) - limit} more")
+        return '\n'.join(lines)
+    
+    def __repr__(self):
+        return (f"SoftConflictResult({self.slots} slots, {len(self.clashes)} clashes, "
+                f"weight {self.total_weight:g}, {self.stats['iterations']} iterations)")
+
+
+def minimize_conflicts(graph, slots, coloring=None, time_limit=5.0, max_iterations=None,
+                       temperature=None, cooling=0.999, seed=0, callback=None,
+                       report_every=10000, stop=None):
+    """
+    Assign every course one of a fixed number of slots with the least total
+    weight of conflicts inside a slot (simulated annealing on min-conflicts moves)
+    
+    Starts from coloring (DSatur by default); courses in slots >= slots move
+    to the slot where they clash least. If that already has no clashes it is
+    returned at once. Otherwise each step picks a random clashing course and
+    a random other slot. A table with the total conflict weight of every
+    course towards every slot scores the move in O(1); improving moves are
+    always made, worse ones with probability exp(-delta / T). T starts at
+    temperature (the mean conflict weight by default) and is multiplied by
+    cooling every 100 steps. A move updates the table in O(degree).
+    
+    Stops when no clashes are left, after time_limit seconds or max_iterations
+    steps, or once stop (e.g. a threading.Event) is set. callback(clash_weight)
+    reports progress every report_every steps.
+    Returns a SoftConflictResult with the best assignment seen.
+    """
+    if slots < 1:
+        raise ValueError("At least one time slot is needed")
+    start_time = time.perf_counter()
+    vertices, offsets, indices = to_csr(graph)
+    n = len(vertices)
+    k = slots
+    stats = {'iterations': 0, 'accepted': 0, 'elapsed': 0.0, 'initial_weight': 0,
+             'stopped': 'no clashes'}
+    
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    neighbors = [[] for _ in range(n)]
+    for i, vertex in enumerate(vertices):
+        for neighbor, weight in graph.get_weighted_neighbors(vertex):
+            j = index[neighbor]
+            if j != i:
+                neighbors[i].append((j, weight))
+    
+    if coloring is None:
+        coloring = dsatur_coloring(graph)
+    colors = _fold_colors([coloring.get(vertex, k) for vertex in vertices], neighbors, k)
+    
+    # gamma[v * k + c] = total weight of v's conflicts with courses in slot c
+    gamma = [0] * (n * k)
+    for v in range(n):
+        base = v * k
+        for u, weight in neighbors[v]:
+            gamma[base + colors[u]] += weight
+    total = sum(gamma[v * k + colors[v]] for v in range(n)) / 2
+    stats['initial_weight'] = total
+    
+    # Clashing courses in a list with positions, for O(1) random choice and removal
+    clashing = [v for v in range(n) if gamma[v * k + colors[v]]]
+    position = {v: p for p, v in enumerate(clashing)}
+    
+    def mark(v):
+        """Add v to or remove it from the clashing list after its table changed"""
+        if gamma[v * k + colors[v]]:
+            if v not in position:
+                position[v] = len(clashing)
+                clashing.append(v)
+        elif v in position:
+            last = clashing.pop()
+            p = position.pop(v)
+            if last != v:
+                clashing[p] = last
+                position[last] = p
+    
+    if temperature is None:
+        weights = [weight for v in range(n) for _, weight in neighbors[v]]
+        temperature = sum(weights) / len(weights) if weights else 1.0
+    deadline = start_time + time_limit if time_limit is not None else None
+    rng = random.Random(seed)
+    
+    # Moves made since the best assignment, undone at the end to restore it;
+    # once longer than n, the best assignment is copied out instead
+    best_total = total
+    best_colors = None
+    journal = []
+    iteration = 0
+    
+    while clashing and k > 1:
+        if max_iterations is not None and iteration >= max_iterations:
+            stats['stopped'] = 'iteration limit'
+            break
+        if iteration & 255 == 0 and deadline is not None and time.perf_counter() > deadline:
+            stats['stopped'] = 'time limit'
+            break
+        if iteration & 255 == 0 and stop is not None and stop.is_set():
+            stats['stopped'] = 'cancelled'
+            break
+        iteration += 1
+        if iteration % 100 == 0:
+            temperature *= cooling
+        if callback is not None and iteration % report_every == 0:
+            callback(total)
+        
+        v = clashing[rng.randrange(len(clashing))]
+        old = colors[v]
+        new = rng.randrange(k - 1)
+        if new >= old:
+            new += 1
+        base = v * k
+        delta = gamma[base + new] - gamma[base + old]
+        if delta > 0 and (temperature <= 0 or
+                          rng.random() >= math.exp(-delta / temperature)):
+            continue
+        
+        stats['accepted'] += 1
+        colors[v] = new
+        total += delta
+        for u, weight in neighbors[v]:
+            gamma[u * k + old] -= weight
+            gamma[u * k + new] += weight
+            if colors[u] == old or colors[u] == new:
+                mark(u)
+        mark(v)
+        
+        if total < best_total:
+            best_total = total
+            best_colors = None
+            journal.clear()
+        elif best_colors is None:
+            journal.append((v, old))
+            if len(journal) > n:
+                best_colors = list(colors)
+                for u, color in reversed(journal):
+                    best_colors[u] = color
+                journal.clear()
+    
+    if clashing and k == 1:
+        stats['stopped'] = 'single slot'
+    if best_colors is None:
+        best_colors = colors
+        for u, color in reversed(journal):
+            best_colors[u] = color
+    
+    stats['iterations'] = iteration
+    stats['elapsed'] = time.perf_counter() - start_time
+    result = dict(zip(vertices, best_colors))
+    clashes = sorted(((vertices[v], vertices[u], weight)
+                      for v in range(n) for u, weight in neighbors[v]
+                      if v < u and best_colors[u] == best_colors[v]),
+                     key=lambda clash: clash[2], reverse=True)
+    return SoftConflictResult(result, k, clashes, stats)
+
+
+def _fold_colors(colors, neighbors, k):
+    """
+    Move courses in slots >= k (or without a slot) into the slot 0..k-1 with
+    the least conflict weight among their already placed neighbors
+    """
+    for v, color in enumerate(colors):
+        if color >= k:
+            colors[v] = -1
+    for v, color in enumerate(colors):
+        if color >= 0:
+            continue
+        weights = [0] * k
+        for u, weight in neighbors[v]:
+            if colors[u] >= 0:
+                weights[colors[u]] += weight
+        colors[v] = min(range(k), key=weights.__getitem__)
+    return colors
@@ -0,0 +1,170 @@
+"""
+Tabu Search Module for Course Scheduling
+TabuCol local search that tries to remove time slots from a valid schedule
+"""
+
+import random
+import time
+
+from compact_graph import to_csr
+from graph_coloring import get_color_count
+
+
+class TabuResult:
+    """Outcome of a tabu search improvement run"""
+    
+    def __init__(self, coloring, initial_colors, stats):
+        self.coloring = coloring
+        self.initial_colors = initial_colors
+        self.stats = stats
+    
+    @property
+    def color_count(self):
+        """Number of colors (time slots) in the best coloring found"""
+        return get_color_count(self.coloring)
+    
+    def __repr__(self):
+        return (f"TabuResult({self.initial_colors} -> {self.color_count} colors, "
+                f"{self.stats['iterations']} iterations, stopped: {self.stats['stopped']})")
+
+
+def tabu_improve(graph, coloring, time_limit=5.0, max_iterations=None, min_colors=1,
+                 seed=0, callback=None, report_every=1000, on_improvement=None, stop=None):
+    """
+    Try to color the graph with fewer colors, starting from a valid coloring
+    
+    Repeatedly drops the smallest color class, moves its courses to the color
+    where they clash least, and repairs the remaining clashes with TabuCol
+    moves: each step recolors one clashing course to the color with the best
+    change in clashes, and forbids moving it back for a few iterations. A table
+    of neighbor counts per (course, color) gives every move's delta in O(1)
+    and is updated in O(degree) when a move is made.
+    
+    Stops at min_colors, after time_limit seconds or max_iterations moves.
+    callback(k, conflicts) reports progress: the color count being tried and
+    the clashes left; on_improvement(coloring, k) receives every valid
+    coloring with fewer colors. stop (e.g. a threading.Event) ends the search
+    early once it is set. Returns a TabuResult holding the best valid coloring.
+    """
+    start_time = time.perf_counter()
+    vertices, offsets, indices = to_csr(graph)
+    n = len(vertices)
+    initial_colors = get_color_count(coloring)
+    stats = {'iterations': 0, 'elapsed': 0.0, 'attempts': 0, 'stopped': 'min colors'}
+    if n == 0:
+        return TabuResult({}, 0, stats)
+    
+    neighbors = [[j for j in indices[offsets[i]:offsets[i + 1]] if j != i] for i in range(n)]
+    best_colors = [coloring[vertex] for vertex in vertices]
+    deadline = start_time + time_limit if time_limit is not None else None
+    rng = random.Random(seed)
+    iteration = 0
+    
+    k = initial_colors - 1
+    while k >= min_colors:
+        stats['attempts'] += 1
+        colors = _drop_color_class(best_colors, neighbors, k + 1)
+        
+        # gamma[v * k + c] = number of neighbors of v with color c
+        gamma = [0] * (n * k)
+        for v in range(n):
+            base = v * k
+            for u in neighbors[v]:
+                gamma[base + colors[u]] += 1
+        conflicting = {v for v in range(n) if gamma[v * k + colors[v]]}
+        conflicts = sum(gamma[v * k + colors[v]] for v in conflicting) // 2
+        tabu = [0] * (n * k)
+        fewest = conflicts
+        if callback is not None:
+            callback(k, conflicts)
+        
+        while conflicts:
+            if max_iterations is not None and iteration >= max_iterations:
+                stats['stopped'] = 'iteration limit'
+                break
+            if deadline is not None and iteration & 63 == 0 and time.perf_counter() > deadline:
+                stats['stopped'] = 'time limit'
+                break
+            if stop is not None and iteration & 63 == 0 and stop.is_set():
+                stats['stopped'] = 'cancelled'
+                break
+            iteration += 1
+            
+            # Best non-tabu move among the clashing courses; a tabu move is
+            # allowed when it leads to fewer clashes than ever seen (aspiration)
+            best_delta, moves = None, []
+            for v in conflicting:
+                base = v * k
+                own = gamma[base + colors[v]]
+                for c in range(k):
+                    if c == colors[v]:
+                        continue
+                    delta = gamma[base + c] - own
+                    if tabu[base + c] > iteration and conflicts + delta >= fewest:
+                        continue
+                    if best_delta is None or delta < best_delta:
+                        best_delta, moves = delta, [(v, c)]
+                    elif delta == best_delta:
+                        moves.append((v, c))
+            if not moves:
+                continue
+            v, new = moves[rng.randrange(len(moves))] if len(moves) > 1 else moves[0]
+            
+            # Apply the move, touching only v's neighbors
+            old = colors[v]
+            colors[v] = new
+            conflicts += best_delta
+            fewest = min(fewest, conflicts)
+            tabu[v * k + old] = iteration + int(0.6 * len(conflicting)) + rng.randrange(10)
+            for u in neighbors[v]:
+                base = u * k
+                gamma[base + old] -= 1
+                gamma[base + new] += 1
+                if colors[u] == old and gamma[base + old] == 0:
+                    conflicting.discard(u)
+                elif colors[u] == new and gamma[base + new] == 1:
+                    conflicting.add(u)
+            if gamma[v * k + new]:
+                conflicting.add(v)
+            else:
+                conflicting.discard(v)
+            
+            if callback is not None and iteration % report_every == 0:
+                callback(k, conflicts)
+        
+        if conflicts:
+            break
+        best_colors = colors
+        if callback is not None:
+            callback(k, 0)
+        if on_improvement is not None:
+            on_improvement(dict(zip(vertices, best_colors)), k)
+        k -= 1
+    
+    stats['iterations'] = iteration
+    stats['elapsed'] = time.perf_counter() - start_time
+    return TabuResult(dict(zip(vertices, best_colors)), initial_colors, stats)
+
+
+def _drop_color_class(colors, neighbors, k):
+    """
+    Remove the smallest of k color classes and renumber the rest to 0..k-2
+    Courses of the removed class take the color used least among their neighbors
+    """
+    sizes = [0] * k
+    for color in colors:
+        sizes[color] += 1
+    dropped = min(range(k), key=sizes.__getitem__)
+    relabel = [c if c < dropped else c - 1 for c in range(k)]
+    relabel[dropped] = -1
+    new_colors = [relabel[color] for color in colors]
+    
+    for v, color in enumerate(new_colors):
+        if color >= 0:
+            continue
+        counts = [0] * (k - 1)
+        for u in neighbors[v]:
+            if new_colors[u] >= 0:
+                counts[new_colors[u]] += 1
+        new_colors[v] = min(range(k - 1), key=counts.__getitem__)
+    return new_colors
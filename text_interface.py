@@ -2,15 +2,42 @@
 Text-based interface for Course Scheduler
 """
 
-from graph_coloring import Graph, greedy_coloring, get_color_count, validate_coloring
+import sys
+from datetime import datetime
+
+from graph_coloring import (Graph, STRATEGIES, BOUNDED_STRATEGIES, get_color_count,
+                            validate_coloring)
+from enrollment import ConflictGraphBuilder, read_enrollments
+from incremental import IncrementalColoring
+from tabu_search import tabu_improve
+from snapshot import SnapshotError, load_snapshot, save_snapshot
+from export import SlotCalendar, export_schedule
+from instrumentation import instrumented_coloring
+from validation import find_violations
+from lower_bounds import compute_lower_bound, format_gap
+from capacity import capacity_coloring, capacity_lower_bound, fill_report
+from soft_conflicts import minimize_conflicts
+from result_cache import ResultCache, cache_dir_option
 
 
 class CourseSchedulerText:
     """Text-based interface for course scheduling"""
     
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.graph = Graph()
         self.coloring = {}
+        self.strategy = 'greedy'
+        self.show_stats = False
+        # Maximum courses (or enrolled students) per time slot; None = unlimited
+        self.capacity = None
+        self.capacity_by_students = False
+        # Enrolled students per course, from imported enrollment files
+        self.course_sizes = {}
+        # Set once a schedule exists, so later changes only repair affected courses
+        self.incremental = None
+        # Colorings of graphs seen before; kept on disk across sessions only
+        # when a cache directory is given (--cache-dir)
+        self.cache = ResultCache(directory=cache_dir)
     
     def display_menu(self):
         """Display the main menu"""
@@ -24,6 +51,14 @@ class CourseSchedulerText:
         print("5. Generate schedule (Graph Coloring)")
         print("6. View schedule")
         print("7. Clear all data")
+        print("8. Import enrollment file (CSV/JSONL)")
+        print(f"9. Choose coloring strategy (current: {self.strategy})")
+        print("10. Save courses and schedule to a snapshot file")
+        print("11. Load a snapshot file")
+        print("12. Export schedule (CSV/JSONL/ICS)")
+        print(f"13. Toggle coloring statistics (current: {'on' if self.show_stats else 'off'})")
+        print(f"14. Set slot capacity (current: {self._capacity_text()})")
+        print("15. Fit schedule into a fixed number of time slots")
         print("0. Exit")
         print("="*50)
     
@@ -31,8 +66,13 @@ class CourseSchedulerText:
         """Add a new course"""
         course = input("Enter course name: ").strip()
         if course:
-            self.graph.add_vertex(course)
+            if self.incremental is not None:
+                moves = self.incremental.add_vertex(course)
+            else:
+                self.graph.add_vertex(course)
+                moves = []
             print(f"Course '{course}' added successfully!")
+            self._report_moves(moves)
         else:
             print("Invalid course name!")
     
@@ -57,13 +97,116 @@ class CourseSchedulerText:
                 if course1 == course2:
                     print("A course cannot conflict with itself!")
                 else:
-                    self.graph.add_edge(course1, course2)
+                    if self.incremental is not None:
+                        moves = self.incremental.add_edge(course1, course2)
+                    else:
+                        self.graph.add_edge(course1, course2)
+                        moves = []
                     print(f"Conflict added between '{course1}' and '{course2}'")
+                    self._report_moves(moves)
             else:
                 print("Invalid course numbers!")
         except ValueError:
             print("Invalid input! Please enter numbers.")
     
+    def import_enrollments(self):
+        """Import courses and conflicts from a student enrollment file"""
+        path = input("Enter enrollment file path (CSV or JSONL): ").strip()
+        if not path:
+            print("Invalid file path!")
+            return
+        
+        builder = ConflictGraphBuilder()
+        try:
+            builder.add_records(read_enrollments(path))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not import enrollments: {e}")
+            return
+        
+        builder.build(self.graph)
+        for course, students in builder.course_sizes().items():
+            self.course_sizes[course] = self.course_sizes.get(course, 0) + students
+        print(f"Imported {builder.summary()}")
+        if self.incremental is not None:
+            self._report_moves(self.incremental.repair())
+    
+    def save_data(self):
+        """Save courses, conflicts and the schedule to a binary snapshot"""
+        path = input("Enter snapshot file path to save: ").strip()
+        if not path:
+            print("Invalid file path!")
+            return
+        
+        try:
+            save_snapshot(path, self.graph, self.coloring or None)
+        except (OSError, ValueError) as e:
+            print(f"Could not save snapshot: {e}")
+            return
+        print(f"Saved {len(self.graph.vertices)} courses"
+              f"{' and the schedule' if self.coloring else ''} to {path}")
+    
+    def load_data(self):
+        """Load courses, conflicts and the schedule from a binary snapshot"""
+        path = input("Enter snapshot file path to load: ").strip()
+        if not path:
+            print("Invalid file path!")
+            return
+        
+        try:
+            graph, coloring = load_snapshot(path)
+        except (OSError, SnapshotError) as e:
+            print(f"Could not load snapshot: {e}")
+            return
+        
+        self.graph = graph
+        if coloring and validate_coloring(graph, coloring):
+            self.coloring = coloring
+            self.incremental = IncrementalColoring(graph, coloring)
+        else:
+            self.coloring = {}
+            self.incremental = None
+        print(f"Loaded {len(graph.vertices)} courses"
+              f"{' and the schedule' if self.coloring else ''} from {path}")
+    
+    def export_data(self):
+        """Export the schedule with time slots mapped to dates and times"""
+        if not self.coloring:
+            print("Please generate schedule first!")
+            return
+        
+        path = input("Enter export file path (.csv, .jsonl or .ics): ").strip()
+        if not path:
+            print("Invalid file path!")
+            return
+        
+        try:
+            start = input("First day (YYYY-MM-DD, Enter for today): ").strip()
+            start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+            per_day = input("Time slots per day (Enter for 4): ").strip()
+            minutes = input("Slot length in minutes (Enter for 90): ").strip()
+            calendar = SlotCalendar(start_date,
+                                    slot_minutes=int(minutes) if minutes else 90,
+                                    slots_per_day=int(per_day) if per_day else 4)
+            count = export_schedule(path, self.coloring, calendar)
+        except (OSError, ValueError) as e:
+            print(f"Could not export schedule: {e}")
+            return
+        print(f"Exported {count} courses to {path}")
+    
+    def _report_moves(self, moves, limit=20):
+        """Print the courses moved by an incremental schedule update"""
+        if not moves:
+            return
+        print(f"Schedule updated: {len(moves)} course move(s), "
+              f"{self.incremental.slot_count} time slots in use")
+        for course, old_slot, new_slot in moves[:limit]:
+            if old_slot is None:
+                print(f"  {course}: scheduled in slot {new_slot}")
+            else:
+                print(f"  {course}: slot {old_slot} -> slot {new_slot}")
+        if len(moves) > limit:
+            print(f"  ... and {len(moves) - limit} more")
+    
     def view_courses(self):
         """Display all courses"""
         if not self.graph.vertices:
@@ -100,15 +243,161 @@ class CourseSchedulerText:
         if not self.graph.vertices:
             print("Please add courses first!")
             return
+        if self.capacity:
+            self.generate_capacity_schedule()
+            return
+        
+        # Searching strategies get the bound up front so they can stop at it
+        bound = None
+        if self.strategy in BOUNDED_STRATEGIES:
+            bound = compute_lower_bound(self.graph, time_limit=0.5)
+        lower_bound = bound.value if bound is not None else None
         
-        self.coloring = greedy_coloring(self.graph)
+        stats = None
+        if self.show_stats:
+            self.coloring, stats = instrumented_coloring(self.graph, self.strategy,
+                                                         lower_bound=lower_bound)
+            valid = stats.valid
+        else:
+            # A cache hit is checked against the conflicts before it is returned
+            self.coloring, valid = self.cache.color(self.graph, self.strategy, lower_bound)
         
-        if validate_coloring(self.graph, self.coloring):
+        if valid:
             color_count = get_color_count(self.coloring)
+            if bound is None:
+                bound = compute_lower_bound(self.graph, time_limit=0.5, target=color_count)
             print(f"\nSchedule generated successfully!")
+            print(f"Strategy: {self.strategy}")
+            if stats is None and self.cache.caches(self.strategy):
+                print(f"Result cache: {'hit' if self.cache.last_hit else 'miss'} "
+                      f"({self.cache.summary()})")
             print(f"Number of time slots used: {color_count}")
+            print(f"Time slots used / lower bound: {format_gap(color_count, bound.value)}")
+            if stats is not None:
+                print("\nColoring statistics:")
+                for line in stats.summary().splitlines():
+                    print(f"  {line}")
+            if color_count > bound.value:
+                answer = input("Try to use fewer time slots with tabu search? (y/n): ")
+                if answer.strip().lower() == 'y':
+                    self.optimize_schedule(min_colors=bound.value)
+                    print(f"Time slots used / lower bound: "
+                          f"{format_gap(get_color_count(self.coloring), bound.value)}")
+            else:
+                print("The schedule uses the minimum possible number of time slots.")
+            self.incremental = IncrementalColoring(self.graph, self.coloring)
         else:
+            self.incremental = None
+            print("Error: Invalid coloring generated!")
+            print(find_violations(self.graph, self.coloring).summary())
+    
+    def generate_capacity_schedule(self):
+        """Generate a schedule that keeps every time slot within the capacity"""
+        sizes = self.course_sizes if self.capacity_by_students else None
+        try:
+            self.coloring = capacity_coloring(self.graph, self.capacity, sizes)
+        except ValueError as e:
+            print(f"Could not schedule within the slot capacity: {e}")
+            return
+        
+        # Capacity changes are not repaired incrementally; generate again instead
+        self.incremental = None
+        if not validate_coloring(self.graph, self.coloring):
             print("Error: Invalid coloring generated!")
+            print(find_violations(self.graph, self.coloring).summary())
+            return
+        color_count = get_color_count(self.coloring)
+        bound = max(compute_lower_bound(self.graph, time_limit=0.5, target=color_count).value,
+                    capacity_lower_bound(self.graph, self.capacity, sizes))
+        print(f"\nSchedule generated successfully!")
+        print(f"Slot capacity: {self._capacity_text()}")
+        print(f"Number of time slots used: {color_count}")
+        print(f"Time slots used / lower bound: {format_gap(color_count, bound)}")
+        print("\nSlot fill levels:")
+        for line in fill_report(self.coloring, self.capacity, sizes).splitlines():
+            print(f"  {line}")
+    
+    def fit_to_slots(self, time_limit=5.0):
+        """Schedule into a given number of slots, keeping weighted clashes to a minimum"""
+        if not self.graph.vertices:
+            print("Please add courses first!")
+            return
+        try:
+            slots = int(input("Enter number of available time slots: "))
+        except ValueError:
+            print("Invalid input! Please enter a number.")
+            return
+        if slots < 1:
+            print("At least one time slot is needed!")
+            return
+        
+        print(f"Minimizing clashes in {slots} time slots (up to {time_limit:.0f}s)...")
+        result = minimize_conflicts(self.graph, slots, coloring=self.coloring or None,
+                                    time_limit=time_limit)
+        self.coloring = result.coloring
+        # Only a clash-free schedule can be kept valid incrementally
+        self.incremental = None if result.clashes else IncrementalColoring(self.graph,
+                                                                           self.coloring)
+        print(f"Clash weight: {result.stats['initial_weight']:g} -> {result.total_weight:g} "
+              f"({result.stats['elapsed']:.1f}s)")
+        print(result.clash_report())
+    
+    def set_capacity(self):
+        """Set the maximum number of courses or enrolled students per time slot"""
+        try:
+            value = int(input("Enter slot capacity (0 for unlimited): "))
+        except ValueError:
+            print("Invalid input! Please enter a number.")
+            return
+        if value <= 0:
+            self.capacity = None
+            print("Slot capacity removed")
+            return
+        self.capacity = value
+        unit = input("Count (1) courses or (2) enrolled students per slot? ").strip()
+        self.capacity_by_students = unit == '2'
+        if self.capacity_by_students and not self.course_sizes:
+            print("Note: no enrollments imported yet, so every course counts as 1 student")
+        print(f"Slot capacity set to {self._capacity_text()}")
+    
+    def _capacity_text(self):
+        """Describe the slot capacity setting"""
+        if not self.capacity:
+            return "unlimited"
+        return f"{self.capacity} {'students' if self.capacity_by_students else 'courses'}"
+    
+    def optimize_schedule(self, time_limit=5.0, min_colors=1):
+        """Run the tabu search improver on the current schedule, down to min_colors slots"""
+        def report(k, conflicts):
+            print(f"  trying {k} time slots: {conflicts} conflicts left")
+        
+        result = tabu_improve(self.graph, self.coloring, time_limit=time_limit,
+                              min_colors=min_colors, callback=report, report_every=50000)
+        if result.color_count < result.initial_colors and \
+                validate_coloring(self.graph, result.coloring):
+            self.coloring = result.coloring
+            print(f"Optimized: {result.initial_colors} -> {result.color_count} time slots "
+                  f"({result.stats['elapsed']:.1f}s)")
+        else:
+            print(f"No schedule with fewer time slots found "
+                  f"({result.stats['elapsed']:.1f}s)")
+    
+    def choose_strategy(self):
+        """Choose the coloring strategy used to generate the schedule"""
+        strategies = list(STRATEGIES)
+        print("\nAvailable strategies:")
+        for i, name in enumerate(strategies, 1):
+            print(f"{i}. {name}")
+        
+        try:
+            idx = int(input("Enter strategy number: ")) - 1
+            if 0 <= idx < len(strategies):
+                self.strategy = strategies[idx]
+                print(f"Strategy set to '{self.strategy}'")
+            else:
+                print("Invalid strategy number!")
+        except ValueError:
+            print("Invalid input! Please enter a number.")
     
     def view_schedule(self):
         """Display the schedule"""
@@ -156,6 +445,8 @@ class CourseSchedulerText:
         if confirm == 'yes':
             self.graph = Graph()
             self.coloring = {}
+            self.incremental = None
+            self.course_sizes = {}
             print("All data cleared!")
         else:
             print("Operation cancelled.")
@@ -184,6 +475,23 @@ class CourseSchedulerText:
                     self.view_schedule()
                 elif choice == '7':
                     self.clear_data()
+                elif choice == '8':
+                    self.import_enrollments()
+                elif choice == '9':
+                    self.choose_strategy()
+                elif choice == '10':
+                    self.save_data()
+                elif choice == '11':
+                    self.load_data()
+                elif choice == '12':
+                    self.export_data()
+                elif choice == '13':
+                    self.show_stats = not self.show_stats
+                    print(f"Coloring statistics {'on' if self.show_stats else 'off'}")
+                elif choice == '14':
+                    self.set_capacity()
+                elif choice == '15':
+                    self.fit_to_slots()
                 else:
                     print("Invalid choice! Please try again.")
                 
@@ -197,7 +505,7 @@ class CourseSchedulerText:
 
 
 if __name__ == "__main__":
-    scheduler = CourseSchedulerText()
+    scheduler = CourseSchedulerText(cache_dir=cache_dir_option(sys.argv[1:]))
     scheduler.run()
 
 
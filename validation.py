@@ -0,0 +1,189 @@
+"""
+Validation Module for Course Scheduling
+Checks a schedule over all conflicts at once and reports every violation
+"""
+
+from itertools import repeat
+
+from compact_graph import to_csr, _csr_edges, _as_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ValidationReport:
+    """
+    Result of validating a schedule
+    conflicts lists the (course1, course2) pairs scheduled in the same slot,
+    uncolored the courses without a slot. A report is truthy when both are empty.
+    """
+    
+    def __init__(self, conflicts, uncolored):
+        self.conflicts = conflicts
+        self.uncolored = uncolored
+    
+    @property
+    def valid(self):
+        return not self.conflicts and not self.uncolored
+    
+    def __bool__(self):
+        return self.valid
+    
+    def summary(self, limit=10):
+        """Human-readable description listing at most limit items of each kind"""
+        if self.valid:
+            return "Schedule is valid"
+        lines = []
+        if self.conflicts:
+            lines.append(f"{len(self.conflicts)} conflicting courses share a time slot:")
+            lines.extend(f"  {course1} <-> {course2}"
+                         for course1, course2 in self.conflicts[:limit])
+            if len(self.conflicts) > limit:
+                lines.append(f"  ... and {len(self.conflicts) - limit} more")
+        if self.uncolored:
+            shown = ', '.join(str(course) for course in self.uncolored[:limit])
+            more = f" and {len(self.uncolored) - limit} more" if len(self.uncolored) > limit else ""
+            lines.append(f"{len(self.uncolored)} courses have no time slot: {shown}{more}")
+        return '\n'.join(lines)
+    
+    def __repr__(self):
+        return (f"ValidationReport(valid={self.valid}, conflicts={len(self.conflicts)}, "
+                f"uncolored={len(self.uncolored)})")
+
+
+class ColoringValidator:
+    """
+    Validates colorings of one graph, fully or incrementally
+    
+    The graph is converted once to edge arrays (each conflict stored once as
+    src < dst), and validate() compares the slots of both ends of every edge
+    in one vectorized step. After that, touch() marks courses whose slot
+    changed and add_edge() records new conflicts; revalidate() then checks
+    only the edges at those courses and updates the previous report.
+    """
+    
+    def __init__(self, graph):
+        self.graph = graph
+        vertices, self.offsets, self.indices = to_csr(graph)
+        self.vertices = list(vertices)
+        self.src, self.dst = _csr_edges(self.offsets, self.indices)
+        self.index = {vertex: i for i, vertex in enumerate(self.vertices)}
+        self.colors = None
+        # Conflicts added after the arrays were built, by course id
+        self.extra = {}
+        self.conflicts = set()
+        # Partners of each course in self.conflicts, so revalidate() can drop
+        # the pairs of touched courses without scanning every conflict
+        self.conflicting = {}
+        self.uncolored = set()
+        self.touched = set()
+    
+    def validate(self, coloring):
+        """Check every conflict of the graph; returns a ValidationReport"""
+        vertices = self.vertices
+        if np is not None:
+            colors = np.fromiter(map(coloring.get, vertices, repeat(-1)),
+                                 dtype=np.int32, count=len(vertices))
+            src = _as_numpy(self.src, np.int32)
+            dst = _as_numpy(self.dst, np.int32)
+            ends = colors[src]
+            same = ends == colors[dst]
+            uncolored = set(np.flatnonzero(colors < 0).tolist())
+            if uncolored:
+                same &= ends >= 0
+            clash = np.flatnonzero(same)
+            conflicts = set(zip(src[clash].tolist(), dst[clash].tolist()))
+            colors = colors.tolist()
+        else:
+            colors = [coloring.get(vertex, -1) for vertex in vertices]
+            conflicts = {(i, j) for i, j in zip(self.src, self.dst)
+                         if colors[i] == colors[j] and colors[i] >= 0}
+            uncolored = {i for i, color in enumerate(colors) if color < 0}
+        for i, neighbors in self.extra.items():
+            conflicts.update((i, j) for j in neighbors
+                             if i < j and colors[i] == colors[j] and colors[i] >= 0)
+        self.colors, self.conflicts, self.uncolored = colors, conflicts, uncolored
+        self.conflicting = {}
+        for i, j in conflicts:
+            self.conflicting.setdefault(i, set()).add(j)
+            self.conflicting.setdefault(j, set()).add(i)
+        self.touched.clear()
+        return self.report()
+    
+    def touch(self, *vertices):
+        """Mark courses whose slot changed (or that were added) since the last check"""
+        for vertex in vertices:
+            if vertex not in self.index:
+                self.index[vertex] = len(self.vertices)
+                self.vertices.append(vertex)
+            self.touched.add(self.index[vertex])
+    
+    def add_edge(self, vertex1, vertex2):
+        """Record a conflict added to the graph after the validator was built"""
+        self.touch(vertex1, vertex2)
+        i, j = self.index[vertex1], self.index[vertex2]
+        self.extra.setdefault(i, set()).add(j)
+        self.extra.setdefault(j, set()).add(i)
+    
+    def revalidate(self, coloring):
+        """
+        Check only the conflicts at courses touched since the last validation
+        Falls back to validate() if there was no previous validation
+        """
+        if self.colors is None:
+            return self.validate(coloring)
+        colors = self.colors
+        vertices = self.vertices
+        colors.extend([-1] * (len(vertices) - len(colors)))
+        touched = self.touched
+        for i in touched:
+            colors[i] = coloring.get(vertices[i], -1)
+            if colors[i] < 0:
+                self.uncolored.add(i)
+            else:
+                self.uncolored.discard(i)
+        
+        conflicts, conflicting = self.conflicts, self.conflicting
+        for i in touched:
+            for j in conflicting.pop(i, ()):
+                conflicts.discard((i, j) if i < j else (j, i))
+                partners = conflicting.get(j)
+                if partners is not None:
+                    partners.discard(i)
+                    if not partners:
+                        del conflicting[j]
+        offsets, indices = self.offsets, self.indices
+        built = len(offsets) - 1
+        for i in touched:
+            color = colors[i]
+            if color < 0:
+                continue
+            neighbors = indices[offsets[i]:offsets[i + 1]] if i < built else ()
+            for j in neighbors:
+                if colors[j] == color:
+                    self._add_conflict(i, j)
+            for j in self.extra.get(i, ()):
+                if colors[j] == color:
+                    self._add_conflict(i, j)
+        touched.clear()
+        return self.report()
+    
+    def _add_conflict(self, i, j):
+        self.conflicts.add((i, j) if i < j else (j, i))
+        self.conflicting.setdefault(i, set()).add(j)
+        self.conflicting.setdefault(j, set()).add(i)
+    
+    def report(self):
+        """ValidationReport of the last (re)validation, with course names"""
+        vertices = self.vertices
+        return ValidationReport(
+            [(vertices[i], vertices[j]) for i, j in sorted(self.conflicts)],
+            [vertices[i] for i in sorted(self.uncolored)]
+        )
+
+
+def find_violations(graph, coloring):
+    """Validate a coloring of any graph backend; returns a ValidationReport"""
+    return ColoringValidator(graph).validate(coloring)
@@ -0,0 +1,174 @@
+"""
+Virtual View Module for Course Scheduler
+Listbox/Treeview wrapper that only renders the visible window of a long list
+"""
+
+from bisect import insort
+from tkinter import ttk
+
+
+class VirtualView:
+    """
+    Shows a long list of rows in a Listbox or Treeview that only holds the
+    rows on screen
+    
+    items are row keys (courses, conflict pairs). render(key) turns a key into
+    the row text for a Listbox or a (values, tags) pair for a Treeview; it is
+    called for the visible rows only, each time they are drawn, so rows always
+    show current data (degrees, slots) without being rebuilt. The scrollbar and
+    the mouse wheel move the window over the keys, or over the keys accepted
+    by matches(key, text) while a search text is set.
+    """
+    
+    def __init__(self, widget, scrollbar, render, matches=None):
+        self.widget = widget
+        self.scrollbar = scrollbar
+        self.render = render
+        self.matches = matches or (lambda key, text: text in str(key).lower())
+        self.is_tree = isinstance(widget, ttk.Treeview)
+        self.items = []
+        # Keys matching the search text; the items list itself when there is none
+        self.shown = self.items
+        self.search_text = ''
+        self.first = 0
+        # Treeview rows reused for the window, and the measured row pitch
+        self.row_ids = []
+        self.row_height = 20 if self.is_tree else 16
+        self.top = 0
+        self._search_job = None
+        
+        widget.configure(yscrollcommand='')
+        scrollbar.configure(command=self.yview)
+        widget.bind('<Configure>', lambda event: self.refresh())
+        widget.bind('<MouseWheel>', self._on_wheel)
+        widget.bind('<Button-4>', lambda event: self._scroll(-3))
+        widget.bind('<Button-5>', lambda event: self._scroll(3))
+    
+    def __len__(self):
+        return len(self.shown)
+    
+    def set_items(self, items):
+        """Replace all keys (keeps the scroll position where possible)"""
+        self.items = list(items)
+        self._apply_search()
+        self.refresh()
+    
+    def clear(self):
+        """Remove all keys"""
+        self.set_items([])
+    
+    def extend(self, keys):
+        """Append new keys; only the window and the scrollbar are redrawn"""
+        keys = list(keys)
+        if not keys:
+            return
+        self.items.extend(keys)
+        if self.shown is not self.items:
+            self.shown.extend(key for key in keys if self.matches(key, self.search_text))
+        self.refresh()
+    
+    def insert_sorted(self, keys):
+        """Insert new keys into a sorted list of keys"""
+        for key in keys:
+            insort(self.items, key)
+            if self.shown is not self.items and self.matches(key, self.search_text):
+                insort(self.shown, key)
+        self.refresh()
+    
+    def search(self, text, delay=250):
+        """Show only keys matching text, applied after delay ms without further typing"""
+        if self._search_job is not None:
+            self.widget.after_cancel(self._search_job)
+        self._search_job = self.widget.after(delay, self._run_search, text)
+    
+    def _run_search(self, text):
+        self._search_job = None
+        self.search_text = text.strip().lower()
+        self.first = 0
+        self._apply_search()
+        self.refresh()
+    
+    def _apply_search(self):
+        if self.search_text:
+            self.shown = [key for key in self.items if self.matches(key, self.search_text)]
+        else:
+            self.shown = self.items
+    
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', count, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.shown))
+            self.refresh()
+        elif args[0] == 'scroll':
+            count = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                count *= max(1, self._rows() - 1)
+            self._scroll(count)
+    
+    def _scroll(self, count):
+        self.first += count
+        self.refresh()
+        return 'break'
+    
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120, macOS small steps
+        steps = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self._scroll(-3 * steps)
+    
+    def _rows(self):
+        """Number of rows that fit into the widget"""
+        height = self.widget.winfo_height()
+        if height <= 1:
+            # Not drawn yet: use the requested height in rows
+            return int(self.widget.cget('height'))
+        return max(1, (height - self.top) // self.row_height + 1)
+    
+    def refresh(self):
+        """Redraw the visible window from the current keys"""
+        total = len(self.shown)
+        # A second pass when the measured row pitch shows that more rows fit
+        for _ in range(2):
+            rows = self._rows()
+            self.first = max(0, min(self.first, total - rows))
+            window = self.shown[self.first:self.first + rows]
+            if self.is_tree:
+                self._draw_tree(window)
+            else:
+                self.widget.delete(0, 'end')
+                if window:
+                    self.widget.insert('end', *(self.render(key) for key in window))
+            self._measure()
+            if self._rows() <= rows:
+                break
+        if total > rows:
+            self.scrollbar.set(self.first / total, (self.first + len(window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def _draw_tree(self, window):
+        tree = self.widget
+        while len(self.row_ids) < len(window):
+            self.row_ids.append(tree.insert('', 'end'))
+        if len(self.row_ids) > len(window):
+            tree.delete(*self.row_ids[len(window):])
+            del self.row_ids[len(window):]
+        for row_id, key in zip(self.row_ids, window):
+            values, tags = self.render(key)
+            tree.item(row_id, values=values, tags=tags)
+    
+    def _measure(self):
+        """Take the row pitch and first row offset from the drawn rows"""
+        if self.is_tree:
+            if len(self.row_ids) < 2:
+                return
+            first, second = self.widget.bbox(self.row_ids[0]), self.widget.bbox(self.row_ids[1])
+        else:
+            if self.widget.size() < 2:
+                return
+            first, second = self.widget.bbox(0), self.widget.bbox(1)
+        if first and second and second[1] > first[1]:
+            self.row_height = second[1] - first[1]
+            self.top = first[1]
+